@@ -0,0 +1,169 @@
+"""The storage interface shared by the SQLite and PostgreSQL backends.
+
+`get_storage()` picks the backend from configuration, so deployments switch
+with `STORAGE_BACKEND=postgres` (and `DATABASE_URL`) instead of code edits.
+Both implementations are checked against the same workload by
+`tests/test_storage_conformance.py` and timed by `harness/storage_bench.py`.
+"""
+import functools
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from journalist_crew.dates import parse_date
+from journalist_crew.metrics import DB_SECONDS
+from journalist_crew.models import ResearchDossier
+
+BACKENDS = ("sqlite", "postgres")
+
+
+# --- KEYSET PAGINATION ---
+# Pages are addressed by the last row seen, (modified_at, id), never by
+# OFFSET, so later pages cost the same as the first one.
+
+def page_cursor(row: Dict) -> str:
+    return f"{row['modified_at']}|{row['id']}"
+
+def split_page_cursor(cursor: str):
+    modified_at, _, row_id = cursor.partition("|")
+    return modified_at, row_id
+
+def make_page(rows: List[Dict], limit: int) -> Dict:
+    """`rows` was fetched with limit + 1 to learn whether another page exists."""
+    items = rows[:limit]
+    return {"items": items, "next_cursor": page_cursor(items[-1]) if len(rows) > limit else None}
+
+
+# --- TIMELINE RANGES ---
+
+def timeline_bounds(start: str, end: str):
+    """ISO bounds for a range query; each end may be any date parse_date reads ("2006", "May 2008")."""
+    first, last = parse_date(start), parse_date(end)
+    if first is None or last is None:
+        raise ValueError(f"Unrecognised timeline range '{start}' – '{end}'")
+    return first.start, last.end
+
+
+def _timed(op: str, method):
+    @functools.wraps(method)
+    def timed(self, *args, **kwargs):
+        with DB_SECONDS.labels(backend=self.name, op=op).time():
+            return method(self, *args, **kwargs)
+    return timed
+
+
+class StorageBackend(ABC):
+    """Everything the crew, UI and CLI need from a database.
+
+    Every interface method an implementation defines is timed into the
+    journalist_db_seconds histogram (see metrics.py).
+    """
+
+    name = ""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for op in StorageBackend.__abstractmethods__:
+            if op in cls.__dict__:
+                setattr(cls, op, _timed(op, cls.__dict__[op]))
+
+    # --- DOSSIERS ---
+
+    @abstractmethod
+    def save_dossier(self, dossier: ResearchDossier, owner: Optional[str] = None):
+        """Inserts or replaces the dossier; bumps modified_at. A dossier keeps its first owner."""
+
+    @abstractmethod
+    def load_dossier(self, dossier_id: str) -> Optional[ResearchDossier]:
+        ...
+
+    @abstractmethod
+    def list_dossiers(self, owner: Optional[str] = None) -> List[Dict]:
+        """Dossiers (id, topic, created_at, modified_at), most recently modified first.
+
+        With `owner`, only that user's; without, the whole archive (CLI).
+        """
+
+    @abstractmethod
+    def list_dossiers_page(self, limit: int = 20, cursor: Optional[str] = None, owner: Optional[str] = None) -> Dict:
+        """One page of list_dossiers: {"items", "next_cursor"}."""
+
+    # --- TIMELINE ---
+
+    @abstractmethod
+    def find_timeline_events(self, start: str, end: str, owner: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Dated timeline events overlapping [start, end] across dossiers, earliest first.
+
+        Rows: dossier_id, topic, label (the original date text), event,
+        start_date, end_date, precision. `start`/`end` go through
+        timeline_bounds; with `owner`, only that user's dossiers.
+        """
+
+    # --- ARTICLES ---
+
+    @abstractmethod
+    def save_article(self, dossier_id: str, content: str, instructions: str, lang: str, cache_key: Optional[str] = None):
+        ...
+
+    @abstractmethod
+    def find_cached_article(self, cache_key: str) -> Optional[str]:
+        """Content of the latest article stored under cache_key."""
+
+    @abstractmethod
+    def get_article_history(self, dossier_id: str, limit: int = 20, before_id: Optional[int] = None) -> List[Dict]:
+        """Newest first: id, instructions, language, created_at, preview, length."""
+
+    @abstractmethod
+    def get_article(self, article_id: int) -> Optional[Dict]:
+        ...
+
+    # --- RUN CHECKPOINTS ---
+
+    @abstractmethod
+    def save_run(self, run_id: str, topic: str, instructions: str, profile: str, dossier_id: Optional[str] = None):
+        ...
+
+    @abstractmethod
+    def set_run_status(self, run_id: str, status: str, error: Optional[str] = None, dossier_id: Optional[str] = None):
+        ...
+
+    @abstractmethod
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def list_runs(self, unfinished: bool = False, limit: int = 20) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def save_checkpoint(self, run_id: str, task_name: str, output: str):
+        """Inserts or replaces the output of one task of a run."""
+
+    @abstractmethod
+    def load_checkpoints(self, run_id: str) -> Dict[str, str]:
+        ...
+
+    # --- SIDEBAR ---
+
+    @abstractmethod
+    def sync_dossiers_to_sidebar(self, user_identifier: str):
+        """Creates a Chainlit thread for each of the user's own dossiers that has none yet."""
+
+    def close(self):
+        """Releases connections held by this instance (pools are shared and stay open)."""
+
+
+def get_storage(backend: Optional[str] = None, **options) -> StorageBackend:
+    """The configured backend: `backend` or $STORAGE_BACKEND (default sqlite).
+
+    `options` go to the backend's constructor (db_file/chainlit_db_file for
+    SQLite, db_url for PostgreSQL).
+    """
+    backend = (backend or os.getenv("STORAGE_BACKEND", "sqlite")).lower()
+    if backend == "sqlite":
+        from journalist_crew.storage import StorageManager
+        return StorageManager(**options)
+    if backend in ("postgres", "postgresql"):
+        from journalist_crew.pg_storage import StorageManager as PGStorageManager
+        return PGStorageManager(**options)
+    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}'. Choose from: {', '.join(BACKENDS)}")
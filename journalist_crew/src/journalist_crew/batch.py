@@ -0,0 +1,166 @@
+"""Overnight batch research.
+
+Reads one job per line from a topics file and runs `run_research` for each
+with bounded concurrency. Every crew shares the process-wide LLM rate
+limit and one search/scrape cache, each job's run is checkpointed as soon
+as it starts so a crashed batch resumes where it stopped, and a summary
+report is written at the end.
+
+    research_batch topics.txt --concurrency 4
+    research_batch dossier_ids.txt --update --instructions "Developments since last month"
+
+Lines are `topic` (or a dossier id with --update), optionally followed by
+`| instructions`. Blank lines and lines starting with # are ignored.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+from journalist_crew.crew import DEFAULT_PROFILE, PROFILES, JournalistCrew
+from journalist_crew.limits import GLOBAL_RATE_LIMITER
+from journalist_crew.progress import RunMonitor
+from journalist_crew.repair import REPAIR_STATS
+from journalist_crew.tools.cached_tool import SHARED_TOOL_CACHE
+
+DEFAULT_UPDATE_INSTRUCTIONS = "Find developments not yet covered in the existing dossier."
+
+
+def read_jobs(path: str) -> List[Tuple[str, str]]:
+    jobs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            key, _, instructions = line.partition("|")
+            jobs.append((key.strip(), instructions.strip()))
+    return jobs
+
+
+class Checkpoint:
+    """JSON file of job progress, rewritten atomically whenever a job starts its run or finishes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.items: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.items = json.load(f).get("items", {})
+
+    def is_done(self, key: str) -> bool:
+        return self.items.get(key, {}).get("status") == "done"
+
+    def record(self, key: str, entry: Dict):
+        with self._lock:
+            self.items[key] = entry
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"items": self.items}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def run_job(key: str, instructions: str, update: bool, profile: str = DEFAULT_PROFILE, resume_run_id: str = None, owner: str = None, checkpoint: "Checkpoint" = None) -> Dict:
+    crew = JournalistCrew(tool_cache=SHARED_TOOL_CACHE, owner=owner)
+    start = time.perf_counter()
+    entry = {"key": key, "mode": "update" if update else "new", "started_at": datetime.datetime.now().isoformat()}
+
+    def on_event(kind, **data):
+        # Record the run as soon as it exists, so a batch that crashes mid-job resumes it
+        if kind == "run_started" and checkpoint is not None:
+            checkpoint.record(key, dict(entry, status="running", run_id=data["run_id"]))
+
+    monitor = RunMonitor(listener=on_event)
+    try:
+        if resume_run_id:
+            # A failed or interrupted job picks up from its last finished task
+            dossier = crew.resume_research(resume_run_id, monitor=monitor)
+        elif update:
+            if not crew.load_context(key):
+                raise ValueError(f"Dossier {key} not found.")
+            dossier = crew.run_research(crew.current_dossier.topic, instructions=instructions or DEFAULT_UPDATE_INSTRUCTIONS, profile=profile, monitor=monitor)
+        else:
+            dossier = crew.run_research(key, instructions=instructions, profile=profile, monitor=monitor)
+        entry.update(status="done", dossier_id=dossier.id, topic=dossier.topic)
+    except Exception as e:
+        entry.update(status="failed", error=f"{type(e).__name__}: {e}")
+    entry["run_id"] = crew.last_run_id
+    entry["seconds"] = round(time.perf_counter() - start, 1)
+    return entry
+
+
+def run_batch(jobs: List[Tuple[str, str]], update: bool, concurrency: int, checkpoint: Checkpoint, retry_failed: bool = True, profile: str = DEFAULT_PROFILE, owner: str = None) -> Dict:
+    pending = []
+    for key, instructions in jobs:
+        if checkpoint.is_done(key):
+            continue
+        if not retry_failed and checkpoint.items.get(key, {}).get("status") == "failed":
+            continue
+        pending.append((key, instructions))
+
+    print(f"📋 {len(jobs)} jobs, {len(jobs) - len(pending)} already finished, running {len(pending)} with concurrency {concurrency}.")
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            pool.submit(run_job, key, instructions, update, profile, checkpoint.items.get(key, {}).get("run_id"), owner, checkpoint): key
+            for key, instructions in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            entry = future.result()
+            checkpoint.record(entry["key"], entry)
+            icon = "✅" if entry["status"] == "done" else "❌"
+            print(f"{icon} [{done}/{len(pending)}] {entry['key']} ({entry['seconds']}s)")
+
+    entries = [checkpoint.items[key] for key, _ in jobs if key in checkpoint.items]
+    return {
+        "finished_at": datetime.datetime.now().isoformat(),
+        "wall_seconds": round(time.perf_counter() - started, 1),
+        "profile": profile,
+        "jobs": len(jobs),
+        "ran": len(pending),
+        "done": sum(1 for e in entries if e["status"] == "done"),
+        "failed": sum(1 for e in entries if e["status"] == "failed"),
+        "tool_cache": SHARED_TOOL_CACHE.stats(),
+        "compile_repair": REPAIR_STATS.snapshot(),
+        "rate_limit": {"max_per_minute": GLOBAL_RATE_LIMITER.max_per_minute, "acquired": GLOBAL_RATE_LIMITER.acquired, "waited_seconds": round(GLOBAL_RATE_LIMITER.waited, 1)},
+        "items": entries,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Research or refresh many dossiers in one run.")
+    parser.add_argument("jobs_file", help="One topic (or dossier id with --update) per line.")
+    parser.add_argument("--update", action="store_true", help="Lines are dossier ids to dig deeper on.")
+    parser.add_argument("--instructions", default="", help="Default instructions for lines without their own.")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BATCH_CONCURRENCY", "4")))
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PROFILES))
+    parser.add_argument("--max-rpm", type=int, help="Process-wide LLM requests per minute (default LLM_MAX_RPM).")
+    parser.add_argument("--checkpoint", help="Progress file (default <jobs_file>.checkpoint.json).")
+    parser.add_argument("--report", help="Summary report (default <jobs_file>.report.json).")
+    parser.add_argument("--skip-failed", action="store_true", help="Do not retry jobs that failed in a previous run.")
+    parser.add_argument("--owner", help="UI user whose sidebar the new dossiers appear in.")
+    args = parser.parse_args(argv)
+
+    if args.max_rpm is not None:
+        GLOBAL_RATE_LIMITER.max_per_minute = args.max_rpm
+
+    jobs = [(key, instructions or args.instructions) for key, instructions in read_jobs(args.jobs_file)]
+    checkpoint = Checkpoint(args.checkpoint or f"{args.jobs_file}.checkpoint.json")
+    report = run_batch(jobs, args.update, max(1, args.concurrency), checkpoint, retry_failed=not args.skip_failed, profile=args.profile, owner=args.owner)
+
+    report_path = args.report or f"{args.jobs_file}.report.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"📊 {report['done']} done, {report['failed']} failed in {report['wall_seconds']}s. Report: {report_path}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
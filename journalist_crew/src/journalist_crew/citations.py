@@ -0,0 +1,76 @@
+"""Numbered citations resolved through a dossier's `sources` list.
+
+Dossiers store citations as `[n]`, the 1-based position of the source in
+`dossier.sources`, instead of repeating `([Name](https://...))` for every
+fact. Links are expanded back only when a dossier or article is shown.
+"""
+import re
+from typing import Callable, Dict, Iterable, List
+
+from journalist_crew.ledger import canonicalize_url
+
+# "([Name](url))" as produced by the citation tools, or a bare "[Name](url)"
+LINK_RE = re.compile(r"\(\[([^\[\]]+)\]\((https?://[^\s)]+)\)\)|\[([^\[\]]+)\]\((https?://[^\s)]+)\)")
+REF_RE = re.compile(r"\[(\d{1,4})\]")
+
+
+def compact_text(text: str, register: Callable[[str, str], int]) -> str:
+    """Replaces inline links with `[n]`; register(url, title) returns the source number."""
+    def replace(match):
+        title = match.group(1) or match.group(3)
+        url = match.group(2) or match.group(4)
+        return f"[{register(url, title)}]"
+    return LINK_RE.sub(replace, text)
+
+
+def expand_text(text: str, sources) -> str:
+    """Turns `[n]` back into `([Title](url))`; numbers without a source are left alone."""
+    def replace(match):
+        n = int(match.group(1))
+        if 1 <= n <= len(sources):
+            source = sources[n - 1]
+            return f"([{source.title}]({source.url}))"
+        return match.group(0)
+    return REF_RE.sub(replace, text)
+
+
+def remap_text(text: str, mapping: Dict[int, int]) -> str:
+    """Renumbers `[n]` for the numbers in `mapping`; anything else ("[2008]") is left as written."""
+    def replace(match):
+        n = int(match.group(1))
+        return f"[{mapping[n]}]" if n in mapping else match.group(0)
+    return REF_RE.sub(replace, text)
+
+
+def cited_numbers(text: str) -> List[int]:
+    """Source numbers cited in text, in order of first use."""
+    seen = []
+    for match in REF_RE.finditer(text):
+        n = int(match.group(1))
+        if n not in seen:
+            seen.append(n)
+    return seen
+
+
+def source_index(sources: Iterable) -> Dict[str, int]:
+    index = {}
+    for n, source in enumerate(sources, start=1):
+        index.setdefault(canonicalize_url(source.url), n)
+    return index
+
+
+def format_source_list(sources, numbers: Iterable[int]) -> str:
+    lines = []
+    for n in numbers:
+        if 1 <= n <= len(sources):
+            lines.append(f"{n}. [{sources[n - 1].title}]({sources[n - 1].url})")
+    return "\n".join(lines)
+
+
+def expand_article(article: str, sources) -> str:
+    """Final article: numbered citations become links and the cited sources are listed."""
+    numbers = [n for n in cited_numbers(article) if 1 <= n <= len(sources)]
+    text = expand_text(article, sources)
+    if numbers:
+        text = f"{text.rstrip()}\n\n## Sources\n{format_source_list(sources, numbers)}\n"
+    return text
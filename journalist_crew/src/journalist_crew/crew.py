@@ -1,12 +1,87 @@
+import hashlib
+import json
 import os
+import re
+import time
+import uuid
+from pathlib import Path
 
-from crewai import LLM, Agent, Crew, Task
-from crewai.project import CrewBase, agent
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool
+import yaml
 
-from journalist_crew.tools.citation_tool import CitationTool
+from crewai import Agent, Crew, Task
+from crewai.project import CrewBase, agent
+from crewai_tools import SerperDevTool
+
+from journalist_crew.ledger import RunLedger
+from journalist_crew.limits import GLOBAL_RATE_LIMITER
+from journalist_crew.llm import MODEL_ROUTER, RateLimitedLLM, RoutedLLM
+from journalist_crew.progress import RunCancelled, RunMonitor, monitored
+from journalist_crew.tools.cached_tool import CachedTool
+from journalist_crew.tools.batch_scrape_tool import BatchScrapeTool
+from journalist_crew.tools.citation_tool import BatchCitationTool, CitationTool
+from journalist_crew.tools.ledger_tool import LedgerTool
+from journalist_crew.tools.passage_scrape_tool import PassageScrapeTool
+from journalist_crew.tools.tracked_tool import TrackedTool
+from journalist_crew.tracing import stage_span
+from journalist_crew.metrics import ARTICLE_CACHE, TASK_SECONDS, run_timer
+from journalist_crew.citations import expand_article
+from journalist_crew.formatting import format_cited_facts, parse_cited_facts
+from journalist_crew.merging import merge_dossiers
 from journalist_crew.models import ResearchDossier
-from journalist_crew.storage import StorageManager
+from journalist_crew.repair import parse_json, repair_dossier
+from journalist_crew.reputation import REPUTATION, CrawlBudget
+from journalist_crew.backends import get_storage
+
+
+PROFILES_FILE = Path(__file__).parent / "config" / "profiles.yaml"
+
+
+def load_profiles() -> dict:
+    with open(PROFILES_FILE, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+PROFILES = load_profiles()
+DEFAULT_PROFILE = os.getenv("PIPELINE_PROFILE", "thorough")
+if DEFAULT_PROFILE not in PROFILES:
+    raise ValueError(f"PIPELINE_PROFILE='{DEFAULT_PROFILE}' is not a profile in {PROFILES_FILE.name}. Choose from: {', '.join(PROFILES)}")
+
+def _escape_braces(text: str) -> str:
+    # Task descriptions are templated; keep restored outputs from looking like {placeholders}
+    return re.sub(r"\{(\w+)\}", r"(\1)", text)
+
+
+COMPILE_SCHEMA = (
+    "\n\n**OUTPUT FORMAT:** Return ONLY a JSON object (no prose, no code fences) matching this JSON schema:\n"
+    + json.dumps(ResearchDossier.model_json_schema())
+)
+
+# Tasks that answer with a JSON fact list, cited locally by the guardrail below
+FACT_TASKS = ('fact_finding_task', 'quick_research_task')
+
+
+def cited_facts_guardrail(output):
+    """Formats the structured fact list into cited markdown without another LLM turn."""
+    facts = parse_cited_facts(output.raw)
+    if not facts:
+        # The agent answered in prose; pass it through rather than burn a retry
+        return True, output.raw
+    return True, format_cited_facts(facts)
+
+
+def describe_profile(name: str) -> str:
+    typical = PROFILES[name]["typical"]
+    return (
+        f"{name}: ~{typical['research_minutes']} min research, "
+        f"~{typical['write_minutes']} min writing, ~{typical['tokens'] // 1000}k tokens"
+    )
+
+
+def article_cache_key(dossier: ResearchDossier, instructions: str, lang: str, profile: str = DEFAULT_PROFILE) -> str:
+    """Identifies an article by dossier content, normalized instructions, language and writer profile."""
+    normalized = " ".join(instructions.split()).casefold()
+    raw = f"{dossier.content_hash()}\n{normalized}\n{lang.strip().casefold()}\n{profile}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
 @CrewBase
@@ -16,10 +91,44 @@ class JournalistCrew:
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
-    def __init__(self):
-        self.search_tool = SerperDevTool(n_results=20)
-        self.scrape_tool = ScrapeWebsiteTool()
+    def __init__(self, db=None, llm=None, search_tool=None, scrape_tool=None, batch_scrape_tool=None, tool_cache=None, rate_limiter=None, owner=None):
+        # Every dependency can be swapped for a local stand-in (see harness/fakes.py)
+        self.search_tool = search_tool or SerperDevTool(n_results=20)
+        self.scrape_tool = scrape_tool or PassageScrapeTool()
+        self.batch_scrape_tool = batch_scrape_tool or BatchScrapeTool()
+        # These rank scraped passages against each run's directive (set in run_research)
+        self.passage_tools = [t for t in (self.scrape_tool, self.batch_scrape_tool) if isinstance(t, PassageScrapeTool)]
         self.citation_tool = CitationTool()
+        self.batch_citation_tool = BatchCitationTool()
+
+        # A cache shared between crews (batch mode) answers repeated searches and reads.
+        # Passage tools cache the page itself and rank it per run, so topics can share it.
+        if tool_cache is not None:
+            self.search_tool = CachedTool.wrap(self.search_tool, tool_cache)
+            for tool in self.passage_tools:
+                tool.page_cache = tool_cache
+            if not isinstance(self.scrape_tool, PassageScrapeTool):
+                self.scrape_tool = CachedTool.wrap(self.scrape_tool, tool_cache)
+
+        # Agents in one run share a ledger, so nobody repeats another's search or read
+        self.ledger = RunLedger()
+        self.search_tool = LedgerTool.wrap(self.search_tool, self.ledger, "search")
+        self.scrape_tool = LedgerTool.wrap(self.scrape_tool, self.ledger, "scrape")
+        self.citation_tool = LedgerTool.wrap(self.citation_tool, self.ledger, "cite")
+        self.batch_scrape_tool.ledger = self.ledger
+        self.batch_citation_tool.ledger = self.ledger
+
+        # Fetches go to the most credible sources first, within a per-run allowance
+        self.crawl_budget = CrawlBudget(REPUTATION)
+        for tool in self.passage_tools:
+            tool.budget = self.crawl_budget
+
+        # Agent-facing tools report each call to the run's monitor and stop with it
+        self.search_tool = TrackedTool.wrap(self.search_tool)
+        self.scrape_tool = TrackedTool.wrap(self.scrape_tool)
+        self.batch_scrape_tool = TrackedTool.wrap(self.batch_scrape_tool)
+        self.citation_tool = TrackedTool.wrap(self.citation_tool)
+        self.batch_citation_tool = TrackedTool.wrap(self.batch_citation_tool)
 
         # self.site_search_tool = WebsiteSearchTool(
         #     config=dict(
@@ -83,39 +192,33 @@ class JournalistCrew:
         #     )
         # )
 
-        self.db = StorageManager()
+        self.db = db or get_storage()
+        # User identifier new dossiers are saved under (their sidebar and listings)
+        self.owner = owner
         self.current_dossier = None
+        self.last_run_stats = None
+        self.last_run_id = None
 
 
         # --- LLM CONFIGURATION ---
-        self.smart_llm = LLM(
-            model="openrouter/arcee-ai/trinity-mini:free",
-            base_url="https://openrouter.ai/api/v1",
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            temperature=0.7,
-            max_tokens=65536,
-            timeout=900,
-            max_retries=3
-        )
+        # Models, timeouts and per-task max_tokens live in config/routing.yaml;
+        # slow calls are hedged to the fallback model (see llm.ModelRouter).
+        self.rate_limiter = rate_limiter or GLOBAL_RATE_LIMITER
+        self.router = MODEL_ROUTER
+        self.smart_llm = RoutedLLM(self.router, temperature=0.7, limiter=self.rate_limiter)
+        self.fast_llm = RoutedLLM(self.router, temperature=0.3, limiter=self.rate_limiter)
+        self.write_llm = RoutedLLM(self.router, temperature=0.3, limiter=self.rate_limiter)
 
-        self.fast_llm = LLM(
-            model="openrouter/arcee-ai/trinity-mini:free",
-            base_url="https://openrouter.ai/api/v1",
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            temperature=0.3,
-            max_tokens=65536,
-            timeout=900,
-            max_retries=3
-        )
-        self.write_llm = LLM(
-            model="openrouter/arcee-ai/trinity-mini:free",
-            base_url="https://openrouter.ai/api/v1",
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            temperature=0.3,
-            max_tokens=65536,
-            timeout=900,
-            max_retries=3
-        )
+        if llm is not None:
+            self.smart_llm = self.fast_llm = self.write_llm = llm
+
+        # Profiles cap max_tokens on per-run views of these (see _run_llms)
+        self.base_llms = {"smart": self.smart_llm, "fast": self.fast_llm, "write": self.write_llm}
+
+        # All crews in the process share one request budget
+        self.smart_llm = RateLimitedLLM(self.smart_llm, self.rate_limiter)
+        self.fast_llm = RateLimitedLLM(self.fast_llm, self.rate_limiter)
+        self.write_llm = RateLimitedLLM(self.write_llm, self.rate_limiter)
 
         # self.smart_llm = LLM(
         #     model="gemini/gemini-2.5-flash-lite", # Uses Google Provider directly
@@ -134,85 +237,71 @@ class JournalistCrew:
 
     @agent
     def strategy_chief(self) -> Agent:
+        return self._build_strategy_chief()
+
+    def _build_strategy_chief(self, llm=None) -> Agent:
         return Agent(
             config=self.agents_config['strategy_chief'],
             tools=[
             self.search_tool,
-            self.citation_tool
+            self.citation_tool,
+            self.batch_citation_tool
             ], # self.site_search_tool
             verbose=True,
-            llm=self.smart_llm
+            llm=llm or self.smart_llm
         )
 
     @agent
     def timeline_hunter(self) -> Agent:
+        return self._build_timeline_hunter()
+
+    def _build_timeline_hunter(self, llm=None) -> Agent:
         return Agent(
             config=self.agents_config['timeline_hunter'],
             tools=[
                 self.search_tool,
                 self.scrape_tool,
-                self.citation_tool
+                self.batch_scrape_tool,
+                self.citation_tool,
+                self.batch_citation_tool
             ],
             # self.pdf_tool,
             # self.youtube_tool
             verbose=True,
-            llm=self.fast_llm
+            llm=llm or self.fast_llm
         )
 
     @agent
     def context_analyst(self) -> Agent:
+        return self._build_context_analyst()
+
+    def _build_context_analyst(self, llm=None) -> Agent:
         return Agent(
             config=self.agents_config['context_analyst'],
             tools=[
                 self.search_tool,
                 self.scrape_tool,
-                self.citation_tool
+                self.batch_scrape_tool,
+                self.citation_tool,
+                self.batch_citation_tool
             ],
             verbose=True,
-            llm=self.smart_llm
+            llm=llm or self.smart_llm
         )
 
-    @agent
-    def writer(self) -> Agent:
+    def _build_writer(self, llm=None) -> Agent:
         return Agent(
             config=self.agents_config['writer'],
             verbose=True,
-            llm=self.write_llm
+            llm=llm or self.write_llm
         )
 
-    def _merge_dossiers(self, old: ResearchDossier, new: ResearchDossier) -> ResearchDossier:
-        print("Merging new findings into existing dossier...")
-        
-        new.id = old.id 
-        
-        new.comprehensive_narrative = (
-            f"{old.comprehensive_narrative}\n\n"
-            f"--- UPDATE: NEW FINDINGS ---\n"
-            f"{new.comprehensive_narrative}"
-        )
+    @agent
+    def writer(self) -> Agent:
+        return self._build_writer()
 
-        existing_events = {(e.year, e.event) for e in old.timeline}
-        for event in new.timeline:
-            if (event.year, event.event) not in existing_events:
-                old.timeline.append(event)
-        old.timeline.sort(key=lambda x: x.year)
-        new.timeline = old.timeline
-
-        existing_figures = {f.name.lower(): f for f in old.key_figures}
-        for fig in new.key_figures:
-            if fig.name.lower() in existing_figures:
-                existing_figures[fig.name.lower()].impact += f"; {fig.impact}"
-            else:
-                old.key_figures.append(fig)
-        new.key_figures = old.key_figures
-
-        existing_urls = {s.url for s in old.sources}
-        for src in new.sources:
-            if src.url not in existing_urls:
-                old.sources.append(src)
-        new.sources = old.sources
-
-        return new
+    def _merge_dossiers(self, old: ResearchDossier, new: ResearchDossier) -> ResearchDossier:
+        return merge_dossiers(old, new)
 
     def load_context(self, dossier_id: str) -> bool:
         print(f"Loading Session ID: {dossier_id}...")
@@ -223,60 +312,276 @@ class JournalistCrew:
             return True
         return False
 
-    def run_research(self, topic: str, instructions: str = ""):
+    def _apply_profile(self, profile: str) -> dict:
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{profile}'. Choose from: {', '.join(PROFILES)}")
+        return PROFILES[profile]
+
+    def _run_llms(self, config: dict) -> dict:
+        """Rate-limited LLMs for one run, capped at the profile's max_tokens.
+
+        The caps go on per-run views of the routed LLMs, so runs with
+        different profiles on the same crew (a speculative write next to a
+        research run) don't overwrite each other's limits. An injected LLM
+        is used as given.
+        """
+        llms = {}
+        for role, base in self.base_llms.items():
+            if isinstance(base, RoutedLLM):
+                base = base.capped(config["max_tokens"].get(role, base.max_tokens))
+            llms[role] = RateLimitedLLM(base, self.rate_limiter)
+        return llms
+
+    def _report_run(self, profile: str, stage: str, started: float, result):
+        usage = getattr(result, "token_usage", None)
+        self.last_run_stats = {
+            "profile": profile,
+            "stage": stage,
+            "seconds": round(time.perf_counter() - started, 1),
+            "tokens": getattr(usage, "total_tokens", None),
+            "typical": PROFILES[profile]["typical"],
+            "routing": self.router.stats(),
+        }
+        print(f"Profile '{profile}' {stage}: {self.last_run_stats['seconds']}s, {self.last_run_stats['tokens']} tokens ({describe_profile(profile)})")
+
+    def _fix_dossier_fields(self, data: dict, fields: list, problem: str):
+        """Asks the LLM to redo only the dossier fields local repair could not save."""
+        others = {k: v for k, v in data.items() if k not in fields and k != "sources"}
+        prompt = (
+            f"A research dossier has problems in these fields: {', '.join(fields)} ({problem[:1000]}).\n"
+            f"Using the rest of the dossier below, return ONLY a JSON object with new values for exactly those fields, "
+            f"matching this schema:\n{json.dumps(ResearchDossier.model_json_schema()['properties'])}\n\n"
+            f"DOSSIER:\n{json.dumps(others, ensure_ascii=False)}"
+        )
+        try:
+            patch = parse_json(self.fast_llm.call(prompt), [])
+        except RunCancelled:
+            raise
+        except Exception as e:
+            print(f"Dossier fix-up failed: {e}")
+            return None
+        return patch if isinstance(patch, dict) else None
+
+    def _dossier_guardrail(self, topic: str, reports: list):
+        """Repairs compile output; each attempt's report is appended to this run's `reports`."""
+        def guardrail(output):
+            dossier, report = repair_dossier(output.raw, topic, fixer=self._fix_dossier_fields)
+            reports.append(report)
+            if report["outcome"] != "clean":
+                print(f"Compile output {report['outcome']}: {', '.join(report['fixes']) or 'no syntax fixes'}")
+            if dossier is None:
+                return False, f"The output is not a valid ResearchDossier JSON object ({report['error'][:500]}). Return ONLY the JSON object."
+            return True, dossier.model_dump_json()
+        return guardrail
+
+    def _checkpoint(self, run_id: str, task_name: str):
+        def save(output):
+            self.db.save_checkpoint(run_id, task_name, output.raw)
+        return save
+
+    def _announce_task(self, monitor: RunMonitor, task: Task):
+        monitor.task_started_at = time.perf_counter()
+        monitor.emit("task_started", task=task.name, agent=task.agent.role.strip())
+
+    def _task_finished(self, monitor: RunMonitor, tasks: list, index: int, save=None):
+        """Task callback: runs `save`, then reports this task done and the next one started."""
+        def done(output):
+            if monitor.task_started_at is not None:
+                TASK_SECONDS.labels(task=tasks[index].name).observe(time.perf_counter() - monitor.task_started_at)
+            if save:
+                save(output)
+            monitor.emit("task_finished", task=tasks[index].name, output=output.raw)
+            if index + 1 < len(tasks):
+                self._announce_task(monitor, tasks[index + 1])
+        return done
+
+    def resume_research(self, run_id: str, monitor: RunMonitor = None):
+        """Continues a failed or interrupted run, skipping the tasks it already finished."""
+        run = self.db.get_run(run_id)
+        if not run:
+            raise ValueError(f"Research run {run_id} not found.")
+        self.current_dossier = None
+        if run["dossier_id"] and not self.load_context(run["dossier_id"]):
+            raise ValueError(f"Dossier {run['dossier_id']} of run {run_id} not found.")
+        return self.run_research(run["topic"], instructions=run["instructions"] or "", profile=run["profile"], run_id=run_id, monitor=monitor)
+
+    def run_research(self, topic: str, instructions: str = "", profile: str = DEFAULT_PROFILE, run_id: str = None, monitor: RunMonitor = None):
+        """Researches `topic` (or updates the current dossier), checkpointing every task.
+
+        With `run_id` of an earlier run, tasks that already have a checkpoint
+        are skipped and their outputs are handed to the remaining ones.
+        `monitor` receives progress events; cancelling it stops the run with
+        RunCancelled at the next LLM or tool call (status 'cancelled').
+        """
+        monitor = monitor or RunMonitor()
+        with monitored(monitor), stage_span("research", topic=topic, profile=profile, resumed_run=run_id), run_timer("research"):
+            return self._research(topic, instructions, profile, run_id, monitor)
+
+    def _research(self, topic: str, instructions: str, profile: str, run_id: str, monitor: RunMonitor):
         print(f"\nStarting Research Session on: {topic}")
+        started = time.perf_counter()
+        config = self._apply_profile(profile)
+        self.ledger.reset()
+        self.crawl_budget.reset(**config["crawl_budget"])
         
         is_update = False
         if self.current_dossier:
             is_update = True
             print(f"Detected Update Mode for ID: {self.current_dossier.id}")
 
-        strategy = self.strategy_chief()
-        hunter = self.timeline_hunter()
-        analyst = self.context_analyst()
-
-        plan = Task(config=self.tasks_config['plan_task'], agent=strategy)
-        facts = Task(config=self.tasks_config['fact_finding_task'], agent=hunter)
-        analysis = Task(config=self.tasks_config['analysis_task'], agent=analyst)
-        
-        compile_t = Task(
-            config=self.tasks_config['compile_task'], 
-            agent=strategy, 
-            output_pydantic=ResearchDossier
-        )
-
-        research_crew = Crew(
-            agents=[strategy, hunter, analyst],
-            tasks=[plan, facts, analysis, compile_t],
-            verbose=True,
-            max_rpm=30
-        )
-
-        search_query = topic
-        if instructions:
-
-            search_query = f"{topic}. FOCUS STRICTLY ON FINDING THIS NEW INFO: {instructions}. (Context: North Macedonia/Balkans)"
-
-        result = research_crew.kickoff(inputs={"question": search_query})
-        new_dossier = result.pydantic
+        if run_id:
+            checkpoints = self.db.load_checkpoints(run_id)
+            self.db.set_run_status(run_id, "running")
+            print(f"Resuming run {run_id}: {', '.join(checkpoints) or 'no'} task(s) already done.")
+        else:
+            run_id = str(uuid.uuid4())
+            checkpoints = {}
+            self.db.save_run(run_id, topic, instructions, profile, dossier_id=self.current_dossier.id if is_update else None)
+        self.last_run_id = run_id
+        monitor.emit("run_started", run_id=run_id)
+
+        # Fresh agents on this run's capped LLMs
+        llms = self._run_llms(config)
+        strategy = self._build_strategy_chief(llms["smart"])
+        hunter = self._build_timeline_hunter(llms["fast"])
+        analyst = self._build_context_analyst(llms["smart"])
+        task_agents = {
+            'plan_task': strategy,
+            'quick_research_task': hunter,
+            'fact_finding_task': hunter,
+            'analysis_task': analyst,
+            'compile_task': strategy,
+        }
+
+        new_dossier = None
+        repairs = []
+        if 'compile_task' in checkpoints:
+            try:
+                new_dossier = ResearchDossier.model_validate_json(checkpoints['compile_task'])
+            except ValueError:
+                # The compile output was what failed; run it again
+                del checkpoints['compile_task']
+
+        # Outputs of finished tasks stand in for the context CrewAI would pass along
+        restored = ""
+        for name in config["research_tasks"]:
+            if name in checkpoints and name != 'compile_task':
+                restored += f"\n\n### Output of {name} (earlier in this run)\n{_escape_braces(checkpoints[name])}"
+        if restored:
+            restored = "\n\n**RESULTS OF THE STEPS ALREADY COMPLETED:**" + restored
+
+        tasks = []
+        for name in config["research_tasks"]:
+            if name in checkpoints:
+                continue
+            options = dict(
+                name=name,
+                config=self.tasks_config[name],
+                agent=task_agents[name],
+                callback=self._task_finished(monitor, tasks, len(tasks), save=self._checkpoint(run_id, name)),
+            )
+            if restored:
+                options["description"] = self.tasks_config[name]['description'] + restored
+            if name == 'compile_task':
+                # Parsed by our own repair step instead of CrewAI's LLM-backed converter
+                options["description"] = options.get("description", self.tasks_config[name]['description']) + COMPILE_SCHEMA
+                options["guardrail"] = self._dossier_guardrail(topic, repairs)
+                options["guardrail_max_retries"] = 1
+            elif name in FACT_TASKS:
+                options["guardrail"] = cited_facts_guardrail
+            tasks.append(Task(**options))
+
+        result = None
+        if new_dossier is None:
+            agents = []
+            for task in tasks:
+                if task.agent not in agents:
+                    agents.append(task.agent)
+
+            research_crew = Crew(
+                agents=agents,
+                tasks=tasks,
+                verbose=True,
+                max_rpm=30
+            )
+
+            search_query = topic
+            if instructions:
+
+                search_query = f"{topic}. FOCUS STRICTLY ON FINDING THIS NEW INFO: {instructions}. (Context: North Macedonia/Balkans)"
+
+            for tool in self.passage_tools:
+                tool.directive = f"{topic} {instructions}"
+
+            try:
+                monitor.check()
+                self._announce_task(monitor, tasks[0])
+                result = research_crew.kickoff(inputs={"question": search_query})
+                new_dossier = ResearchDossier.model_validate_json(result.raw)
+            except Exception as e:
+                if monitor.cancelled:
+                    self.db.set_run_status(run_id, "cancelled", error=monitor.reason)
+                    print(f"Research run {run_id} stopped. Finished tasks are saved; resume with: replay {run_id}")
+                    raise RunCancelled(monitor.reason) from e
+                self.db.set_run_status(run_id, "failed", error=f"{type(e).__name__}: {e}")
+                print(f"Research run {run_id} failed. Finished tasks are saved; resume with: replay {run_id}")
+                raise
+
+        REPUTATION.score_sources(new_dossier.sources)
+        self._report_run(profile, "research", started, result)
+        self.last_run_stats["run_id"] = run_id
+        self.last_run_stats["compile_repair"] = repairs[-1] if repairs else None
+        self.last_run_stats["resumed_tasks"] = [name for name in config["research_tasks"] if name in checkpoints]
+        self.last_run_stats["ledger"] = self.ledger.stats()
+        print(f"Ledger: {sum(self.last_run_stats['ledger']['deduplicated'].values())} duplicate tool calls answered in-run")
+        self.last_run_stats["crawl"] = self.crawl_budget.stats()
+        print(f"Crawl budget: {self.crawl_budget.fetches}/{self.crawl_budget.max_fetches} pages, {self.crawl_budget.bytes // 1024} KB")
 
         if is_update:
             self.current_dossier = self._merge_dossiers(self.current_dossier, new_dossier)
         else:
             self.current_dossier = new_dossier
 
-        self.db.save_dossier(self.current_dossier)
+        self.db.save_dossier(self.current_dossier, owner=self.owner)
+        self.db.set_run_status(run_id, "done", dossier_id=self.current_dossier.id)
         return self.current_dossier
 
-    def run_writer(self, instructions: str, lang: str):
-        if not self.current_dossier:
+    def run_writer(self, instructions: str, lang: str, dossier: ResearchDossier = None, save: bool = True, regenerate: bool = False, profile: str = DEFAULT_PROFILE, monitor: RunMonitor = None):
+        """Writes an article from `dossier` (default: the current one).
+
+        An article already written for the same dossier state, instructions
+        and language is returned from the database unless `regenerate` is set.
+        Speculative writes pass a snapshot with save=False; the caller
+        saves the article only if it is actually used. `monitor` works as
+        in run_research.
+        """
+        monitor = monitor or RunMonitor()
+        with monitored(monitor), stage_span("writing", language=lang, profile=profile, speculative=not save), run_timer("writing"):
+            return self._write(instructions, lang, dossier, save, regenerate, profile, monitor)
+
+    def _write(self, instructions: str, lang: str, dossier: ResearchDossier, save: bool, regenerate: bool, profile: str, monitor: RunMonitor):
+        dossier = dossier or self.current_dossier
+        if not dossier:
             raise ValueError("No dossier loaded.")
 
-        writer_agent = self.writer()
-        context_data = self.current_dossier.model_dump_json()
+        cache_key = article_cache_key(dossier, instructions, lang, profile)
+        if not regenerate:
+            cached = self.db.find_cached_article(cache_key)
+            ARTICLE_CACHE.labels(result="hit" if cached is not None else "miss").inc()
+            if cached is not None:
+                print(f"Reusing stored article for dossier {dossier.id}.")
+                return cached
+
+        started = time.perf_counter()
+        config = self._apply_profile(profile)
+
+        # Fresh agent per run so a speculative write can overlap a real one
+        writer_agent = self._build_writer(self._run_llms(config)["write"])
+        context_data = dossier.model_dump_json()
 
         # 1. Draft Task
         write_task = Task(
+            name='write_task',
             config=self.tasks_config['write_task'],
             agent=writer_agent,
             description=self.tasks_config['write_task']['description'].format(
@@ -287,25 +592,45 @@ class JournalistCrew:
 
         # 2. Edit Task
         edit_task = Task(
+            name='edit_task',
             config=self.tasks_config['edit_task'],
             agent=writer_agent,
             context=[write_task]
         )
 
+        writer_tasks = {'write_task': write_task, 'edit_task': edit_task}
+        tasks = [writer_tasks[name] for name in config["writer_tasks"]]
+        for index, task in enumerate(tasks):
+            task.callback = self._task_finished(monitor, tasks, index)
+
         writing_crew = Crew(
             agents=[writer_agent],
-            tasks=[write_task, edit_task],
+            tasks=tasks,
             verbose=True,
             max_rpm=30
         )
 
-        result = writing_crew.kickoff()
-
-        self.db.save_article(
-            self.current_dossier.id,
-            result.raw,
-            instructions,
-            lang
-        )
-
-        return result.raw
\ No newline at end of file
+        try:
+            monitor.check()
+            self._announce_task(monitor, tasks[0])
+            result = writing_crew.kickoff()
+        except Exception as e:
+            if monitor.cancelled:
+                print("Writing stopped.")
+                raise RunCancelled(monitor.reason) from e
+            raise
+        self._report_run(profile, "writing", started, result)
+
+        # The writer keeps the dossier's numbered citations; links are resolved only now
+        article = expand_article(result.raw, dossier.sources)
+
+        if save:
+            self.db.save_article(
+                dossier.id,
+                article,
+                instructions,
+                lang,
+                cache_key=cache_key
+            )
+
+        return article
\ No newline at end of file
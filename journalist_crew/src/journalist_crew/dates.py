@@ -0,0 +1,219 @@
+"""Normalizes free-form timeline dates ("May 2008", "2008-05", "1990s").
+
+`TimelineEvent.year` is whatever the agents wrote. parse_date turns it into
+an inclusive ISO date range plus how precise the original was, so timelines
+sort chronologically and can be stored in timeline_events for range
+queries. The original text is always kept for display.
+
+Open-ended periods ("2011–present", "since 2015") end at OPEN_END rather
+than today, so stored rows don't go stale.
+"""
+import calendar
+import datetime
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+PRECISIONS = ("day", "month", "year", "decade", "century")
+
+# End date of periods that are still going on
+OPEN_END = "9999-12-31"
+
+# Longest span, in days, stored under each span_scale; the last scale is
+# unbounded (open-ended and multi-century spans). Range queries look back
+# this far per scale, so each part of the query is a bounded index range.
+SCALE_DAYS = (31, 366, 3653, 36525, None)
+UNBOUNDED_SCALE = len(SCALE_DAYS) - 1
+
+_MONTHS = {}
+for _number, _names in enumerate([
+    ("january", "jan", "janar"),
+    ("february", "feb", "shkurt"),
+    ("march", "mar", "mars"),
+    ("april", "apr", "prill"),
+    ("may", "maj"),
+    ("june", "jun", "qershor"),
+    ("july", "jul", "korrik"),
+    ("august", "aug", "gusht"),
+    ("september", "sep", "sept", "shtator"),
+    ("october", "oct", "tetor"),
+    ("november", "nov", "nëntor", "nentor"),
+    ("december", "dec", "dhjetor"),
+], start=1):
+    for _name in _names:
+        _MONTHS[_name] = _number
+
+_MONTH = r"(" + "|".join(sorted(map(re.escape, _MONTHS), key=len, reverse=True)) + r")\.?"
+
+# Qualifiers that don't change the period a date falls in
+_QUALIFIERS = re.compile(r"^(?:c\.|ca\.|circa|around|about|approx\.?|early|late|mid-?|in|by|spring|summer|autumn|fall|winter|the|fillim(?:i)?|fund(?:i)?|mes(?:i)?|vit(?:i|in)?)\s*")
+_PRESENT = r"(?:present|ongoing|today|now|sot|e sotme)"
+_RANGE_SPLIT = re.compile(
+    r"\s*(?:–|—|\s-\s|\bto\b|\buntil\b|\bthrough\b|\bderi(?: në)?\b)\s*"
+    r"|(?:(?<=\d{4})|(?<=\d{4}s))-(?=\d{4}s?\b|" + _PRESENT + r"\b)"
+)
+# "since 2015", "ever since May 2011", "që nga 2015"
+_SINCE = re.compile(r"^(?:ever\s+)?since\s+|^(?:që\s+)?nga\s+")
+_OPEN = re.compile(r"(?:the\s+)?" + _PRESENT + r"(?:\s+day)?")
+_ANY_YEAR = re.compile(r"\b(1[0-9]{3}|20[0-9]{2})(s?)\b")
+
+
+class DateSpan(NamedTuple):
+    start: str       # ISO date, inclusive
+    end: str         # ISO date, inclusive; OPEN_END for ongoing periods
+    precision: str   # one of PRECISIONS
+
+    @property
+    def open_ended(self) -> bool:
+        return self.end == OPEN_END
+
+    @property
+    def scale(self) -> int:
+        """Index into SCALE_DAYS of the shortest bound covering this span."""
+        if self.open_ended:
+            return UNBOUNDED_SCALE
+        days = (datetime.date.fromisoformat(self.end) - datetime.date.fromisoformat(self.start)).days
+        return next(i for i, limit in enumerate(SCALE_DAYS) if limit is None or days <= limit)
+
+
+def _span(start: datetime.date, end: datetime.date, precision: str) -> DateSpan:
+    return DateSpan(start.isoformat(), end.isoformat(), precision)
+
+
+def _day(year: int, month: int, day: int) -> Optional[DateSpan]:
+    try:
+        date = datetime.date(year, month, day)
+    except ValueError:
+        return None
+    return _span(date, date, "day")
+
+
+def _month(year: int, month: int) -> Optional[DateSpan]:
+    if not 1 <= month <= 12 or not 1 <= year <= 9999:
+        return None
+    return _span(datetime.date(year, month, 1), datetime.date(year, month, calendar.monthrange(year, month)[1]), "month")
+
+
+def _years(first: int, last: int, precision: str) -> Optional[DateSpan]:
+    if not 1 <= first <= last <= 9999:
+        return None
+    return _span(datetime.date(first, 1, 1), datetime.date(last, 12, 31), precision)
+
+
+def _point(text: str) -> Optional[DateSpan]:
+    """One date or period, written as a whole (no ranges)."""
+    while True:
+        stripped = _QUALIFIERS.sub("", text, count=1)
+        if stripped == text:
+            break
+        text = stripped
+    text = text.strip(" ,.;:()")
+
+    if m := re.fullmatch(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})", text):
+        return _day(int(m[1]), int(m[2]), int(m[3]))
+    # Day first, as written in the region's press
+    if m := re.fullmatch(r"(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})", text):
+        return _day(int(m[3]), int(m[2]), int(m[1]))
+    if m := re.fullmatch(r"(\d{4})[-/](\d{1,2})", text):
+        return _month(int(m[1]), int(m[2]))
+    if m := re.fullmatch(r"(\d{1,2})[/.](\d{4})", text):
+        return _month(int(m[2]), int(m[1]))
+    if m := re.fullmatch(r"(\d{1,2})(?:st|nd|rd|th)?\s+" + _MONTH + r",?\s+(\d{4})", text):
+        return _day(int(m[3]), _MONTHS[m[2]], int(m[1]))
+    if m := re.fullmatch(_MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})", text):
+        return _day(int(m[3]), _MONTHS[m[1]], int(m[2]))
+    if m := re.fullmatch(_MONTH + r",?\s+(\d{4})", text):
+        return _month(int(m[2]), _MONTHS[m[1]])
+    if m := re.fullmatch(r"(\d{4})", text):
+        return _years(int(m[1]), int(m[1]), "year")
+    if m := re.fullmatch(r"(\d{3})0'?s", text):
+        return _years(int(m[1]) * 10, int(m[1]) * 10 + 9, "decade")
+    if m := re.fullmatch(r"'?(\d)0'?s", text):
+        # "the 90s": the 1900s for 30s-90s, the 2000s for 00s and 10s/20s
+        decade = int(m[1]) * 10
+        start = (1900 if decade >= 30 else 2000) + decade
+        return _years(start, start + 9, "decade")
+    if m := re.fullmatch(r"(\d{1,2})(?:st|nd|rd|th)\s+century", text):
+        start = (int(m[1]) - 1) * 100
+        return _years(max(start, 1), start + 99, "century")
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str) -> Optional[DateSpan]:
+    """Inclusive date range and precision of a timeline date, or None if it has no date.
+
+    Ranges ("2006–2012", "May to June 2008", "1980s-1990s") span both ends
+    and take the coarser precision. Ranges ending in "present"/"ongoing"
+    and "since ..." dates are open-ended. Text around a single year or
+    decade ("early 2008") falls back to that period.
+    """
+    text = (text or "").strip().lower()
+    if not text:
+        return None
+
+    since = _SINCE.match(text)
+    if since:
+        # "since 2008 until 2010" is an ordinary range
+        text = text[since.end():]
+    span = _point(text)
+    if span:
+        return DateSpan(span.start, OPEN_END, span.precision) if since else span
+
+    parts = [p for p in _RANGE_SPLIT.split(text) if p and p.strip()]
+    if len(parts) == 2:
+        first = _point(parts[0])
+        if first and _OPEN.fullmatch(parts[1].strip(" ,.;:()")):
+            return DateSpan(first.start, OPEN_END, first.precision)
+        last = _point(parts[1])
+        if first is None and last is not None:
+            # "may to june 2008": the first end borrows the year of the second
+            first = _point(f"{parts[0]} {last.start[:4]}")
+        if first and last and first.start <= last.end:
+            precision = max(first.precision, last.precision, key=PRECISIONS.index)
+            return DateSpan(first.start, last.end, precision)
+
+    spans = [_years(int(y), int(y) + 9, "decade") if s else _years(int(y), int(y), "year") for y, s in _ANY_YEAR.findall(text)]
+    spans = [s for s in spans if s]
+    if spans:
+        precision = max((s.precision for s in spans), key=PRECISIONS.index)
+        return DateSpan(spans[0].start, max(spans[0].end, spans[-1].end), precision)
+    return None
+
+
+def timeline_sort_key(event) -> tuple:
+    """Chronological order for TimelineEvents; undated entries go last, in their original order."""
+    span = parse_date(event.year)
+    return (0, span.start, span.end) if span else (1, "", "")
+
+
+def timeline_rows(entries: Iterable[Tuple[str, str]]) -> List[tuple]:
+    """Rows for timeline_events from (date text, event) pairs, in timeline order.
+
+    (position, label, event, start_date, end_date, precision, span_scale);
+    entries without a recognisable date are skipped, since no range can
+    match them.
+    """
+    rows = []
+    for position, (label, event) in enumerate(entries):
+        span = parse_date(label)
+        if span:
+            rows.append((position, label, event, span.start, span.end, span.precision, span.scale))
+    return rows
+
+
+def scale_windows(first: str, last: str) -> List[Tuple[int, Optional[str]]]:
+    """(span_scale, earliest start_date) pairs covering every span that overlaps [first, last].
+
+    A span of scale i overlapping the range can't start more than
+    SCALE_DAYS[i] days before `first`; the unbounded scale has no lower limit.
+    """
+    windows = []
+    first_day = datetime.date.fromisoformat(first)
+    for scale, limit in enumerate(SCALE_DAYS):
+        if limit is None:
+            windows.append((scale, None))
+        else:
+            earliest = first_day - datetime.timedelta(days=min(limit, (first_day - datetime.date.min).days))
+            windows.append((scale, earliest.isoformat()))
+    return windows
@@ -0,0 +1,136 @@
+"""Dedicated worker pools for crew runs, with a bounded queue per pool.
+
+Crew runs are long and heavy, so they don't share the event loop's default
+executor: research and writing each get a fixed number of threads, and at
+most `max_queue` runs wait behind them. Past that, `submit` raises
+Overloaded instead of letting every run on the replica slow down.
+"""
+import asyncio
+import contextvars
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+# How often a queued run's position is refreshed for the user
+QUEUE_POLL_SECONDS = 1.0
+
+
+class Overloaded(Exception):
+    """Raised when a pool's workers are busy and its queue is full."""
+
+    def __init__(self, pool: str, queued: int):
+        super().__init__(f"The {pool} pool is full ({queued} runs waiting).")
+        self.pool = pool
+        self.queued = queued
+
+
+class RunPool:
+    """A fixed-size thread pool that knows each waiting run's queue position."""
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"crew-{name}")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._queued = []
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.waited = 0.0
+
+    def submit(self, fn: Callable, *args, only_if_idle: bool = False, **kwargs) -> Future:
+        """Queues fn(*args, **kwargs) with the caller's context variables.
+
+        `only_if_idle` (for optional work such as speculative drafts)
+        refuses to queue at all unless a worker is free right now.
+        """
+        with self._lock:
+            busy = self.running + len(self._queued) >= self.workers
+            if busy and (only_if_idle or len(self._queued) >= self.max_queue):
+                self.rejected += 1
+                raise Overloaded(self.name, len(self._queued))
+            job_id = next(self._ids)
+            self._queued.append(job_id)
+
+        # The run sees the submitting request's context (Chainlit session, RunMonitor, ...)
+        context = contextvars.copy_context()
+        queued_at = time.monotonic()
+
+        def job():
+            with self._lock:
+                self._queued.remove(job_id)
+                self.running += 1
+                self.waited += time.monotonic() - queued_at
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        future = self._executor.submit(job)
+        future.job_id = job_id
+        future.add_done_callback(lambda f: self._drop(job_id) if f.cancelled() else None)
+        return future
+
+    def _drop(self, job_id: int):
+        with self._lock:
+            if job_id in self._queued:
+                self._queued.remove(job_id)
+
+    def position(self, future: Future) -> int:
+        """1-based place in the queue, or 0 once the run has started."""
+        with self._lock:
+            try:
+                return self._queued.index(future.job_id) + 1
+            except ValueError:
+                return 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "workers": self.workers,
+                "running": self.running,
+                "queued": len(self._queued),
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_s": round(self.waited / started, 2) if started else 0.0,
+            }
+
+
+async def run_in_pool(pool: RunPool, fn: Callable, *args, on_queued: Optional[Callable] = None, only_if_idle: bool = False, **kwargs):
+    """Awaits fn(*args, **kwargs) on `pool`.
+
+    While the run waits, `on_queued(position)` (a coroutine function) is
+    awaited whenever its queue position changes, and once more with 0 when
+    it starts. Cancelling the awaiting task takes a still-queued run out of
+    the queue; a started run has to be stopped through its RunMonitor.
+    """
+    future = pool.submit(fn, *args, only_if_idle=only_if_idle, **kwargs)
+    waiter = asyncio.wrap_future(future)
+    try:
+        last = None
+        while on_queued is not None and last != 0:
+            position = pool.position(future)
+            if position != last:
+                last = position
+                await on_queued(position)
+            if position:
+                await asyncio.wait({waiter}, timeout=QUEUE_POLL_SECONDS)
+                if waiter.done():
+                    break
+        return await waiter
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+
+
+RESEARCH_POOL = RunPool("research", int(os.getenv("RESEARCH_WORKERS", "4")), int(os.getenv("RESEARCH_QUEUE", "8")))
+WRITING_POOL = RunPool("writing", int(os.getenv("WRITING_WORKERS", "4")), int(os.getenv("WRITING_QUEUE", "8")))
@@ -0,0 +1,165 @@
+"""Main-content extraction and passage ranking for scraped pages.
+
+Pages are reduced to their article text (navigation, comments, footers and
+scripts dropped), split into passages of roughly `max_words`, and ranked
+against the current research directive with BM25 so only the relevant
+passages reach the agent.
+"""
+import math
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from typing import List, Tuple
+
+SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe", "button", "select", "template"}
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "table", "tr", "td", "th", "br", "figcaption", "dd", "dt"}
+# class/id fragments of page chrome that is not marked up with semantic tags
+BOILERPLATE_HINTS = ("comment", "nav", "menu", "footer", "share", "social", "related", "cookie", "sidebar", "banner", "newsletter", "subscribe", "advert", "promo", "breadcrumb")
+CONTENT_TAGS = {"article", "main"}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _is_boilerplate(attrs) -> bool:
+    for name, value in attrs:
+        if name in ("class", "id", "role") and value:
+            value = value.lower()
+            if any(hint in value for hint in BOILERPLATE_HINTS):
+                return True
+    return False
+
+
+class _MainContentParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.blocks: List[Tuple[bool, str]] = []
+        self._current: List[str] = []
+        self._skip_tag = None
+        self._skip_depth = 0
+        self._content_depth = 0
+        self._in_title = False
+
+    def _flush(self):
+        text = " ".join("".join(self._current).split())
+        if text:
+            self.blocks.append((self._content_depth > 0, text))
+        self._current = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag in SKIP_TAGS or (tag in BLOCK_TAGS and _is_boilerplate(attrs)):
+            self._flush()
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in CONTENT_TAGS:
+            self._content_depth += 1
+
+    def handle_endtag(self, tag):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag == "title":
+            self._in_title = False
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in CONTENT_TAGS and self._content_depth:
+            self._content_depth -= 1
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_tag:
+            self._current.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def extract_main_text(html: str) -> Tuple[str, List[str]]:
+    """Returns (title, paragraphs) of the page's main content."""
+    parser = _MainContentParser()
+    parser.feed(html)
+    parser.close()
+    # Prefer <article>/<main> when the page marks it up
+    paragraphs = [text for in_content, text in parser.blocks if in_content]
+    if not paragraphs:
+        paragraphs = [text for _, text in parser.blocks]
+    return " ".join(parser.title.split()), paragraphs
+
+
+def split_passages(paragraphs: List[str], max_words: int = 120) -> List[str]:
+    """Packs paragraphs into passages of about `max_words`, splitting long ones at sentences."""
+    passages, current, count = [], [], 0
+
+    def flush():
+        nonlocal current, count
+        if current:
+            passages.append(" ".join(current))
+        current, count = [], 0
+
+    for paragraph in paragraphs:
+        pieces = [paragraph] if len(paragraph.split()) <= max_words else _SENTENCE_RE.split(paragraph)
+        for piece in pieces:
+            words = len(piece.split())
+            if count and count + words > max_words:
+                flush()
+            current.append(piece)
+            count += words
+        # Short paragraphs are packed together; a full one closes the passage
+        if count >= max_words // 2:
+            flush()
+    flush()
+    return passages
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.casefold()) if len(token) > 1]
+
+
+def bm25_scores(query: str, passages: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    docs = [tokenize(p) for p in passages]
+    if not docs:
+        return []
+    avg_len = sum(len(d) for d in docs) / len(docs) or 1.0
+    doc_freq = Counter(term for d in docs for term in set(d))
+    query_terms = set(tokenize(query))
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        score = 0.0
+        for term in query_terms:
+            if term not in tf:
+                continue
+            idf = math.log((len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5) + 1)
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * len(doc) / avg_len))
+        scores.append(score)
+    return scores
+
+
+def top_passages(query: str, passages: List[str], k: int = 5) -> List[Tuple[int, float, str]]:
+    """The k best passages as (index, score, text), in page order.
+
+    With no query-term overlap the page lead is returned instead.
+    """
+    scores = bm25_scores(query, passages)
+    ranked = sorted(range(len(passages)), key=lambda i: scores[i], reverse=True)
+    if not ranked or scores[ranked[0]] == 0:
+        chosen = list(range(min(k, len(passages))))
+    else:
+        chosen = sorted(i for i in ranked[:k] if scores[i] > 0)
+    return [(i, round(scores[i], 3) if scores else 0.0, passages[i]) for i in chosen]
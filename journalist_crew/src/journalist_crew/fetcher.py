@@ -0,0 +1,129 @@
+"""Pooled, polite page fetching shared by the scrape tools.
+
+One requests.Session keeps connections alive across calls, a thread pool
+fetches batches concurrently, and a semaphore per domain keeps us from
+hammering any single site. Every fetch has a connect/read timeout, an
+overall deadline and a size limit.
+"""
+import codecs
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9,mk;q=0.8,sq;q=0.7",
+}
+TEXT_TYPES = ("text/", "application/xhtml", "application/xml", "application/json")
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+
+def _codec(name) -> Optional[str]:
+    try:
+        return codecs.lookup(name).name if name else None
+    except LookupError:
+        return None
+
+
+def decode_body(body: bytes, content_type: str, header_encoding: Optional[str] = None) -> str:
+    """Decodes a page using the HTTP charset, then <meta charset>, then a guess, then utf-8.
+
+    Many regional sites serve windows-1251/1250 without a charset header,
+    so utf-8 alone turns Cyrillic into replacement characters.
+    """
+    encoding = _codec(header_encoding) if "charset" in content_type else None
+    if not encoding and (m := META_CHARSET.search(body[:4096])):
+        encoding = _codec(m[1].decode("ascii", "ignore"))
+    if not encoding and chardet is not None:
+        encoding = _codec(chardet.detect(body)["encoding"])
+    return body.decode(encoding or "utf-8", errors="replace")
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: Optional[int] = None
+    text: str = ""
+    error: Optional[str] = None
+    bytes: int = 0
+    truncated: bool = False
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Fetcher:
+    def __init__(self, max_workers: int = 16, per_domain: int = 2, connect_timeout: float = 5.0, read_timeout: float = 15.0, deadline: float = 30.0, max_bytes: int = 2_000_000):
+        self.per_domain = per_domain
+        self.timeout = (connect_timeout, read_timeout)
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._domains = defaultdict(lambda: threading.BoundedSemaphore(self.per_domain))
+        self._lock = threading.Lock()
+
+    def _domain_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            return self._domains[host]
+
+    def fetch(self, url: str) -> FetchResult:
+        result = FetchResult(url=url)
+        with self._domain_slot(url):
+            # The deadline covers this fetch, not the wait for the domain's slot
+            start = time.monotonic()
+            try:
+                with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                    result.status = response.status_code
+                    response.raise_for_status()
+                    content_type = response.headers.get("Content-Type", "text/html").lower()
+                    if not content_type.startswith(TEXT_TYPES):
+                        raise ValueError(f"unsupported content type {content_type.split(';')[0]}")
+
+                    chunks, size = [], 0
+                    for chunk in response.iter_content(chunk_size=65536):
+                        # Checked before taking more of the body, so a page that has
+                        # finished downloading is never thrown away
+                        if time.monotonic() - start > self.deadline:
+                            raise TimeoutError(f"took longer than {self.deadline}s")
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= self.max_bytes:
+                            result.truncated = True
+                            break
+
+                    body = b"".join(chunks)[: self.max_bytes]
+                    result.bytes = len(body)
+                    result.text = decode_body(body, content_type, response.encoding)
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+            result.seconds = time.monotonic() - start
+        return result
+
+    def fetch_many(self, urls: List[str]) -> List[FetchResult]:
+        """Fetches all urls concurrently; results come back in input order."""
+        return list(self._pool.map(self.fetch, urls))
+
+
+SHARED_FETCHER = Fetcher(
+    max_workers=int(os.getenv("FETCH_MAX_WORKERS", "16")),
+    per_domain=int(os.getenv("FETCH_PER_DOMAIN", "2")),
+    max_bytes=int(os.getenv("FETCH_MAX_BYTES", "2000000")),
+)
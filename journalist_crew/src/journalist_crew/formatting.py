@@ -0,0 +1,68 @@
+import json
+
+from pydantic import ValidationError
+
+from journalist_crew.citations import expand_text
+from journalist_crew.models import CitedFact
+
+def format_dossier_to_markdown(dossier):
+    # Numbered citations are stored compactly and only expanded to links here
+    sources = dossier.sources
+    md = f"# Research Dossier: {dossier.topic}\n\n"
+    
+    md += "### Executive Summary\n"
+    for point in dossier.executive_summary:
+        md += f"- {expand_text(point, sources)}\n"
+    
+    md += "\n### Narrative\n"
+    md += f"{expand_text(dossier.comprehensive_narrative, sources)}\n"
+    
+    md += "\n### Timeline\n"
+    for event in dossier.timeline:
+        md += f"- **{event.year}**: {expand_text(event.event, sources)}\n"
+
+    md += "\n### Key Figures\n"
+    md += "| Name | Role | Impact |\n|---|---|---|\n"
+    for fig in dossier.key_figures:
+        c_name = str(fig.name).replace("|", "-")
+        c_role = str(fig.role).replace("|", "-")
+        c_impact = expand_text(str(fig.impact).replace("|", "-"), sources)
+        md += f"| {c_name} | {c_role} | {c_impact} |\n"
+    
+    if hasattr(dossier, 'sources') and dossier.sources:
+        md += "\n### Sources\n"
+        for n, src in enumerate(dossier.sources, start=1):
+            md += f"{n}. [{src.title}]({src.url})\n"
+
+    return md
+
+def format_citation(statement: str, source_name: str, source_url: str) -> str:
+    return f"{statement} ([{source_name}]({source_url}))"
+
+def parse_cited_facts(text: str):
+    """CitedFacts from a JSON list (optionally fenced or under "facts"); invalid items are dropped."""
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return []
+    try:
+        items = json.loads(text[start:end + 1])
+    except ValueError:
+        return []
+    facts = []
+    for item in items:
+        try:
+            facts.append(CitedFact.model_validate(item))
+        except ValidationError:
+            continue
+    return facts
+
+def format_cited_fact(fact) -> str:
+    cited = format_citation(fact.statement.strip(), fact.source_name, fact.source_url)
+    return f"- **{fact.date}**: {cited}" if fact.date else f"- {cited}"
+
+def format_cited_facts(facts) -> str:
+    """Renders CitedFacts as a markdown list with inline clickable citations."""
+    return "\n".join(format_cited_fact(fact) for fact in facts)
+
+def format_article(article: str) -> str:
+    return "### Writer Draft\n\n" + article.strip()
@@ -0,0 +1,260 @@
+"""Offline stand-ins for OpenRouter, Serper and the open web.
+
+ScriptedLLM speaks the ReAct format CrewAI agents expect and walks each
+task through a fixed script of tool calls before answering. The search
+tool is backed by fixtures and the page server serves those fixtures over
+real HTTP, so the real scrape tools work against it unchanged.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from crewai import BaseLLM
+from crewai.tools import BaseTool
+from crewai_tools import ScrapeWebsiteTool
+from pydantic import BaseModel, Field
+
+from journalist_crew.harness.synthetic import make_dossier
+from journalist_crew.tools.batch_scrape_tool import BatchScrapeTool
+from journalist_crew.tools.passage_scrape_tool import PassageScrapeTool
+
+# --- FIXTURES ---
+
+def build_fixtures(topic: str, base_url: str, pages: int = 8) -> Dict:
+    """Search results and page bodies derived from a synthetic dossier."""
+    dossier = make_dossier("small" if pages <= 8 else "medium", seed=len(topic), topic=topic)
+    organic, page_bodies = [], {}
+    for i, src in enumerate(dossier.sources[:pages]):
+        path = f"/articles/{i}.html"
+        organic.append({"title": src.title, "link": f"{base_url}{path}", "snippet": dossier.timeline[i].event, "position": i + 1})
+        paragraphs = "".join(f"<p>{e.year}: {e.event}</p>" for e in dossier.timeline)
+        page_bodies[path] = (
+            f"<html><head><title>{src.title}</title></head><body>"
+            f"<nav>Home | Politics | Economy | Contact</nav>"
+            f"<article><h1>{src.title}</h1>{paragraphs}<p>{dossier.comprehensive_narrative}</p></article>"
+            f"<footer>Comments (0) | Share</footer></body></html>"
+        )
+    return {"search": {"*": organic}, "pages": page_bodies}
+
+
+def load_fixtures(path: str, base_url: str) -> Dict:
+    """Loads recorded fixtures; "{base_url}" in links is replaced with the page server URL."""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read().replace("{base_url}", base_url)
+    return json.loads(raw)
+
+
+# --- LOCAL PAGE SERVER ---
+
+class PageServer:
+    """Serves fixture pages on 127.0.0.1 from a background thread."""
+
+    def __init__(self, pages: Optional[Dict[str, str]] = None, delay: float = 0.0):
+        self.pages = pages or {}
+        self.delay = delay
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.delay:
+                    time.sleep(server.delay)
+                body = server.pages.get(self.path.split("?")[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# --- TOOLS ---
+
+class FixtureSearchInput(BaseModel):
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class FixtureSearchTool(BaseTool):
+    """Drop-in for SerperDevTool that answers from fixtures."""
+    name: str = "Search the internet with Serper"
+    description: str = "A tool that can be used to search the internet with a search_query."
+    args_schema: type[BaseModel] = FixtureSearchInput
+    results: Dict[str, List[Dict]] = Field(default_factory=dict)
+    calls: int = 0
+    elapsed: float = 0.0
+
+    def _run(self, search_query: str) -> str:
+        start = time.perf_counter()
+        organic = self.results.get(search_query, self.results.get("*", []))
+        payload = json.dumps({"searchParameters": {"q": search_query}, "organic": organic})
+        self.calls += 1
+        self.elapsed += time.perf_counter() - start
+        return payload
+
+
+class TimedScrapeTool(PassageScrapeTool):
+    """The crew's PassageScrapeTool, with its time accounted for."""
+    calls: int = 0
+    elapsed: float = 0.0
+
+    def _run(self, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._run(**kwargs)
+        finally:
+            self.calls += 1
+            self.elapsed += time.perf_counter() - start
+
+
+class TimedBatchScrapeTool(BatchScrapeTool):
+    """The crew's BatchScrapeTool, with its time accounted for."""
+    calls: int = 0
+    elapsed: float = 0.0
+
+    def _run(self, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._run(**kwargs)
+        finally:
+            self.calls += 1
+            self.elapsed += time.perf_counter() - start
+
+
+class TimedPageScrapeTool(ScrapeWebsiteTool):
+    """The whole-page ScrapeWebsiteTool, for comparison with passage ranking."""
+    calls: int = 0
+    elapsed: float = 0.0
+
+    def _run(self, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._run(**kwargs)
+        finally:
+            self.calls += 1
+            self.elapsed += time.perf_counter() - start
+
+
+# --- SCRIPTED LLM ---
+
+def _react_action(tool: str, tool_input: Dict, thought: str) -> str:
+    return f"Thought: {thought}\nAction: {tool}\nAction Input: {json.dumps(tool_input)}"
+
+
+def _react_final(answer: str) -> str:
+    return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+
+class ScriptedLLM(BaseLLM):
+    """Deterministic LLM that follows a per-task script of tool calls.
+
+    The task is recognised from `from_task.name` (the crew names its tasks
+    after tasks.yaml keys) and the step from the number of assistant turns
+    already in the conversation. `latency` simulates model time per call.
+    """
+
+    def __init__(self, topic: str = "Synthetic topic", fixtures: Optional[Dict] = None, latency: float = 0.0, scale: str = "small"):
+        super().__init__(model="scripted/offline", temperature=0.0)
+        self.topic = topic
+        self.fixtures = fixtures or {"search": {}, "pages": {}}
+        self.latency = latency
+        self.scale = scale
+        self.calls = 0
+        self.elapsed = 0.0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+
+    def _links(self) -> List[str]:
+        organic = self.fixtures["search"].get("*") or next(iter(self.fixtures["search"].values()), [])
+        return [item["link"] for item in organic] or ["http://127.0.0.1/missing"]
+
+    def _script(self, task_name: str, step: int) -> str:
+        links = self._links()
+        link = links[0]
+        if task_name == "plan_task":
+            if step == 0:
+                return _react_action("Search the internet with Serper", {"search_query": self.topic}, "I need an overview first.")
+            return _react_final("1. Search origins of the project.\n2. Search tender amounts.\n3. Search responsible ministers.")
+        if task_name in ("fact_finding_task", "quick_research_task"):
+            script = [
+                _react_action("Search the internet with Serper", {"search_query": f"{self.topic} tender"}, "Find the key articles."),
+                _react_action("Read multiple websites", {"website_urls": links[:4]}, "Read the most relevant articles."),
+            ]
+            if step < len(script):
+                return script[step]
+            facts = [
+                {"date": "2008", "statement": "The tender was signed.", "source_name": "Fixture News", "source_url": link},
+                {"date": "2010", "statement": "Construction started.", "source_name": "Fixture News", "source_url": links[-1]},
+            ]
+            return _react_final(json.dumps(facts))
+        if task_name == "analysis_task":
+            if step == 0:
+                return _react_action("Read website content", {"website_url": link}, "Check the political context.")
+            return _react_final("Both major parties used the project as a campaign promise.")
+        if task_name == "compile_task":
+            dossier = make_dossier(self.scale, seed=len(self.topic), topic=self.topic)
+            return _react_final(dossier.model_dump_json(exclude={"id"}))
+        if task_name == "write_task":
+            return _react_final(f"# {self.topic}\n\nSKOPJE, North Macedonia - " + "Offline draft paragraph. " * 200)
+        if task_name == "edit_task":
+            return _react_final(f"# {self.topic}\n\nSKOPJE, North Macedonia - " + "Offline edited paragraph. " * 200)
+        return _react_final("Done.")
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None, response_model=None, **kwargs):
+        start = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+
+        task_name = getattr(from_task, "name", None) or ""
+        if isinstance(messages, str):
+            step, prompt_chars = 0, len(messages)
+        else:
+            step = sum(1 for m in messages if m.get("role") == "assistant")
+            prompt_chars = sum(len(str(m.get("content") or "")) for m in messages)
+        answer = self._script(task_name, step)
+
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += prompt_chars
+            self.elapsed += time.perf_counter() - start
+        return answer
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128000
@@ -0,0 +1,158 @@
+"""Offline end-to-end run of the research and writing pipeline.
+
+Wires JournalistCrew to the stand-ins in harness/fakes.py and a throwaway
+SQLite database, runs research then writing, and reports per stage where
+wall time went: LLM, tools, DB, rendering and the remaining orchestration
+overhead (CrewAI prompt building, parsing, event bus, our own glue).
+
+    uv run test --iterations 3 --output e2e.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict
+
+# Never phone home from CI.
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from journalist_crew.crew import DEFAULT_PROFILE, PROFILES, JournalistCrew
+from journalist_crew.formatting import format_article, format_dossier_to_markdown
+from journalist_crew.harness.fakes import FixtureSearchTool, PageServer, ScriptedLLM, TimedBatchScrapeTool, TimedPageScrapeTool, TimedScrapeTool, build_fixtures, load_fixtures
+from journalist_crew.limits import RateLimiter
+from journalist_crew.storage import StorageManager
+
+
+class TimedStorage:
+    """Proxy around a StorageManager that accumulates time per method."""
+
+    def __init__(self, inner):
+        self._inner = inner
+        self.timings = defaultdict(float)
+
+    def __getattr__(self, name):
+        attr = getattr(self._inner, name)
+        if not callable(attr):
+            return attr
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self.timings[name] += time.perf_counter() - start
+
+        return timed
+
+    def total(self) -> float:
+        return sum(self.timings.values())
+
+
+class StageClock:
+    """Snapshots the stand-ins' counters so each stage can be reported on its own."""
+
+    def __init__(self, llm, search, scrape, batch_scrape, db):
+        self.sources = {"llm": llm, "search": search, "scrape": scrape, "batch_scrape": batch_scrape}
+        self.db = db
+
+    def snapshot(self) -> Dict:
+        snap = {name: (src.elapsed, src.calls) for name, src in self.sources.items()}
+        snap["prompt"] = (self.sources["llm"].prompt_chars, 0)
+        snap["db"] = (self.db.total(), 0)
+        snap["wall"] = (time.perf_counter(), 0)
+        return snap
+
+    @staticmethod
+    def diff(before: Dict, after: Dict, render: float) -> Dict:
+        delta = {k: after[k][0] - before[k][0] for k in before}
+        tools = delta["search"] + delta["scrape"] + delta["batch_scrape"]
+        overhead = delta["wall"] - delta["llm"] - tools - delta["db"] - render
+        return {
+            "wall_ms": round(delta["wall"] * 1000, 3),
+            "llm_ms": round(delta["llm"] * 1000, 3),
+            "llm_calls": after["llm"][1] - before["llm"][1],
+            "llm_prompt_chars": int(delta["prompt"]),
+            "tool_ms": round(tools * 1000, 3),
+            "search_calls": after["search"][1] - before["search"][1],
+            "scrape_calls": after["scrape"][1] - before["scrape"][1],
+            "batch_scrape_calls": after["batch_scrape"][1] - before["batch_scrape"][1],
+            "db_ms": round(delta["db"] * 1000, 3),
+            "render_ms": round(render * 1000, 3),
+            "orchestration_ms": round(overhead * 1000, 3),
+        }
+
+
+def run_once(topic: str, workdir: str, args) -> Dict:
+    with PageServer(delay=args.page_delay) as server:
+        if args.fixtures:
+            fixtures = load_fixtures(args.fixtures, server.base_url)
+        else:
+            fixtures = build_fixtures(topic, server.base_url)
+        server.pages = fixtures["pages"]
+
+        llm = ScriptedLLM(topic=topic, fixtures=fixtures, latency=args.llm_latency, scale=args.scale)
+        search = FixtureSearchTool(results=fixtures["search"])
+        scrape = TimedPageScrapeTool() if args.full_pages else TimedScrapeTool()
+        batch_scrape = TimedBatchScrapeTool()
+        db = TimedStorage(StorageManager(db_file=os.path.join(workdir, "journalist_studio.db"), chainlit_db_file=os.path.join(workdir, "chainlit.db")))
+        crew = JournalistCrew(db=db, llm=llm, search_tool=search, scrape_tool=scrape, batch_scrape_tool=batch_scrape, rate_limiter=RateLimiter(0))
+        clock = StageClock(llm, search, scrape, batch_scrape, db)
+
+        stages = {}
+
+        before = clock.snapshot()
+        dossier = crew.run_research(topic, profile=args.profile)
+        start = time.perf_counter()
+        format_dossier_to_markdown(dossier)
+        render = time.perf_counter() - start
+        stages["research"] = StageClock.diff(before, clock.snapshot(), render)
+
+        before = clock.snapshot()
+        article = crew.run_writer("LANGUAGE: Albanian. TONE: Serious. FOCUS: Corruption.", "Albanian", profile=args.profile)
+        start = time.perf_counter()
+        format_article(article)
+        render = time.perf_counter() - start
+        stages["write"] = StageClock.diff(before, clock.snapshot(), render)
+
+        stages["db_ops_ms"] = {k: round(v * 1000, 3) for k, v in db.timings.items()}
+        stages["pages_served"] = server.requests
+        return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run research + writing fully offline and profile the non-LLM path.")
+    parser.add_argument("--topic", default="Corridor 8 railway to Bulgaria")
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PROFILES))
+    parser.add_argument("--scale", default="small", choices=["small", "medium", "large"], help="Size of the dossier the scripted LLM compiles.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds of simulated model time per LLM call.")
+    parser.add_argument("--page-delay", type=float, default=0.0, help="Seconds the page server waits before answering.")
+    parser.add_argument("--full-pages", action="store_true", help="Scrape whole pages instead of ranked passages, for comparison.")
+    parser.add_argument("--fixtures", help="Recorded fixtures JSON ({\"search\": {...}, \"pages\": {...}}).")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    runs = []
+    # Agents log verbosely; keep stdout for the report.
+    with contextlib.redirect_stdout(sys.stderr):
+        for _ in range(args.iterations):
+            with tempfile.TemporaryDirectory() as workdir:
+                runs.append(run_once(args.topic, workdir, args))
+
+    report = {"topic": args.topic, "profile": args.profile, "scale": args.scale, "scrape": "full_pages" if args.full_pages else "passages", "iterations": args.iterations, "runs": runs}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
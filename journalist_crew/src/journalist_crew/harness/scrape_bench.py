@@ -0,0 +1,65 @@
+"""Serial vs batched page fetching against the local page server.
+
+Serves `--pages` fixture pages with `--page-delay` seconds of server time
+each, then reads them one at a time (one agent turn per page, as with the
+single-page tool) and in one batch through the shared Fetcher. A batch
+should take about as long as its slowest page.
+
+    bench_scrape --pages 10 --page-delay 0.5
+"""
+import argparse
+import json
+import sys
+import time
+
+from journalist_crew.fetcher import Fetcher
+from journalist_crew.harness.fakes import PageServer, build_fixtures
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    results = fn()
+    return round(time.perf_counter() - start, 3), results
+
+
+def run(args) -> dict:
+    with PageServer(delay=args.page_delay) as server:
+        fixtures = build_fixtures("Corridor 8 railway to Bulgaria", server.base_url, pages=args.pages)
+        server.pages = fixtures["pages"]
+        # The page server is a single host, so the per-domain cap is what limits
+        # concurrency here; real search results span many domains.
+        urls = [item["link"] for item in fixtures["search"]["*"]]
+        fetcher = Fetcher(max_workers=args.workers, per_domain=args.per_domain, max_bytes=args.max_bytes)
+
+        serial_s, serial = _timed(lambda: [fetcher.fetch(url) for url in urls])
+        batch_s, batch = _timed(lambda: fetcher.fetch_many(urls))
+
+    return {
+        "pages": len(urls),
+        "page_delay_s": args.page_delay,
+        "workers": args.workers,
+        "per_domain": args.per_domain,
+        "serial_s": serial_s,
+        "batch_s": batch_s,
+        "speedup": round(serial_s / batch_s, 2) if batch_s else None,
+        "slowest_page_s": round(max(r.seconds for r in batch), 3) if batch else 0.0,
+        "errors": sum(1 for r in serial + batch if not r.ok),
+        "bytes": sum(r.bytes for r in batch),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare serial and batched page fetching offline.")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--page-delay", type=float, default=0.5, help="Seconds the page server waits before answering.")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--per-domain", type=int, default=10, help="Concurrent requests allowed to the one local host.")
+    parser.add_argument("--max-bytes", type=int, default=2_000_000)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import random
+from typing import List
+
+from journalist_crew.models import KeyFigure, ResearchDossier, SourceReference, TimelineEvent
+
+# Dossier sizes roughly matching what the research crew produces for
+# a short story, a typical investigation and a long-running saga.
+SCALES = {
+    "small": {"summary": 4, "paragraphs": 6, "figures": 5, "events": 10, "sources": 8},
+    "medium": {"summary": 8, "paragraphs": 30, "figures": 20, "events": 60, "sources": 40},
+    "large": {"summary": 15, "paragraphs": 150, "figures": 80, "events": 300, "sources": 200},
+}
+
+DOMAINS = [
+    "balkaninsight.com", "meta.mk", "sdk.mk", "reuters.com",
+    "vlada.mk", "sobranie.mk", "telegrafi.com", "portalb.mk",
+]
+
+PEOPLE = [
+    "Nikola Gruevski", "Zoran Zaev", "Ali Ahmeti", "Hristijan Mickoski",
+    "Dimitar Kovachevski", "Branko Crvenkovski", "Ljubcho Georgievski",
+]
+
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+DATE_FORMATS = [
+    "{year}", "{name} {year}", "{year}-{month:02d}", "{day} {name} {year}", "early {year}",
+    "{year}", "{name} {year}", "{decade}s", "{year}–{later}", "{year}–present",
+]
+
+WORDS = (
+    "tender contract ministry corridor highway loan budget audit parliament "
+    "government minister director company construction investigation "
+    "prosecutor report protest agreement opposition coalition euro million"
+).split()
+
+
+def _sentence(rng: random.Random, length: int = 18) -> str:
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def make_dossier(scale: str = "small", seed: int = 0, topic: str = None) -> ResearchDossier:
+    """Builds a deterministic synthetic dossier of the given scale."""
+    spec = SCALES[scale]
+    rng = random.Random(f"{scale}-{seed}")
+
+    sources = []
+    for i in range(spec["sources"]):
+        domain = DOMAINS[i % len(DOMAINS)]
+        sources.append(SourceReference(
+            title=f"{_sentence(rng, 6)[:-1]} ({domain})",
+            url=f"https://{domain}/news/{seed}/{i}-{rng.randint(1000, 9999)}",
+            credibility_score=rng.randint(3, 10),
+        ))
+
+    paragraphs = []
+    for _ in range(spec["paragraphs"]):
+        src = rng.choice(sources)
+        cited = f"{_sentence(rng)} ([{src.title}]({src.url}))"
+        paragraphs.append(" ".join([_sentence(rng), cited, _sentence(rng)]))
+
+    timeline = []
+    for i in range(spec["events"]):
+        year, month = 1991 + (i * 31) % 34, 1 + i % 12
+        # Date text in the mixed forms the agents write ("2008", "May 2008", "2008-05", ...)
+        label = DATE_FORMATS[i % len(DATE_FORMATS)].format(
+            year=year, month=month, name=MONTH_NAMES[month - 1], day=1 + i % 28, decade=year // 10 * 10, later=year + 3,
+        )
+        timeline.append(TimelineEvent(year=label, event=_sentence(rng, 12)))
+
+    figures = []
+    for i in range(spec["figures"]):
+        name = PEOPLE[i % len(PEOPLE)] if i < len(PEOPLE) else f"{rng.choice(PEOPLE)} {i}"
+        figures.append(KeyFigure(name=name, role=_sentence(rng, 5), impact=_sentence(rng, 14)))
+
+    return ResearchDossier(
+        topic=topic or f"Synthetic story {scale} #{seed}",
+        executive_summary=[_sentence(rng, 20) for _ in range(spec["summary"])],
+        comprehensive_narrative="\n\n".join(paragraphs),
+        key_figures=figures,
+        timeline=timeline,
+        sources=sources,
+    )
+
+
+def make_update(dossier: ResearchDossier, seed: int = 1) -> ResearchDossier:
+    """Builds a 'dig deeper' result that overlaps the given dossier by half."""
+    fresh = make_dossier("small", seed=seed + 1000, topic=dossier.topic)
+    half = lambda items: items[: max(1, len(items) // 2)]
+    fresh.timeline = half(dossier.timeline) + fresh.timeline
+    fresh.key_figures = [f.model_copy() for f in half(dossier.key_figures)] + fresh.key_figures
+    fresh.sources = half(dossier.sources) + fresh.sources
+    return fresh
+
+
+def make_articles(rng: random.Random, count: int, words: int = 1500) -> List[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(count)]
@@ -0,0 +1,100 @@
+"""Tracing overhead on the offline pipeline.
+
+Runs research + writing (harness/pipeline.py) untraced, then again with
+tracing to a local span file, and compares median wall time. Exits non-zero
+when the overhead is above `--budget` percent, so it can gate a change to
+tracing settings or instrumentation:
+
+    bench_tracing --iterations 5 --budget 5
+    bench_tracing --sample-rate 0.1 --llm-latency 0.2
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+from journalist_crew import tracing
+from journalist_crew.crew import DEFAULT_PROFILE, PROFILES
+from journalist_crew.harness.pipeline import run_once
+
+
+def _wall_ms(stages: dict) -> float:
+    return stages["research"]["wall_ms"] + stages["write"]["wall_ms"]
+
+
+def _runs(args, iterations: int):
+    walls = []
+    for _ in range(iterations):
+        with tempfile.TemporaryDirectory() as workdir:
+            walls.append(_wall_ms(run_once(args.topic, workdir, args)))
+    return walls
+
+
+def run(args) -> dict:
+    with contextlib.redirect_stdout(sys.stderr):
+        # First run warms imports, CrewAI and the page server's fixtures
+        _runs(args, 1)
+        untraced = _runs(args, args.iterations)
+
+        # The pipeline disables the OpenTelemetry SDK for CI; turn it back on
+        os.environ.pop("OTEL_SDK_DISABLED", None)
+        spans_file = os.path.join(tempfile.mkdtemp(), "spans.jsonl")
+        tracing.configure_tracing(tracing.TracingConfig(
+            exporters=["file"],
+            file=spans_file,
+            sample_rate=args.sample_rate,
+            export_delay_ms=args.export_delay_ms,
+        ))
+        traced = _runs(args, args.iterations)
+        tracing.flush()
+
+    base, with_tracing = statistics.median(untraced), statistics.median(traced)
+    overhead = (with_tracing - base) / base * 100 if base else 0.0
+    return {
+        "iterations": args.iterations,
+        "sample_rate": args.sample_rate,
+        "untraced_ms": [round(w, 1) for w in untraced],
+        "traced_ms": [round(w, 1) for w in traced],
+        "median_untraced_ms": round(base, 1),
+        "median_traced_ms": round(with_tracing, 1),
+        "overhead_pct": round(overhead, 2),
+        "budget_pct": args.budget,
+        "spans_file": spans_file,
+        "spans_file_bytes": os.path.getsize(spans_file) if os.path.exists(spans_file) else 0,
+        "tracing": tracing.stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure tracing overhead on the offline pipeline.")
+    parser.add_argument("--topic", default="Corridor 8 railway to Bulgaria")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PROFILES))
+    parser.add_argument("--scale", default="small", choices=["small", "medium", "large"])
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds of simulated model time per LLM call.")
+    parser.add_argument("--sample-rate", type=float, default=1.0, help="Head sampling rate for the traced runs.")
+    parser.add_argument("--export-delay-ms", type=int, default=5000)
+    parser.add_argument("--budget", type=float, default=5.0, help="Allowed overhead in percent of median wall time.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args(argv)
+    # run_once options this bench keeps at the pipeline defaults
+    args.page_delay, args.full_pages, args.fixtures = 0.0, False, None
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    over = report["overhead_pct"] > args.budget
+    print(f"{'OVER BUDGET' if over else 'ok'}: tracing overhead {report['overhead_pct']}% (budget {args.budget}%)", file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
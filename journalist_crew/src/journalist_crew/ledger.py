@@ -0,0 +1,142 @@
+"""Run-scoped record of the searches, page reads and citations made by a crew.
+
+All research agents share one ledger, so a query another agent already ran
+(or a close rewording of it) and a URL already read are answered from the
+ledger instead of going back to Serper or the web.
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from journalist_crew.extraction import tokenize
+
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid", "amp", "output"}
+STOPWORDS = {"the", "of", "and", "in", "on", "for", "to", "a", "an", "by", "about", "with", "from", "at", "is", "was", "news", "north", "macedonia"}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalises a URL so trivially different links to the same page compare equal."""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    if scheme == "http":
+        scheme = "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("m.") or host.startswith("amp."):
+        host = host.split(".", 1)[1]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    for suffix in ("/amp", "/amp/"):
+        if path.endswith(suffix):
+            path = path[: -len(suffix)] or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def query_terms(query: str) -> frozenset:
+    return frozenset(t for t in tokenize(query) if t not in STOPWORDS)
+
+
+def _url_key(url: str, focus: Optional[str]) -> Tuple[str, str]:
+    return canonicalize_url(url), " ".join((focus or "").casefold().split())
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Entry:
+    __slots__ = ("key", "result", "hits")
+
+    def __init__(self, key, result):
+        self.key = key
+        self.result = result
+        self.hits = 0
+
+
+class RunLedger:
+    """Queries issued, URLs read and facts cited during one research run."""
+
+    def __init__(self, similarity: float = 0.75):
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._queries: List[Tuple[frozenset, _Entry]] = []
+            self._urls: Dict[Tuple[str, str], _Entry] = {}
+            self._facts: Dict[Tuple[str, str], _Entry] = {}
+            self.calls = {"search": 0, "scrape": 0, "cite": 0}
+            self.deduplicated = {"search": 0, "scrape": 0, "cite": 0}
+
+    def find_query(self, query: str) -> Optional[_Entry]:
+        terms = query_terms(query)
+        with self._lock:
+            self.calls["search"] += 1
+            best, best_score = None, 0.0
+            for seen, entry in self._queries:
+                score = jaccard(terms, seen)
+                if score > best_score:
+                    best, best_score = entry, score
+            if best is not None and best_score >= self.similarity:
+                best.hits += 1
+                self.deduplicated["search"] += 1
+                return best
+        return None
+
+    def record_query(self, query: str, result):
+        with self._lock:
+            self._queries.append((query_terms(query), _Entry(query, result)))
+
+    def find_url(self, url: str, focus: Optional[str] = None) -> Optional[_Entry]:
+        """A read of url with the same focus; passages depend on the focus, so a new one is a new read."""
+        with self._lock:
+            self.calls["scrape"] += 1
+            entry = self._urls.get(_url_key(url, focus))
+            if entry is not None:
+                entry.hits += 1
+                self.deduplicated["scrape"] += 1
+            return entry
+
+    def record_url(self, url: str, result, focus: Optional[str] = None):
+        with self._lock:
+            self._urls[_url_key(url, focus)] = _Entry(url, result)
+
+    def find_fact(self, statement: str, url: str) -> Optional[_Entry]:
+        key = (" ".join(statement.casefold().split()), canonicalize_url(url))
+        with self._lock:
+            self.calls["cite"] += 1
+            entry = self._facts.get(key)
+            if entry is not None:
+                entry.hits += 1
+                self.deduplicated["cite"] += 1
+            return entry
+
+    def record_fact(self, statement: str, url: str, result):
+        key = (" ".join(statement.casefold().split()), canonicalize_url(url))
+        with self._lock:
+            self._facts[key] = _Entry(statement, result)
+
+    def facts(self) -> List[str]:
+        with self._lock:
+            return [entry.result for entry in self._facts.values()]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queries": len(self._queries),
+                "urls": len(self._urls),
+                "facts": len(self._facts),
+                "calls": dict(self.calls),
+                "deduplicated": dict(self.deduplicated),
+            }
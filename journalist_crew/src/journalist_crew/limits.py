@@ -0,0 +1,56 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class RateLimiter:
+    """Sliding one-minute window shared by every crew in the process.
+
+    CrewAI's `max_rpm` is enforced per Crew, so parallel crews would each
+    spend the full budget against the same API key. `max_per_minute` of 0
+    disables limiting (used by the offline harness).
+    """
+
+    def __init__(self, max_per_minute: int):
+        self.max_per_minute = max_per_minute
+        self._calls = deque()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+        self.acquired = 0
+
+    def acquire(self, timeout: Optional[float] = None, cancel=None) -> bool:
+        """Takes a slot, waiting for one if needed; False on timeout or when the `cancel` RunMonitor is cancelled."""
+        if not self.max_per_minute:
+            with self._lock:
+                self.acquired += 1
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= 60:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_per_minute:
+                    self._calls.append(now)
+                    self.acquired += 1
+                    return True
+                wait = 60 - (now - self._calls[0])
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            if cancel is not None:
+                if cancel.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+            with self._lock:
+                self.waited += wait
+
+
+GLOBAL_RATE_LIMITER = RateLimiter(int(os.getenv("LLM_MAX_RPM", "30")))
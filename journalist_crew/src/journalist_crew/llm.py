@@ -0,0 +1,350 @@
+import copy
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Optional
+
+import yaml
+from crewai import LLM, BaseLLM
+from crewai.types.usage_metrics import UsageMetrics
+
+from journalist_crew.limits import RateLimiter
+from journalist_crew.metrics import LLM_SECONDS
+from journalist_crew.progress import RunMonitor, current_run
+
+
+class RateLimitedLLM(BaseLLM):
+    """Wraps an LLM so every call first takes a slot from a shared RateLimiter.
+
+    A cancelled run (see progress.RunMonitor) stops here, before its next
+    call or while waiting for a slot, so it never takes budget it won't use.
+    """
+
+    def __init__(self, inner, limiter: RateLimiter):
+        # Set before BaseLLM.__init__, which assigns `stop` through the property below
+        self._inner = inner
+        self.limiter = limiter
+        super().__init__(model=inner.model, temperature=getattr(inner, "temperature", None))
+
+    @property
+    def stop(self):
+        return self._inner.stop
+
+    @stop.setter
+    def stop(self, value):
+        # Agents push their stop words onto the LLM they were given
+        if value:
+            self._inner.stop = value
+
+    def call(self, messages, *args, **kwargs):
+        run = current_run()
+        if run is not None:
+            run.check()
+            if not self.limiter.acquire(cancel=run):
+                run.check()
+        else:
+            self.limiter.acquire()
+        return self._inner.call(messages, *args, **kwargs)
+
+    def supports_function_calling(self) -> bool:
+        return self._inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self._inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self._inner.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        return self._inner.get_token_usage_summary()
+
+
+# --- MODEL ROUTING ---
+
+ROUTING_FILE = Path(__file__).parent / "config" / "routing.yaml"
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=int(os.getenv("LLM_ROUTER_WORKERS", "32")), thread_name_prefix="llm-route")
+# How often a waiting call checks whether its run was cancelled
+CANCEL_POLL_SECONDS = 1.0
+# How often a call checks whether its primary request has left the pool's queue
+QUEUE_POLL_SECONDS = 0.05
+
+
+def load_routing() -> dict:
+    with open(ROUTING_FILE, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one model."""
+
+    def __init__(self, window: int):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool = True):
+        with self._lock:
+            self.calls += 1
+            if ok:
+                self._samples.append(seconds)
+            else:
+                self.errors += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+    def __len__(self):
+        return len(self._samples)
+
+
+class ModelRouter:
+    """Picks primary/fallback models and max_tokens per task and hedges slow calls.
+
+    Hedge thresholds come from latencies tracked per (task, model) across
+    every crew in the process, so a compile call with a 16k token cap is not
+    judged against the p95 of short planning calls. Per-model trackers feed
+    stats() and /metrics. `decisions` keeps the most recent routing outcomes.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        hedging = config.get("hedging", {})
+        self.initial_hedge_after = hedging.get("initial_hedge_after_seconds", 60)
+        self.min_hedge_after = hedging.get("min_hedge_after_seconds", 5)
+        self.min_samples = hedging.get("min_samples", 20)
+        self.window = hedging.get("window", 200)
+        self.trackers = {name: LatencyTracker(self.window) for name in config["models"]}
+        self.route_trackers = {}
+        self._lock = threading.Lock()
+        self.decisions = deque(maxlen=500)
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def route_for(self, task_name: Optional[str]) -> dict:
+        route = dict(self.config["default"])
+        route.update(self.config.get("tasks", {}).get(task_name or "", {}))
+        return route
+
+    def route_tracker(self, task_name: Optional[str], model_key: str) -> LatencyTracker:
+        key = (task_name or "default", model_key)
+        with self._lock:
+            if key not in self.route_trackers:
+                self.route_trackers[key] = LatencyTracker(self.window)
+            return self.route_trackers[key]
+
+    def hedge_after(self, task_name: Optional[str], model_key: str) -> float:
+        tracker = self.route_tracker(task_name, model_key)
+        if len(tracker) < self.min_samples:
+            return self.initial_hedge_after
+        return max(self.min_hedge_after, tracker.percentile(0.95))
+
+    def _record(self, task_name: Optional[str], model_key: str, seconds: float, outcome: str):
+        ok = outcome != "error"
+        self.trackers[model_key].record(seconds, ok=ok)
+        self.route_tracker(task_name, model_key).record(seconds, ok=ok)
+        LLM_SECONDS.labels(model=model_key, outcome=outcome).observe(seconds)
+
+    def build_client(self, model_key: str, temperature: Optional[float], max_tokens: int, stop) -> LLM:
+        spec = self.config["models"][model_key]
+        return LLM(
+            model=spec["model"],
+            base_url=spec.get("base_url"),
+            api_key=os.getenv(spec.get("api_key_env", "OPENROUTER_API_KEY")),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=spec.get("timeout", 240),
+            max_retries=spec.get("max_retries", 1),
+            stop=stop,
+        )
+
+    def _timed_call(self, task_name: Optional[str], model_key: str, client, messages, kwargs, settled: threading.Event, began: dict):
+        # Once the routed call is settled this request was abandoned and
+        # already recorded (see _abandon); its late result is not counted again
+        start = began[model_key] = time.monotonic()
+        try:
+            result = client.call(messages, **kwargs)
+        except Exception:
+            if not settled.is_set():
+                self._record(task_name, model_key, time.monotonic() - start, "error")
+            raise
+        if not settled.is_set():
+            self._record(task_name, model_key, time.monotonic() - start, "ok")
+        return result
+
+    def _abandon(self, task_name: Optional[str], pending, labels: dict, began: dict, settled: threading.Event) -> int:
+        """Settles a routed call: drops queued requests and stops counting running ones.
+
+        A request already in flight cannot be interrupted. Its latency so far
+        is recorded as a lower bound, so a model that keeps losing hedges
+        still shows up as slow in its p95.
+        """
+        settled.set()
+        abandoned = 0
+        for future in pending:
+            if future.cancel():
+                continue
+            abandoned += 1
+            now = time.monotonic()
+            self._record(task_name, labels[future], now - began.get(labels[future], now), "abandoned")
+        return abandoned
+
+    def call(self, task_name: Optional[str], get_client, messages, kwargs, cap: Optional[int] = None, limiter: Optional[RateLimiter] = None, cancel: Optional[RunMonitor] = None):
+        """Runs one call on the task's primary model, hedging to its fallback.
+
+        A `cancel` monitor is polled while waiting: once it fires the caller
+        gets RunCancelled and the abandoned request's result is dropped.
+        """
+        route = self.route_for(task_name)
+        max_tokens = min(route["max_tokens"], cap) if cap else route["max_tokens"]
+        primary_key, fallback_key = route["primary"], route.get("fallback")
+        hedge_after = self.hedge_after(task_name, primary_key)
+
+        start = time.monotonic()
+        settled = threading.Event()
+        # When each request actually started; time queued for a pool worker
+        # doesn't count toward the model's latency or the hedge threshold
+        began = {}
+        first = _HEDGE_POOL.submit(self._timed_call, task_name, primary_key, get_client(primary_key, max_tokens), messages, kwargs, settled, began)
+        labels = {first: primary_key}
+        pending = set(labels)
+        hedged = False
+        errors = []
+
+        while True:
+            if hedged or not fallback_key:
+                timeout = None
+            elif primary_key not in began:
+                timeout = QUEUE_POLL_SECONDS
+            else:
+                timeout = max(0.0, began[primary_key] + hedge_after - time.monotonic())
+            if cancel is not None:
+                timeout = CANCEL_POLL_SECONDS if timeout is None else min(timeout, CANCEL_POLL_SECONDS)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if cancel is not None and cancel.cancelled and not done:
+                abandoned = self._abandon(task_name, pending, labels, began, settled)
+                self.decisions.append({
+                    "task": task_name, "primary": primary_key, "fallback": fallback_key,
+                    "max_tokens": max_tokens, "hedged": hedged, "winner": None, "errors": len(errors),
+                    "abandoned": abandoned, "cancelled": True, "latency_s": round(time.monotonic() - start, 2),
+                })
+                cancel.check()
+            for future in done:
+                if future.exception() is None:
+                    winner = labels[future]
+                    if hedged and winner == fallback_key:
+                        self.hedge_wins += 1
+                    abandoned = self._abandon(task_name, pending, labels, began, settled)
+                    self.decisions.append({
+                        "task": task_name, "primary": primary_key, "fallback": fallback_key,
+                        "max_tokens": max_tokens, "hedge_after_s": round(hedge_after, 1),
+                        "hedged": hedged, "winner": winner, "errors": len(errors), "abandoned": abandoned,
+                        "latency_s": round(time.monotonic() - start, 2),
+                    })
+                    return future.result()
+                errors.append(future.exception())
+
+            # Primary failed, or is slower than its p95: ask the fallback too
+            running_for = time.monotonic() - began[primary_key] if primary_key in began else 0.0
+            if not hedged and fallback_key and (errors or (not done and running_for >= hedge_after)):
+                hedged = True
+                # A pure latency hedge only goes out if the rate limit has room
+                if errors or limiter is None or limiter.acquire(timeout=0):
+                    self.hedges += 1
+                    future = _HEDGE_POOL.submit(self._timed_call, task_name, fallback_key, get_client(fallback_key, max_tokens), messages, kwargs, settled, began)
+                    labels[future] = fallback_key
+                    pending.add(future)
+
+            if not pending:
+                settled.set()
+                self.decisions.append({
+                    "task": task_name, "primary": primary_key, "fallback": fallback_key,
+                    "max_tokens": max_tokens, "hedged": hedged, "winner": None, "errors": len(errors),
+                    "latency_s": round(time.monotonic() - start, 2),
+                })
+                raise errors[-1]
+
+    def stats(self) -> dict:
+        models = {}
+        for name, tracker in self.trackers.items():
+            p50, p95 = tracker.percentile(0.5), tracker.percentile(0.95)
+            models[name] = {
+                "calls": tracker.calls,
+                "errors": tracker.errors,
+                "p50_s": round(p50, 2) if p50 is not None else None,
+                "p95_s": round(p95, 2) if p95 is not None else None,
+            }
+        with self._lock:
+            keys = sorted(self.route_trackers)
+        routes = {}
+        for task, model in keys:
+            p95 = self.route_tracker(task, model).percentile(0.95)
+            routes[f"{task}/{model}"] = {
+                "p95_s": round(p95, 2) if p95 is not None else None,
+                "hedge_after_s": round(self.hedge_after(task, model), 1),
+            }
+        return {"models": models, "routes": routes, "hedges": self.hedges, "hedge_wins": self.hedge_wins, "recent": list(self.decisions)[-20:]}
+
+
+MODEL_ROUTER = ModelRouter(load_routing())
+
+
+class RoutedLLM(BaseLLM):
+    """One agent-facing LLM whose calls are routed per task by a ModelRouter.
+
+    `max_tokens` acts as a ceiling (set by the pipeline profile) on top of
+    the per-task value in routing.yaml. `limiter` is charged for latency
+    hedges; the call itself is already paid for by RateLimitedLLM.
+    A stopped run's calling thread is released without waiting for the reply.
+    """
+
+    def __init__(self, router: ModelRouter, temperature: float, max_tokens: Optional[int] = None, limiter: Optional[RateLimiter] = None):
+        super().__init__(model="routed", temperature=temperature)
+        self.router = router
+        self.max_tokens = max_tokens
+        self.limiter = limiter
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _client(self, model_key: str, max_tokens: int):
+        key = (model_key, max_tokens, tuple(self.stop or ()))
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = self.router.build_client(model_key, self.temperature, max_tokens, list(self.stop or []) or None)
+            return self._clients[key]
+
+    def capped(self, max_tokens: Optional[int]) -> "RoutedLLM":
+        """A view of this LLM with another max_tokens ceiling, sharing its clients and usage."""
+        view = copy.copy(self)
+        view.max_tokens = max_tokens
+        return view
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None, **kwargs):
+        kwargs.update(tools=tools, callbacks=callbacks, available_functions=available_functions, from_task=from_task, from_agent=from_agent)
+        task_name = getattr(from_task, "name", None)
+        return self.router.call(task_name, self._client, messages, kwargs, cap=self.max_tokens, limiter=self.limiter, cancel=current_run())
+
+    def supports_function_calling(self) -> bool:
+        # Agents ask before any task is known, so answer for the default route's primary model
+        route = self.router.route_for(None)
+        max_tokens = min(route["max_tokens"], self.max_tokens) if self.max_tokens else route["max_tokens"]
+        return self._client(route["primary"], max_tokens).supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return min(client.get_context_window_size() for client in self._clients.values()) if self._clients else 32768
+
+    def get_token_usage_summary(self):
+        total = UsageMetrics()
+        for client in list(self._clients.values()):
+            total.add_usage_metrics(client.get_token_usage_summary())
+        return total
@@ -1,6 +1,9 @@
+import argparse
+import sys
+
 from langdetect import detect
 
-from journalist_crew.crew import JournalistCrew
+from journalist_crew.crew import DEFAULT_PROFILE, PROFILES, JournalistCrew, describe_profile
 
 
 def detect_lang(text):
@@ -11,25 +14,52 @@ def detect_lang(text):
     except:
         return "English"
 
+PAGE_SIZE = 10
+
+def print_sessions(sessions, start=0):
+    for i, s in enumerate(sessions, start=start):
+        print(f"{i+1}. {s['topic']} (Created: {s['created_at']})")
+
+def print_history(history, start=0):
+    for idx, art in enumerate(history, start=start):
+        preview = (art['preview'] or '').replace('\n', ' ')[:100]
+        print(f"\n--- {idx+1}. {art['created_at']} [{art['language']}] ({art['length'] or 0} chars) ---")
+        print(f"Prompt: {art['instructions']}")
+        print(f"Preview: {preview}...")
+
 def main():
+    parser = argparse.ArgumentParser(description="AI Journalist Studio (CLI)")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PROFILES), help="Pipeline profile for research and writing.")
+    args, _ = parser.parse_known_args()
+    profile = args.profile
+
     crew_instance = JournalistCrew()
     
     print("=================================================")
     print("AI JOURNALIST STUDIO - SESSION MANAGEMENT")
     print("=================================================")
+    print(f"Profile: {describe_profile(profile)}")
 
-    # 1. List Sessions from the internal DB
-    sessions = crew_instance.db.list_dossiers()
+    # 1. List Sessions from the internal DB, a page at a time
+    page = crew_instance.db.list_dossiers_page(limit=PAGE_SIZE)
+    sessions = page["items"]
     
     if sessions:
         print("\n📚 Previous Sessions:")
-        for i, s in enumerate(sessions):
-            print(f"{i+1}. {s['topic']} (Created: {s['created_at']})")
-        print("\nType number to load, or type NEW topic name.")
+        print_sessions(sessions)
+        print("\nType number to load, 'more' for older sessions, or type NEW topic name.")
     else:
         print("\nNo history found.")
 
     user_input = input("\nSelection > ").strip()
+    while user_input.lower() == "more":
+        if page["next_cursor"]:
+            page = crew_instance.db.list_dossiers_page(limit=PAGE_SIZE, cursor=page["next_cursor"])
+            print_sessions(page["items"], start=len(sessions))
+            sessions += page["items"]
+        else:
+            print("No older sessions.")
+        user_input = input("\nSelection > ").strip()
 
     if user_input.isdigit() and int(user_input) <= len(sessions):
         # Load Existing by UUID
@@ -37,7 +67,7 @@ def main():
         crew_instance.load_context(selected['id'])
     else:
         topic_name = user_input
-        crew_instance.run_research(topic_name)
+        crew_instance.run_research(topic_name, profile=profile)
 
     while True:
         if not crew_instance.current_dossier:
@@ -50,38 +80,78 @@ def main():
         print("1. ✍️  Write Draft")
         print("2. 📜 History")
         print("3. 🕵️  Dig Deeper (Update Info)")
-        print("4. ❌ Exit")
+        print("4. 🔁 Regenerate Draft (ignore stored articles)")
+        print("5. ❌ Exit")
         
         choice = input("Option: ")
 
-        if choice == '1':
+        if choice in ('1', '4'):
             prompt = input("\nInstructions: ")
             lang = detect_lang(prompt)
             # Calls the method in crew.py that uses the Smart LLM
-            content = crew_instance.run_writer(prompt, lang)
+            content = crew_instance.run_writer(prompt, lang, regenerate=(choice == '4'), profile=profile)
             print("\n" + "-"*30)
             print(content)
             print("-" * 30 + "\n✅ Saved to DB")
 
         elif choice == '2':
-            # Retrieve history using UUID
-            history = crew_instance.db.get_article_history(crew_instance.current_dossier.id)
+            # Retrieve history using UUID (summaries only; full text on request)
+            dossier_id = crew_instance.current_dossier.id
+            history = crew_instance.db.get_article_history(dossier_id, limit=PAGE_SIZE)
             if not history:
                 print("No drafts yet.")
-            else:
-                for idx, art in enumerate(history):
-                    print(f"\n--- {idx+1}. {art['created_at']} [{art['language']}] ---")
-                    print(f"Prompt: {art['instructions']}")
-                    print(f"Preview: {art['content'][:100]}...")
+                continue
+            print_history(history)
+            while True:
+                pick = input("\nNumber to read in full, 'more' for older drafts, Enter to go back > ").strip()
+                if pick.lower() == "more":
+                    older = crew_instance.db.get_article_history(dossier_id, limit=PAGE_SIZE, before_id=history[-1]['id'])
+                    if not older:
+                        print("No older drafts.")
+                    print_history(older, start=len(history))
+                    history += older
+                elif pick.isdigit() and 1 <= int(pick) <= len(history):
+                    article = crew_instance.db.get_article(history[int(pick) - 1]['id'])
+                    print("\n" + "-"*30)
+                    print(article['content'])
+                    print("-" * 30)
+                else:
+                    break
 
         elif choice == '3':
             focus = input("\nWhat should we focus on? ")
             print("\n🚀 Updating Research Dossier...")
-            crew_instance.run_research(crew_instance.current_dossier.topic, instructions=focus)
+            crew_instance.run_research(crew_instance.current_dossier.topic, instructions=focus, profile=profile)
             print("✅ Dossier Updated.")
 
-        elif choice == '4':
+        elif choice == '5':
             break
 
+def run():
+    main()
+
+def replay():
+    """Resumes a failed or interrupted research run: `replay [run_id]` (default: the latest unfinished one)."""
+    crew_instance = JournalistCrew()
+    run_id = sys.argv[1] if len(sys.argv) > 1 else None
+    if not run_id:
+        runs = crew_instance.db.list_runs(unfinished=True, limit=10)
+        if not runs:
+            print("No unfinished research runs.")
+            return
+        print("\n⏸️  Unfinished runs:")
+        for i, r in enumerate(runs):
+            print(f"{i+1}. {r['topic']} [{r['status']}] {r['modified_at']} ({r['id']})")
+        choice = input("\nRun to resume [1] > ").strip() or "1"
+        run_id = runs[int(choice) - 1]['id']
+
+    dossier = crew_instance.resume_research(run_id)
+    print(f"✅ Dossier saved. ID: {dossier.id}")
+
+def test():
+    """Runs research and writing offline against local stand-ins and prints timings."""
+    from journalist_crew.harness.pipeline import main as run_pipeline
+    sys.exit(run_pipeline(sys.argv[1:]))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+from journalist_crew.citations import remap_text, source_index
+from journalist_crew.dates import timeline_sort_key
+from journalist_crew.ledger import canonicalize_url
+from journalist_crew.models import ResearchDossier
+
+
+def merge_dossiers(old: ResearchDossier, new: ResearchDossier) -> ResearchDossier:
+    print("Merging new findings into existing dossier...")
+    
+    new.id = old.id 
+
+    # Renumber the new findings' citations against the merged source list
+    merged_index = source_index(old.sources)
+    mapping = {}
+    for n, src in enumerate(new.sources, start=1):
+        key = canonicalize_url(src.url)
+        if key not in merged_index:
+            old.sources.append(src)
+            merged_index[key] = len(old.sources)
+        mapping[n] = merged_index[key]
+    new.comprehensive_narrative = remap_text(new.comprehensive_narrative, mapping)
+    new.executive_summary = [remap_text(point, mapping) for point in new.executive_summary]
+    for event in new.timeline:
+        event.event = remap_text(event.event, mapping)
+    for fig in new.key_figures:
+        fig.impact = remap_text(fig.impact, mapping)
+    
+    new.comprehensive_narrative = (
+        f"{old.comprehensive_narrative}\n\n"
+        f"--- UPDATE: NEW FINDINGS ---\n"
+        f"{new.comprehensive_narrative}"
+    )
+
+    existing_events = {(e.year, e.event) for e in old.timeline}
+    for event in new.timeline:
+        if (event.year, event.event) not in existing_events:
+            old.timeline.append(event)
+    # Chronological, not lexical: "May 2008", "2008-05" and "1990s" all parse to dates
+    old.timeline.sort(key=timeline_sort_key)
+    new.timeline = old.timeline
+
+    existing_figures = {f.name.lower(): f for f in old.key_figures}
+    for fig in new.key_figures:
+        if fig.name.lower() in existing_figures:
+            existing_figures[fig.name.lower()].impact += f"; {fig.impact}"
+        else:
+            old.key_figures.append(fig)
+    new.key_figures = old.key_figures
+
+    new.sources = old.sources
+
+    return new
@@ -0,0 +1,154 @@
+"""Process metrics in the Prometheus text format, served at /metrics by the UI.
+
+Two kinds of series:
+
+- Event metrics (counters, gauges, histograms below) are updated where the
+  work happens: run and task durations in crew.py, DB timings in
+  StorageBackend, tool calls in TrackedTool, model calls in ModelRouter.
+- Callbacks read stats the process already keeps (worker pools, model
+  router, tool cache, repair outcomes, tracing export) at scrape time.
+
+Every replica serves its own numbers; aggregate across replicas in
+Prometheus.
+"""
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Sequence, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Seconds; crew stages take minutes, DB and tool calls milliseconds to seconds
+RUN_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800)
+CALL_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+REGISTRY = CollectorRegistry()
+
+
+class CallbackCollector:
+    """Series computed at scrape time: `fn()` yields (label values, value) pairs."""
+
+    def __init__(self, name: str, help: str, kind: str, labelnames: Sequence[str], fn: Callable[[], Iterable[Tuple[Sequence, float]]]):
+        self.name = name
+        self.help = help
+        self.family = CounterMetricFamily if kind == "counter" else GaugeMetricFamily
+        self.labelnames = list(labelnames)
+        self.fn = fn
+        self.failing = False
+
+    def describe(self):
+        # Registers the series names without reading the stats source yet
+        return [self.family(self.name, self.help, labels=self.labelnames)]
+
+    def collect(self):
+        family = self.family(self.name, self.help, labels=self.labelnames)
+        try:
+            samples = list(self.fn())
+        except Exception as e:
+            # One broken stats source must not take the whole endpoint down
+            if not self.failing:
+                print(f"Metrics source {self.name} unavailable: {e}")
+            self.failing = True
+            return []
+        self.failing = False
+        for values, value in samples:
+            family.add_metric([str(v) for v in values], value)
+        return [family]
+
+
+def callback(name: str, help: str, kind: str, labelnames: Sequence[str], fn) -> CallbackCollector:
+    """Registers a scrape-time series; `kind` is "counter" or "gauge"."""
+    collector = CallbackCollector(name, help, kind, labelnames, fn)
+    REGISTRY.register(collector)
+    return collector
+
+
+def render() -> bytes:
+    """The exposition served at /metrics (content type CONTENT_TYPE_LATEST)."""
+    return generate_latest(REGISTRY)
+
+
+# --- EVENT METRICS ---
+
+RUN_SECONDS = Histogram("journalist_run_seconds", "Duration of research and writing runs.", ["stage", "outcome"], buckets=RUN_BUCKETS, registry=REGISTRY)
+TASK_SECONDS = Histogram("journalist_task_seconds", "Duration of each crew task.", ["task"], buckets=RUN_BUCKETS, registry=REGISTRY)
+CREWS_IN_FLIGHT = Gauge("journalist_crews_in_flight", "Research and writing runs executing now.", ["stage"], registry=REGISTRY)
+DB_SECONDS = Histogram("journalist_db_seconds", "Storage backend operation time.", ["backend", "op"], buckets=DB_BUCKETS, registry=REGISTRY)
+TOOL_SECONDS = Histogram("journalist_tool_seconds", "Agent tool calls (search, scrape, ...) by outcome.", ["tool", "outcome"], buckets=CALL_BUCKETS, registry=REGISTRY)
+LLM_SECONDS = Histogram("journalist_llm_seconds", "Model calls by routed model and outcome.", ["model", "outcome"], buckets=CALL_BUCKETS, registry=REGISTRY)
+ARTICLE_CACHE = Counter("journalist_article_cache", "Stored-article lookups before writing, by result.", ["result"], registry=REGISTRY)
+
+
+@contextmanager
+def run_timer(stage: str):
+    """Counts a run as in flight and records its duration and outcome."""
+    from journalist_crew.progress import RunCancelled
+
+    CREWS_IN_FLIGHT.labels(stage=stage).inc()
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except RunCancelled:
+        outcome = "cancelled"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        CREWS_IN_FLIGHT.labels(stage=stage).dec()
+        RUN_SECONDS.labels(stage=stage, outcome=outcome).observe(time.perf_counter() - start)
+
+
+# --- PROCESS STATS, READ AT SCRAPE TIME ---
+
+def _pools():
+    from journalist_crew.executor import RESEARCH_POOL, WRITING_POOL
+    return [(pool.name, pool.stats()) for pool in (RESEARCH_POOL, WRITING_POOL)]
+
+
+def _router():
+    from journalist_crew.llm import MODEL_ROUTER
+    return MODEL_ROUTER.stats()
+
+
+def _tool_cache():
+    from journalist_crew.tools.cached_tool import SHARED_TOOL_CACHE
+    return SHARED_TOOL_CACHE.stats()
+
+
+def _repair():
+    from journalist_crew.repair import REPAIR_STATS
+    return REPAIR_STATS.snapshot()
+
+
+def _rate_limiter():
+    from journalist_crew.limits import GLOBAL_RATE_LIMITER
+    return GLOBAL_RATE_LIMITER
+
+
+def _tracing():
+    from journalist_crew import tracing
+    return tracing.stats()
+
+
+callback("journalist_pool_workers", "Worker threads per run pool.", "gauge", ["pool"], lambda: [((n,), s["workers"]) for n, s in _pools()])
+callback("journalist_pool_running", "Runs executing per pool.", "gauge", ["pool"], lambda: [((n,), s["running"]) for n, s in _pools()])
+callback("journalist_pool_queued", "Runs waiting for a worker per pool.", "gauge", ["pool"], lambda: [((n,), s["queued"]) for n, s in _pools()])
+callback("journalist_pool_max_queue", "Queue capacity per pool.", "gauge", ["pool"], lambda: [((n,), s["max_queue"]) for n, s in _pools()])
+callback("journalist_pool_completed", "Runs finished per pool.", "counter", ["pool"], lambda: [((n,), s["completed"]) for n, s in _pools()])
+callback("journalist_pool_rejected", "Runs turned away because the queue was full.", "counter", ["pool"], lambda: [((n,), s["rejected"]) for n, s in _pools()])
+
+callback("journalist_model_calls", "Model calls per routed model (including errors).", "counter", ["model"], lambda: [((m,), s["calls"]) for m, s in _router()["models"].items()])
+callback("journalist_model_errors", "Failed model calls per routed model.", "counter", ["model"], lambda: [((m,), s["errors"]) for m, s in _router()["models"].items()])
+callback("journalist_model_p95_seconds", "Rolling p95 latency per routed model.", "gauge", ["model"], lambda: [((m,), s["p95_s"]) for m, s in _router()["models"].items() if s["p95_s"] is not None])
+callback("journalist_model_hedges", "Requests also sent to the fallback model, and how often it won.", "counter", ["result"], lambda: [(("sent",), _router()["hedges"]), (("won",), _router()["hedge_wins"])])
+callback("journalist_llm_rate_limit_acquired", "Process-wide LLM rate limit permits handed out.", "counter", [], lambda: [((), _rate_limiter().acquired)])
+callback("journalist_llm_rate_limit_wait_seconds", "Time spent waiting on the process-wide LLM rate limit.", "counter", [], lambda: [((), _rate_limiter().waited)])
+
+callback("journalist_tool_cache", "Shared search/scrape cache lookups (batch mode), by result.", "counter", ["result"], lambda: [(("hit",), _tool_cache()["hits"]), (("miss",), _tool_cache()["misses"])])
+callback("journalist_compile_repair", "Compile outputs by how they became a dossier.", "counter", ["outcome"], lambda: [((o,), n) for o, n in _repair()["outcomes"].items()])
+callback("journalist_spans_exported", "Trace spans exported, by exporter and result.", "counter", ["exporter", "result"], lambda: [
+    ((name, result), counts[result]) for name, counts in _tracing()["exporters"].items() for result in ("exported", "failed")
+])
@@ -0,0 +1,562 @@
+"""Versioned schema migrations for the SQLite and PostgreSQL backends.
+
+Each database records the migrations it has applied in `schema_version`.
+StorageManager checks that version once per process and database instead
+of running DDL on every construction; only missing migrations are applied,
+in order, each committed on its own (steps are idempotent, so a migration
+interrupted on SQLite, where DDL isn't transactional, is simply re-run).
+
+Migration 1 is the schema the backends used to create themselves, written
+to be safe on databases that predate this table. New schema changes are
+added as new migrations at the end of the lists below, never by editing
+applied ones. `uv run migrate` shows and applies pending migrations.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+
+from pydantic import ValidationError
+
+from journalist_crew.dates import UNBOUNDED_SCALE, timeline_rows
+from journalist_crew.models import ResearchDossier
+
+Step = Union[str, Callable]
+
+# Characters of an article kept in articles.preview for history listings
+PREVIEW_CHARS = 200
+
+
+class Migration:
+    """One schema version; steps are SQL strings or callables taking a cursor."""
+
+    def __init__(self, version: int, name: str, sqlite: Sequence[Step] = (), postgres: Sequence[Step] = ()):
+        self.version = version
+        self.name = name
+        self.steps = {"sqlite": list(sqlite), "postgres": list(postgres)}
+
+
+def _sqlite_add_column(table: str, column: str, definition: str) -> Callable:
+    # SQLite has no ADD COLUMN IF NOT EXISTS
+    def step(cursor):
+        columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+def _sqlite_index_if_table(name: str, table: str, columns: str) -> Callable:
+    # Chainlit creates its own tables; only index the ones that exist
+    def step(cursor):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        if cursor.fetchone():
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})')
+    return step
+
+
+def _backfill_timeline(dialect: str, scaled: bool = True) -> Callable:
+    # Dates are parsed in Python (dates.py), so existing dossiers are indexed here.
+    # Migration 5 predates span_scale and fills only the columns it created.
+    param = "?" if dialect == "sqlite" else "%s"
+    columns = ["dossier_id", "position", "label", "event", "start_date", "end_date", "precision"] + (["span_scale"] if scaled else [])
+
+    def step(cursor):
+        cursor.execute("SELECT id, data FROM dossiers")
+        rows = []
+        for dossier_id, data in cursor.fetchall():
+            # TEXT on SQLite, already a dict from JSONB on PostgreSQL
+            data = json.loads(data) if isinstance(data, str) else data
+            entries = [(e.get("year") or "", e.get("event") or "") for e in (data or {}).get("timeline") or []]
+            rows += [(dossier_id, *row)[: len(columns)] for row in timeline_rows(entries)]
+        cursor.executemany(f'''
+            INSERT INTO timeline_events ({", ".join(columns)})
+            VALUES ({", ".join([param] * len(columns))})
+            ON CONFLICT (dossier_id, position) DO NOTHING
+        ''', rows)
+    return step
+
+
+def _compact_legacy_citations(dialect: str) -> Callable:
+    # ResearchDossier turns inline ([Name](url)) links into numbered citations
+    # on load; write that back once instead of converting on every load.
+    param = "?" if dialect == "sqlite" else "%s"
+    data_param = param if dialect == "sqlite" else "%s::jsonb"
+
+    def step(cursor):
+        cursor.execute("SELECT id, data FROM dossiers")
+        dossiers, events = [], []
+        for dossier_id, data in cursor.fetchall():
+            data = json.loads(data) if isinstance(data, str) else data
+            if not data:
+                continue
+            try:
+                dossier = ResearchDossier.model_validate(data)
+            except ValidationError:
+                continue
+            compacted = dossier.model_dump_json()
+            if json.loads(compacted) == data:
+                continue
+            dossiers.append((compacted, dossier_id))
+            events += [(event.event, dossier_id, position) for position, event in enumerate(dossier.timeline)]
+        cursor.executemany(f"UPDATE dossiers SET data = {data_param} WHERE id = {param}", dossiers)
+        cursor.executemany(f"UPDATE timeline_events SET event = {param} WHERE dossier_id = {param} AND position = {param}", events)
+        if dossiers:
+            print(f"🧱 Converted citations in {len(dossiers)} dossiers to numbered references.")
+    return step
+
+
+# --- JOURNALIST DATABASE (and, on PostgreSQL, the Chainlit tables next to it) ---
+
+_PG_CHAINLIT_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        "id" TEXT PRIMARY KEY,
+        "identifier" TEXT UNIQUE NOT NULL,
+        "metadata" JSONB DEFAULT '{}'::jsonb,
+        "createdAt" TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS threads (
+        "id" TEXT PRIMARY KEY,
+        "createdAt" TEXT DEFAULT CURRENT_TIMESTAMP,
+        "name" TEXT,
+        "userId" TEXT,
+        "userIdentifier" TEXT,
+        "tags" TEXT[],
+        "metadata" JSONB DEFAULT '{}'::jsonb,
+        FOREIGN KEY("userId") REFERENCES users("id") ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS steps (
+        "id" TEXT PRIMARY KEY,
+        "name" TEXT NOT NULL,
+        "type" TEXT NOT NULL,
+        "threadId" TEXT NOT NULL,
+        "parentId" TEXT,
+        "disableFeedback" BOOLEAN DEFAULT FALSE,
+        "streaming" BOOLEAN DEFAULT FALSE,
+        "waitForAnswer" BOOLEAN DEFAULT FALSE,
+        "isError" BOOLEAN DEFAULT FALSE,
+        "metadata" JSONB DEFAULT '{}'::jsonb,
+        "tags" TEXT[],
+        "input" TEXT,
+        "output" TEXT,
+        "createdAt" TEXT DEFAULT CURRENT_TIMESTAMP,
+        "start" TEXT,
+        "end" TEXT,
+        "generation" JSONB,
+        "showInput" TEXT,
+        "language" TEXT,
+        "indent" INTEGER,
+        "defaultOpen" BOOLEAN DEFAULT FALSE,
+        FOREIGN KEY("threadId") REFERENCES threads("id") ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS elements (
+        "id" TEXT PRIMARY KEY,
+        "threadId" TEXT,
+        "type" TEXT,
+        "url" TEXT,
+        "chainlitKey" TEXT,
+        "name" TEXT NOT NULL,
+        "display" TEXT,
+        "objectKey" TEXT,
+        "size" TEXT,
+        "page" INTEGER,
+        "language" TEXT,
+        "forId" TEXT,
+        "mime" TEXT,
+        "props" JSONB DEFAULT '{}'::jsonb,
+        FOREIGN KEY("threadId") REFERENCES threads("id") ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feedbacks (
+        "id" TEXT PRIMARY KEY,
+        "forId" TEXT NOT NULL,
+        "threadId" TEXT NOT NULL,
+        "value" INTEGER NOT NULL,
+        "comment" TEXT,
+        FOREIGN KEY("threadId") REFERENCES threads("id") ON DELETE CASCADE
+    )
+    """,
+]
+
+MIGRATIONS = [
+    Migration(
+        1, "baseline",
+        sqlite=[
+            """
+            CREATE TABLE IF NOT EXISTS dossiers (
+                id TEXT PRIMARY KEY,
+                topic TEXT,
+                data TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dossier_id TEXT,
+                content TEXT,
+                instructions TEXT,
+                language TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(dossier_id) REFERENCES dossiers(id)
+            )
+            """,
+            _sqlite_add_column("articles", "cache_key", "TEXT"),
+            "CREATE INDEX IF NOT EXISTS idx_articles_cache_key ON articles(cache_key)",
+            """
+            CREATE TABLE IF NOT EXISTS research_runs (
+                id TEXT PRIMARY KEY,
+                dossier_id TEXT,
+                topic TEXT,
+                instructions TEXT,
+                profile TEXT,
+                status TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS run_checkpoints (
+                run_id TEXT,
+                task_name TEXT,
+                output TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, task_name),
+                FOREIGN KEY(run_id) REFERENCES research_runs(id)
+            )
+            """,
+        ],
+        postgres=_PG_CHAINLIT_TABLES + [
+            """
+            CREATE TABLE IF NOT EXISTS dossiers (
+                id TEXT PRIMARY KEY,
+                topic TEXT,
+                data JSONB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                id SERIAL PRIMARY KEY,
+                dossier_id TEXT,
+                content TEXT,
+                instructions TEXT,
+                language TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(dossier_id) REFERENCES dossiers(id)
+            )
+            """,
+            "ALTER TABLE articles ADD COLUMN IF NOT EXISTS cache_key TEXT",
+            "CREATE INDEX IF NOT EXISTS idx_articles_cache_key ON articles(cache_key)",
+            """
+            CREATE TABLE IF NOT EXISTS research_runs (
+                id TEXT PRIMARY KEY,
+                dossier_id TEXT,
+                topic TEXT,
+                instructions TEXT,
+                profile TEXT,
+                status TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS run_checkpoints (
+                run_id TEXT REFERENCES research_runs(id),
+                task_name TEXT,
+                output TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, task_name)
+            )
+            """,
+        ],
+    ),
+    Migration(
+        2, "indexes for history, listing and sidebar queries",
+        sqlite=[
+            "CREATE INDEX IF NOT EXISTS idx_articles_dossier_created ON articles(dossier_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_dossiers_modified ON dossiers(modified_at)",
+            "CREATE INDEX IF NOT EXISTS idx_research_runs_modified ON research_runs(modified_at)",
+        ],
+        postgres=[
+            "CREATE INDEX IF NOT EXISTS idx_articles_dossier_created ON articles(dossier_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_dossiers_modified ON dossiers(modified_at)",
+            "CREATE INDEX IF NOT EXISTS idx_research_runs_modified ON research_runs(modified_at)",
+            'CREATE INDEX IF NOT EXISTS idx_threads_user ON threads("userId")',
+            'CREATE INDEX IF NOT EXISTS idx_steps_thread ON steps("threadId")',
+            'CREATE INDEX IF NOT EXISTS idx_elements_thread ON elements("threadId")',
+        ],
+    ),
+    Migration(
+        3, "article previews and keyset indexes",
+        sqlite=[
+            _sqlite_add_column("articles", "preview", "TEXT"),
+            _sqlite_add_column("articles", "length", "INTEGER"),
+            f"UPDATE articles SET preview = substr(content, 1, {PREVIEW_CHARS}), length = length(content) WHERE length IS NULL",
+            "CREATE INDEX IF NOT EXISTS idx_articles_dossier_id ON articles(dossier_id, id)",
+            "CREATE INDEX IF NOT EXISTS idx_dossiers_modified_id ON dossiers(modified_at, id)",
+        ],
+        postgres=[
+            "ALTER TABLE articles ADD COLUMN IF NOT EXISTS preview TEXT",
+            "ALTER TABLE articles ADD COLUMN IF NOT EXISTS length INTEGER",
+            f"UPDATE articles SET preview = left(content, {PREVIEW_CHARS}), length = char_length(content) WHERE length IS NULL",
+            "CREATE INDEX IF NOT EXISTS idx_articles_dossier_id ON articles(dossier_id, id)",
+            "CREATE INDEX IF NOT EXISTS idx_dossiers_modified_id ON dossiers(modified_at, id)",
+        ],
+    ),
+    Migration(
+        4, "dossier owners",
+        # On SQLite the threads live in chainlit.db; StorageManager backfills
+        # owners from them right after this migration (storage.backfill_owners).
+        sqlite=[
+            _sqlite_add_column("dossiers", "owner", "TEXT"),
+            "CREATE INDEX IF NOT EXISTS idx_dossiers_owner_modified ON dossiers(owner, modified_at, id)",
+        ],
+        postgres=[
+            "ALTER TABLE dossiers ADD COLUMN IF NOT EXISTS owner TEXT",
+            # The thread a dossier was researched in names its owner; threads keyed
+            # by the dossier id were created by the old sync for whoever synced first.
+            """
+            UPDATE dossiers d SET owner = src.owner
+            FROM (
+                SELECT DISTINCT ON (metadata->>'dossier_id') metadata->>'dossier_id' AS dossier_id, "userIdentifier" AS owner
+                FROM threads
+                WHERE metadata->>'dossier_id' IS NOT NULL AND "userIdentifier" IS NOT NULL
+                ORDER BY metadata->>'dossier_id', "createdAt"
+            ) src
+            WHERE d.id = src.dossier_id AND d.owner IS NULL
+            """,
+            """
+            UPDATE dossiers d SET owner = t."userIdentifier"
+            FROM threads t
+            WHERE t."id" = d.id AND t."userIdentifier" IS NOT NULL AND d.owner IS NULL
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_dossiers_owner_modified ON dossiers(owner, modified_at, id)",
+        ],
+    ),
+    Migration(
+        5, "timeline events with normalized dates",
+        sqlite=[
+            """
+            CREATE TABLE IF NOT EXISTS timeline_events (
+                dossier_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                label TEXT,
+                event TEXT,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,
+                precision TEXT NOT NULL,
+                PRIMARY KEY (dossier_id, position),
+                FOREIGN KEY(dossier_id) REFERENCES dossiers(id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_timeline_events_range ON timeline_events(start_date, end_date)",
+            _backfill_timeline("sqlite", scaled=False),
+        ],
+        postgres=[
+            """
+            CREATE TABLE IF NOT EXISTS timeline_events (
+                dossier_id TEXT NOT NULL REFERENCES dossiers(id),
+                position INTEGER NOT NULL,
+                label TEXT,
+                event TEXT,
+                start_date DATE NOT NULL,
+                end_date DATE NOT NULL,
+                precision TEXT NOT NULL,
+                PRIMARY KEY (dossier_id, position)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_timeline_events_range ON timeline_events(start_date, end_date)",
+            _backfill_timeline("postgres", scaled=False),
+        ],
+    ),
+    Migration(
+        6, "open-ended timeline spans and span scale index",
+        # Rows are rebuilt: "since 2015" and "2011–present" now parse as open-ended
+        # periods, and each span gets the scale that bounds its range lookups.
+        sqlite=[
+            _sqlite_add_column("timeline_events", "span_scale", f"INTEGER NOT NULL DEFAULT {UNBOUNDED_SCALE}"),
+            "DROP INDEX IF EXISTS idx_timeline_events_range",
+            "CREATE INDEX IF NOT EXISTS idx_timeline_events_scale ON timeline_events(span_scale, start_date, end_date, dossier_id, position)",
+            "DELETE FROM timeline_events",
+            _backfill_timeline("sqlite"),
+        ],
+        postgres=[
+            f"ALTER TABLE timeline_events ADD COLUMN IF NOT EXISTS span_scale INTEGER NOT NULL DEFAULT {UNBOUNDED_SCALE}",
+            "DROP INDEX IF EXISTS idx_timeline_events_range",
+            "CREATE INDEX IF NOT EXISTS idx_timeline_events_scale ON timeline_events(span_scale, start_date, end_date, dossier_id, position)",
+            "DELETE FROM timeline_events",
+            _backfill_timeline("postgres"),
+        ],
+    ),
+    Migration(
+        7, "numbered citations in dossiers saved with inline links",
+        sqlite=[_compact_legacy_citations("sqlite")],
+        postgres=[_compact_legacy_citations("postgres")],
+    ),
+]
+
+# The separate SQLite chainlit.db (on PostgreSQL these tables live in the main database)
+CHAINLIT_MIGRATIONS = [
+    Migration(
+        1, "indexes for sidebar and thread loading",
+        sqlite=[
+            _sqlite_index_if_table("idx_threads_user", "threads", '"userId"'),
+            _sqlite_index_if_table("idx_steps_thread", "steps", '"threadId"'),
+            _sqlite_index_if_table("idx_elements_thread", "elements", '"threadId"'),
+        ],
+    ),
+]
+
+_SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# Arbitrary key for pg_advisory_xact_lock, so replicas starting together migrate once
+_PG_LOCK_KEY = 7204417
+
+_verified = set()
+_verified_lock = threading.Lock()
+
+
+def latest_version(migrations: Sequence[Migration] = MIGRATIONS) -> int:
+    return max(m.version for m in migrations)
+
+
+def current_version(conn) -> int:
+    cursor = conn.cursor()
+    cursor.execute(_SCHEMA_VERSION_TABLE)
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    row = cursor.fetchone()
+    conn.commit()
+    return (row[0] if row else None) or 0
+
+
+def pending(conn, migrations: Sequence[Migration] = MIGRATIONS) -> List[Migration]:
+    version = current_version(conn)
+    return [m for m in sorted(migrations, key=lambda m: m.version) if m.version > version]
+
+
+def migrate(conn, dialect: str, migrations: Sequence[Migration] = MIGRATIONS) -> List[int]:
+    """Applies every pending migration, each in its own transaction; returns the versions applied."""
+    applied = []
+    param = "?" if dialect == "sqlite" else "%s"
+    for migration in pending(conn, migrations):
+        cursor = conn.cursor()
+        try:
+            if dialect == "postgres":
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (_PG_LOCK_KEY,))
+                # Another replica may have applied it while we waited for the lock
+                cursor.execute("SELECT 1 FROM schema_version WHERE version = %s", (migration.version,))
+                if cursor.fetchone():
+                    conn.commit()
+                    continue
+            for step in migration.steps[dialect]:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute(
+                f"INSERT INTO schema_version (version, name) VALUES ({param}, {param})",
+                (migration.version, migration.name),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+        print(f"🧱 Applied migration {migration.version}: {migration.name}")
+    return applied
+
+
+def ensure_schema(key: str, connect: Callable, dialect: str, migrations: Sequence[Migration] = MIGRATIONS, close: bool = False) -> List[int]:
+    """Brings the database identified by `key` up to date, once per process.
+
+    `connect()` returns a DB-API connection; it is closed afterwards when
+    `close` is set (for connections opened just for the check). Returns the
+    versions applied by this call (empty once the database is verified).
+    """
+    check_key = (key, id(migrations))
+    with _verified_lock:
+        if check_key in _verified:
+            return []
+        conn = connect()
+        try:
+            applied = migrate(conn, dialect, migrations)
+        finally:
+            if close:
+                conn.close()
+        _verified.add(check_key)
+        return applied
+
+
+def ensure_chainlit_schema(chainlit_db_file: str):
+    """Indexes the SQLite chainlit.db, if it exists (Chainlit or init_chainlit_db.py creates it)."""
+    if not os.path.exists(chainlit_db_file):
+        return
+    ensure_schema(
+        os.path.abspath(chainlit_db_file), lambda: sqlite3.connect(chainlit_db_file), "sqlite",
+        migrations=CHAINLIT_MIGRATIONS, close=True,
+    )
+
+
+def _describe(name: str, conn, dialect: str, migrations: Sequence[Migration], apply: bool):
+    todo = pending(conn, migrations)
+    print(f"{name}: version {current_version(conn)} of {latest_version(migrations)}")
+    for m in todo:
+        print(f"  pending {m.version}: {m.name}")
+    if apply and todo:
+        return migrate(conn, dialect, migrations)
+    return []
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    """`migrate [--status] [--pg-url URL]`: shows and applies pending migrations."""
+    from journalist_crew.storage import CHAINLIT_DB_FILE, DB_FILE, OWNER_MIGRATION, backfill_owners
+
+    parser = argparse.ArgumentParser(description="Apply database schema migrations.")
+    parser.add_argument("--status", action="store_true", help="Only show pending migrations.")
+    parser.add_argument("--db-file", default=DB_FILE)
+    parser.add_argument("--chainlit-db-file", default=CHAINLIT_DB_FILE)
+    parser.add_argument("--pg-url", default=None, help="Migrate this PostgreSQL database instead of the SQLite files.")
+    args = parser.parse_args(argv)
+
+    if args.pg_url:
+        import psycopg2
+        conn = psycopg2.connect(args.pg_url)
+        _describe("postgres", conn, "postgres", MIGRATIONS, not args.status)
+        conn.close()
+        return
+
+    conn = sqlite3.connect(args.db_file)
+    applied = _describe(args.db_file, conn, "sqlite", MIGRATIONS, not args.status)
+    if OWNER_MIGRATION in applied:
+        backfill_owners(conn, args.chainlit_db_file)
+    conn.close()
+    if os.path.exists(args.chainlit_db_file):
+        conn = sqlite3.connect(args.chainlit_db_file)
+        _describe(args.chainlit_db_file, conn, "sqlite", CHAINLIT_MIGRATIONS, not args.status)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
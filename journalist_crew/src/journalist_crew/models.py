@@ -1,11 +1,21 @@
+import hashlib
 import uuid
-from typing import List
-from pydantic import BaseModel, Field
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from journalist_crew.citations import compact_text, source_index
+from journalist_crew.ledger import canonicalize_url
 
 class SourceReference(BaseModel):
     title: str = Field(..., description="Title of the article or document.")
     url: str = Field(..., description="Direct URL.")
-    credibility_score: int = Field(..., description="1-10 score of source reliability.")
+    credibility_score: Optional[int] = Field(None, description="1-10 score of source reliability. Filled from config/domain_reputation.yaml for listed domains.")
+
+    @field_validator("credibility_score")
+    @classmethod
+    def _on_scale(cls, score: Optional[int]) -> Optional[int]:
+        # Unrated (0 or missing) stays None for the reputation table to fill
+        return max(1, min(10, score)) if score else None
 
 class TimelineEvent(BaseModel):
     year: str = Field(..., description="Year or specific date.")
@@ -16,6 +26,12 @@ class KeyFigure(BaseModel):
     role: str = Field(..., description="Role during the relevant time period.")
     impact: str = Field(..., description="Specific contribution or controversy.")
 
+class CitedFact(BaseModel):
+    date: str = Field("", description="Year or specific date of the fact, if any.")
+    statement: str = Field(..., description="The specific fact, quote, or event.")
+    source_name: str = Field(..., description="The name of the website or publication.")
+    source_url: str = Field(..., description="The direct URL where this information was found.")
+
 class ResearchDossier(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Unique Session ID")
     topic: str = Field(..., description="The main topic.")
@@ -23,4 +39,28 @@ class ResearchDossier(BaseModel):
     comprehensive_narrative: str = Field(..., description="Deep-dive narrative history. Must contain inline citations.")
     key_figures: List[KeyFigure] = Field(..., description="List of major players.")
     timeline: List[TimelineEvent] = Field(..., description="Chronological list of events.")
-    sources: List[SourceReference] = Field(default_factory=list, description="List of all unique sources used.")
\ No newline at end of file
+    sources: List[SourceReference] = Field(default_factory=list, description="List of all unique sources used.")
+
+    @model_validator(mode="after")
+    def _compact_citations(self):
+        """Stores inline links as numbered references into `sources`; migration 7 converted stored dossiers."""
+        index = source_index(self.sources)
+
+        def register(url: str, title: str) -> int:
+            key = canonicalize_url(url)
+            if key not in index:
+                self.sources.append(SourceReference(title=title, url=url))
+                index[key] = len(self.sources)
+            return index[key]
+
+        self.comprehensive_narrative = compact_text(self.comprehensive_narrative, register)
+        self.executive_summary = [compact_text(point, register) for point in self.executive_summary]
+        for event in self.timeline:
+            event.event = compact_text(event.event, register)
+        for fig in self.key_figures:
+            fig.impact = compact_text(fig.impact, register)
+        return self
+
+    def content_hash(self) -> str:
+        """Changes whenever any part of the dossier changes."""
+        return hashlib.sha256(self.model_dump_json().encode("utf-8")).hexdigest()
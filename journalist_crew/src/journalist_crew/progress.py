@@ -0,0 +1,82 @@
+"""Progress events and cooperative cancellation for crew runs.
+
+A run can't be killed from outside its worker thread, so the LLM and tool
+wrappers check the run's RunMonitor before doing any work: once it is
+cancelled the next LLM call or tool call raises RunCancelled, and the
+thread unwinds without spending more rate-limit budget.
+
+The monitor is carried in a context variable rather than on the crew, so
+overlapping runs of one crew (a speculative draft next to a real one)
+can be followed and stopped separately.
+"""
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+
+class RunCancelled(Exception):
+    """Raised inside a run whose RunMonitor was cancelled."""
+
+
+class RunMonitor:
+    """Stop flag and progress listener of one research or writing run.
+
+    `listener(kind, **data)` is called from the run's worker thread with
+    events such as run_started, task_started, task_finished, tool_started,
+    tool_finished.
+    """
+
+    def __init__(self, listener: Optional[Callable] = None):
+        self.listener = listener
+        self.reason = ""
+        self._event = threading.Event()
+        self._ids = itertools.count(1)
+        # perf_counter() when the run's current task started (set by the crew)
+        self.task_started_at: Optional[float] = None
+
+    def cancel(self, reason: str = "Stopped by user"):
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, seconds: Optional[float]) -> bool:
+        """Sleeps up to `seconds`; True as soon as the run is cancelled."""
+        return self._event.wait(seconds)
+
+    def check(self):
+        if self._event.is_set():
+            raise RunCancelled(self.reason)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def emit(self, kind: str, **data):
+        """Sends one progress event; a broken listener never breaks the run."""
+        if self.listener is None:
+            return
+        try:
+            self.listener(kind, **data)
+        except Exception as e:
+            print(f"Progress listener failed on '{kind}': {e}")
+
+
+_CURRENT_RUN: ContextVar[Optional[RunMonitor]] = ContextVar("journalist_run", default=None)
+
+
+def current_run() -> Optional[RunMonitor]:
+    return _CURRENT_RUN.get()
+
+
+@contextmanager
+def monitored(monitor: Optional[RunMonitor]):
+    """Makes `monitor` the current run for the code (and LLM/tool calls) inside the block."""
+    token = _CURRENT_RUN.set(monitor)
+    try:
+        yield monitor
+    finally:
+        _CURRENT_RUN.reset(token)
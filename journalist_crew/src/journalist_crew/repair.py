@@ -0,0 +1,309 @@
+"""Local repair of almost-valid ResearchDossier JSON from compile_task.
+
+Models often wrap the JSON in prose or code fences, leave trailing commas,
+get cut off mid-list, or use the wrong type for a field. All of that is
+fixed here without another LLM call; only fields that still fail
+validation are sent to a small, targeted LLM fix-up.
+"""
+import ast
+import json
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from journalist_crew.models import ResearchDossier
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+class RepairStats:
+    """Process-wide counts of how compile outputs were turned into dossiers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = Counter()
+        self.fixes = Counter()
+
+    def record(self, outcome: str, fixes: List[str]):
+        with self._lock:
+            self.outcomes[outcome] += 1
+            self.fixes.update(fixes)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"outcomes": dict(self.outcomes), "fixes": dict(self.fixes)}
+
+
+REPAIR_STATS = RepairStats()
+
+
+# --- SYNTAX ---
+
+def extract_json(text: str, fixes: List[str]) -> str:
+    """The outermost JSON object in text (fenced or surrounded by prose); may be unterminated."""
+    fenced = _FENCE_RE.search(text)
+    if fenced and "{" in fenced.group(1):
+        text = fenced.group(1)
+        fixes.append("code_fence")
+    start = text.find("{")
+    if start == -1:
+        return text.strip()
+
+    depth, in_string, escaped = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                if start > 0 or text[i + 1:].strip():
+                    fixes.append("surrounding_prose")
+                return text[start:i + 1]
+    if start > 0:
+        fixes.append("surrounding_prose")
+    return text[start:]
+
+
+def close_truncated(text: str, fixes: List[str]) -> str:
+    """Closes strings, lists and objects left open by a cut-off response."""
+    stack, in_string, escaped, last_safe = [], False, False, 0
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            last_safe = i + 1
+        elif ch == ",":
+            last_safe = i
+    if not stack and not in_string:
+        return text
+
+    fixes.append("truncated")
+    # Drop the half-written element after the last complete one
+    text = text[:last_safe].rstrip().rstrip(",")
+    stack = []
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    return text + "".join(reversed(stack))
+
+
+def parse_json(text: str, fixes: List[str]):
+    # strict=False accepts raw newlines and tabs inside strings, the most
+    # common defect in long fields like comprehensive_narrative
+    text = extract_json(text, fixes)
+    try:
+        return json.loads(text, strict=False)
+    except ValueError:
+        pass
+
+    fixed = text.translate(_SMART_QUOTES)
+    if fixed != text:
+        fixes.append("smart_quotes")
+    if _TRAILING_COMMA_RE.search(fixed):
+        fixed = _TRAILING_COMMA_RE.sub(r"\1", fixed)
+        fixes.append("trailing_comma")
+    try:
+        return json.loads(fixed, strict=False)
+    except ValueError:
+        pass
+
+    closed = close_truncated(fixed, fixes)
+    try:
+        return json.loads(_TRAILING_COMMA_RE.sub(r"\1", closed), strict=False)
+    except ValueError:
+        pass
+
+    # A Python dict repr (single quotes, True/None) despite the instructions
+    try:
+        value = ast.literal_eval(closed)
+        fixes.append("python_literal")
+        return value
+    except (ValueError, SyntaxError):
+        return None
+
+
+# --- TYPES ---
+
+def _as_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "\n\n".join(_as_text(v) for v in value)
+    if isinstance(value, dict):
+        return "; ".join(f"{k}: {_as_text(v)}" for k, v in value.items())
+    return str(value)
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        return [value]
+    if isinstance(value, str):
+        return [line.strip().lstrip("-*• ").strip() for line in value.splitlines() if line.strip()]
+    return [value]
+
+
+def _pick(item: dict, *keys, default=""):
+    for key in keys:
+        if key in item and item[key] not in (None, ""):
+            return item[key]
+    return default
+
+
+def coerce_dossier(data: dict, topic: str, fixes: List[str]) -> dict:
+    """Maps common near-misses onto the ResearchDossier schema."""
+    if "dossier" in data and isinstance(data["dossier"], dict):
+        data = data["dossier"]
+        fixes.append("unwrapped")
+
+    out = {}
+    out["topic"] = _as_text(_pick(data, "topic", "title", default=topic))
+    out["executive_summary"] = [_as_text(p) for p in _as_list(_pick(data, "executive_summary", "summary", default=[]))]
+    out["comprehensive_narrative"] = _as_text(_pick(data, "comprehensive_narrative", "narrative", default=""))
+
+    figures = []
+    for item in _as_list(_pick(data, "key_figures", "figures", "people", default=[])):
+        if isinstance(item, str):
+            item = {"name": item}
+        if isinstance(item, dict):
+            figures.append({
+                "name": _as_text(_pick(item, "name", "person")),
+                "role": _as_text(_pick(item, "role", "position", default="Unknown")),
+                "impact": _as_text(_pick(item, "impact", "action", "description")),
+            })
+    out["key_figures"] = [f for f in figures if f["name"]]
+
+    events = []
+    for item in _as_list(_pick(data, "timeline", "events", default=[])):
+        if isinstance(item, str):
+            year, _, event = item.partition(":")
+            item = {"year": year, "event": event} if event else {"year": "", "event": year}
+        if isinstance(item, dict):
+            events.append({
+                "year": _as_text(_pick(item, "year", "date")).strip(),
+                "event": _as_text(_pick(item, "event", "description", "text")),
+            })
+    out["timeline"] = [e for e in events if e["event"]]
+
+    sources = []
+    for item in _as_list(_pick(data, "sources", "references", default=[])):
+        if isinstance(item, str):
+            item = {"url": item}
+        if isinstance(item, dict) and _pick(item, "url", "link"):
+            url = _as_text(_pick(item, "url", "link"))
+            try:
+                score = int(float(_pick(item, "credibility_score", "credibility", default=None)))
+            except (TypeError, ValueError):
+                score = None
+            sources.append({"title": _as_text(_pick(item, "title", "name", default=url)), "url": url, "credibility_score": score})
+    out["sources"] = sources
+
+    if json.dumps(out, sort_keys=True, default=str) != json.dumps({k: data.get(k) for k in out}, sort_keys=True, default=str):
+        fixes.append("coerced_types")
+    return out
+
+
+# --- ENTRY POINT ---
+
+# Fields a dossier is useless without, even when it validates
+CONTENT_FIELDS = ("executive_summary", "comprehensive_narrative")
+
+
+def _invalid_fields(error: ValidationError) -> List[str]:
+    return sorted({str(e["loc"][0]) for e in error.errors() if e["loc"]})
+
+
+def repair_dossier(text: str, topic: str, fixer: Optional[Callable[[Dict, List[str], str], Optional[Dict]]] = None) -> Tuple[Optional[ResearchDossier], Dict]:
+    """Turns compile output into a ResearchDossier, locally if at all possible.
+
+    `fixer(data, fields, problem)` is the last resort for fields that are
+    still invalid or empty: it sees the repaired dossier and returns new
+    values for just those fields. Returns (dossier or None, report).
+    """
+    fixes: List[str] = []
+    try:
+        dossier = ResearchDossier.model_validate_json(text)
+        if all(getattr(dossier, f) for f in CONTENT_FIELDS):
+            REPAIR_STATS.record("clean", [])
+            return dossier, {"outcome": "clean", "fixes": []}
+    except ValidationError:
+        pass
+
+    data = parse_json(text, fixes)
+    if not isinstance(data, dict):
+        REPAIR_STATS.record("failed", fixes)
+        return None, {"outcome": "failed", "fixes": fixes, "error": "no JSON object found"}
+
+    data = coerce_dossier(data, topic, fixes)
+    try:
+        dossier = ResearchDossier.model_validate(data)
+        fields = [f for f in CONTENT_FIELDS if not data[f]]
+        problem = f"empty: {', '.join(fields)}"
+    except ValidationError as e:
+        dossier, fields, problem = None, _invalid_fields(e), str(e)
+
+    if not fields:
+        REPAIR_STATS.record("repaired", fixes)
+        return dossier, {"outcome": "repaired", "fixes": fixes}
+
+    if fixer:
+        patch = fixer(data, fields, problem) or {}
+        data.update({k: v for k, v in patch.items() if k in fields})
+        # The second coercion only normalizes the patch; don't count fixes twice
+        refixes: List[str] = []
+        try:
+            fixed = ResearchDossier.model_validate(coerce_dossier(data, topic, refixes))
+            fixes += [f for f in refixes if f not in fixes]
+            if all(getattr(fixed, f) for f in CONTENT_FIELDS):
+                REPAIR_STATS.record("llm_fixup", fixes)
+                return fixed, {"outcome": "llm_fixup", "fixes": fixes, "fields": fields}
+        except ValidationError as e:
+            problem = str(e)
+
+    if dossier is not None:
+        # Valid but incomplete still beats re-running the whole task
+        REPAIR_STATS.record("repaired", fixes + ["incomplete"])
+        return dossier, {"outcome": "repaired", "fixes": fixes + ["incomplete"], "fields": fields}
+    REPAIR_STATS.record("failed", fixes)
+    return None, {"outcome": "failed", "fixes": fixes, "error": problem}
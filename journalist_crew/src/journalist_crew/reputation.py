@@ -0,0 +1,125 @@
+"""Domain reputation table and the per-run crawl budget built on it.
+
+The scrape tools ask the CrawlBudget before fetching: low-reputation pages
+are refused, batches are fetched most credible first, and a run stops
+fetching once it has used its page or byte allowance.
+"""
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import yaml
+
+REPUTATION_FILE = Path(__file__).parent / "config" / "domain_reputation.yaml"
+
+
+class DomainReputation:
+    def __init__(self, config: dict):
+        self.default_score = config.get("default_score", 5)
+        self.min_score = config.get("min_score", 3)
+        self.unreadable_extensions = tuple(config.get("unreadable_extensions", []))
+        self.domains = {k.lower(): v for k, v in (config.get("domains") or {}).items()}
+        self.suffixes = {k.lower(): v for k, v in (config.get("suffixes") or {}).items()}
+
+    @classmethod
+    def load(cls, path: Path = REPUTATION_FILE) -> "DomainReputation":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def lookup(self, url: str) -> Optional[int]:
+        """The table's score for url, or None when neither the domain nor a suffix is listed."""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+
+        score = None
+        labels = host.split(".")
+        for i in range(len(labels) - 1):
+            candidate = ".".join(labels[i:])
+            if candidate in self.domains:
+                score = self.domains[candidate]
+                break
+        if score is None:
+            for suffix, value in sorted(self.suffixes.items(), key=lambda kv: -len(kv[0])):
+                if host.endswith(suffix):
+                    score = value
+                    break
+        return None if score is None else max(1, min(10, score))
+
+    def readable(self, url: str) -> bool:
+        """False for downloads (PDF, Office files) the fetcher would turn away."""
+        return not urlsplit(url).path.lower().endswith(self.unreadable_extensions)
+
+    def score(self, url: str) -> int:
+        known = self.lookup(url)
+        return self.default_score if known is None else known
+
+    def score_sources(self, sources):
+        """Fills credibility_score on SourceReferences: the table wins for listed domains."""
+        for source in sources:
+            known = self.lookup(source.url)
+            if known is not None:
+                source.credibility_score = known
+            elif not source.credibility_score:
+                source.credibility_score = self.default_score
+        return sources
+
+
+REPUTATION = DomainReputation.load()
+
+
+class CrawlBudget:
+    """Per-run allowance of page fetches and bytes, spent on the most credible pages first."""
+
+    def __init__(self, reputation: DomainReputation = REPUTATION, max_fetches: int = 60, max_bytes: int = 30_000_000):
+        self.reputation = reputation
+        self._lock = threading.Lock()
+        self.reset(max_fetches, max_bytes)
+
+    def reset(self, max_fetches: int, max_bytes: int):
+        with self._lock:
+            self.max_fetches = max_fetches
+            self.max_bytes = max_bytes
+            self.fetches = 0
+            self.bytes = 0
+            self.refused = {"unreadable": 0, "low_reputation": 0, "budget": 0}
+
+    def plan(self, urls: List[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Splits urls into (to fetch, best first) and (refused, with the reason).
+
+        Fetch slots for the accepted urls are reserved immediately.
+        """
+        ranked = sorted(urls, key=self.reputation.score, reverse=True)
+        accepted, refused = [], []
+        with self._lock:
+            for url in ranked:
+                score = self.reputation.score(url)
+                if not self.reputation.readable(url):
+                    refused.append((url, "document format the scraper cannot read"))
+                    self.refused["unreadable"] += 1
+                elif score < self.reputation.min_score:
+                    refused.append((url, f"low-reputation source ({score}/10)"))
+                    self.refused["low_reputation"] += 1
+                elif self.fetches >= self.max_fetches or self.bytes >= self.max_bytes:
+                    refused.append((url, "crawl budget for this run is used up"))
+                    self.refused["budget"] += 1
+                else:
+                    self.fetches += 1
+                    accepted.append(url)
+        return accepted, refused
+
+    def charge(self, size: int):
+        with self._lock:
+            self.bytes += size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "fetches": self.fetches,
+                "max_fetches": self.max_fetches,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "refused": dict(self.refused),
+            }
@@ -1,61 +1,99 @@
 import os
+import json
 import sqlite3
+import datetime
 from typing import List, Dict, Optional
+from journalist_crew.backends import StorageBackend, make_page, split_page_cursor, timeline_bounds
+from journalist_crew.dates import scale_windows, timeline_rows
+from journalist_crew.migrations import PREVIEW_CHARS, ensure_chainlit_schema, ensure_schema
 from journalist_crew.models import ResearchDossier
 
 # DB_FILE = "data/journalist_studio.db"
 DB_FILE = "journalist_studio.db"
+CHAINLIT_DB_FILE = "chainlit.db"
 
+# Migration that adds dossiers.owner; SQLite backfills it from chainlit.db
+OWNER_MIGRATION = 4
 
-class StorageManager:
-    def __init__(self):
-        self.conn = sqlite3.connect(DB_FILE, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self._init_db()
 
-    def _init_db(self):
-        # os.makedirs("data", exist_ok=True)
-        cursor = self.conn.cursor()
-        
-        # 1. Dossiers Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS dossiers (
-                id TEXT PRIMARY KEY,
-                topic TEXT,
-                data TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # 2. Articles Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS articles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                dossier_id TEXT,
-                content TEXT,
-                instructions TEXT,
-                language TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(dossier_id) REFERENCES dossiers(id)
-            )
-        ''')
-        self.conn.commit()
+def backfill_owners(conn, chainlit_db_file: str) -> int:
+    """Sets dossiers.owner from the Chainlit threads that reference each dossier.
+
+    The thread a dossier was researched in (metadata dossier_id) wins over a
+    thread keyed by the dossier id, which the old sync created for whoever
+    synced first. Dossiers that already have an owner are left alone.
+    """
+    if not os.path.exists(chainlit_db_file):
+        return 0
+    c_conn = sqlite3.connect(chainlit_db_file)
+    try:
+        if not c_conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'threads'").fetchone():
+            return 0
+        threads = c_conn.execute('''
+            SELECT "id", "userIdentifier", "metadata" FROM threads
+            WHERE "userIdentifier" IS NOT NULL
+            ORDER BY "createdAt"
+        ''').fetchall()
+    finally:
+        c_conn.close()
+
+    owners, fallback = {}, {}
+    for thread_id, user, metadata in threads:
+        try:
+            dossier_id = json.loads(metadata or "{}").get("dossier_id")
+        except (ValueError, AttributeError):
+            dossier_id = None
+        if dossier_id:
+            owners.setdefault(dossier_id, user)
+        fallback.setdefault(thread_id, user)
+    for dossier_id, user in fallback.items():
+        owners.setdefault(dossier_id, user)
 
-    def save_dossier(self, dossier: ResearchDossier):
-        """Saves dossier. Updates modified_at automatically on save."""
+    cursor = conn.cursor()
+    cursor.executemany(
+        "UPDATE dossiers SET owner = ? WHERE id = ? AND owner IS NULL",
+        [(user, dossier_id) for dossier_id, user in owners.items()],
+    )
+    conn.commit()
+    print(f"🧱 Backfilled owners for {cursor.rowcount} dossiers from Chainlit threads.")
+    return cursor.rowcount
+
+
+class StorageManager(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, db_file: str = DB_FILE, chainlit_db_file: str = CHAINLIT_DB_FILE):
+        self.db_file = db_file
+        self.chainlit_db_file = chainlit_db_file
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        # Applies pending migrations the first time each database is opened in this process
+        applied = ensure_schema(os.path.abspath(db_file), lambda: self.conn, "sqlite")
+        if OWNER_MIGRATION in applied:
+            backfill_owners(self.conn, chainlit_db_file)
+        ensure_chainlit_schema(chainlit_db_file)
+
+    def save_dossier(self, dossier: ResearchDossier, owner: Optional[str] = None):
+        """Saves dossier. Updates modified_at automatically on save; an existing owner is kept."""
         cursor = self.conn.cursor()
         json_data = dossier.model_dump_json()
         
         cursor.execute('''
-            INSERT INTO dossiers (id, topic, data, created_at, modified_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            INSERT INTO dossiers (id, topic, data, owner, created_at, modified_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
             ON CONFLICT(id) DO UPDATE SET
                 topic=excluded.topic,
                 data=excluded.data,
+                owner=COALESCE(dossiers.owner, excluded.owner),
                 modified_at=CURRENT_TIMESTAMP
-        ''', (dossier.id, dossier.topic, json_data))
+        ''', (dossier.id, dossier.topic, json_data, owner))
+
+        # The dated timeline, indexed for find_timeline_events
+        cursor.execute('DELETE FROM timeline_events WHERE dossier_id = ?', (dossier.id,))
+        cursor.executemany('''
+            INSERT INTO timeline_events (dossier_id, position, label, event, start_date, end_date, precision, span_scale)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(dossier.id, *row) for row in timeline_rows((e.year, e.event) for e in dossier.timeline)])
         
         self.conn.commit()
         print(f"Dossier saved. ID: {dossier.id}")
@@ -69,30 +107,207 @@ class StorageManager:
             return ResearchDossier.model_validate_json(row['data'])
         return None
 
-    def list_dossiers(self) -> List[Dict]:
-        """Returns list sorted by LAST MODIFIED (most recent first)."""
+    def list_dossiers(self, owner: Optional[str] = None) -> List[Dict]:
+        """Returns list sorted by LAST MODIFIED (most recent first); only `owner`'s when given."""
+        where, params = ("WHERE owner = ?", (owner,)) if owner is not None else ("", ())
         cursor = self.conn.cursor()
-        cursor.execute('''
+        cursor.execute(f'''
             SELECT id, topic, created_at, modified_at 
-            FROM dossiers 
-            ORDER BY modified_at DESC
-        ''')
+            FROM dossiers {where}
+            ORDER BY modified_at DESC, id DESC
+        ''', params)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def list_dossiers_page(self, limit: int = 20, cursor: Optional[str] = None, owner: Optional[str] = None) -> Dict:
+        """One page of dossiers, most recently modified first: {"items", "next_cursor"}.
+
+        Pass `next_cursor` back for the following page; it is None on the last one.
+        """
+        conditions, params = [], []
+        if owner is not None:
+            conditions.append("owner = ?")
+            params.append(owner)
+        if cursor:
+            modified_at, dossier_id = split_page_cursor(cursor)
+            conditions.append("(modified_at < ? OR (modified_at = ? AND id < ?))")
+            params += [modified_at, modified_at, dossier_id]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = self.conn.cursor()
+        sql.execute(f'''
+            SELECT id, topic, created_at, modified_at
+            FROM dossiers {where}
+            ORDER BY modified_at DESC, id DESC
+            LIMIT ?
+        ''', (*params, limit + 1))
+        return make_page([dict(row) for row in sql.fetchall()], limit)
+
+    def find_timeline_events(self, start: str, end: str, owner: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Timeline events across dossiers that overlap the range, earliest first."""
+        first, last = timeline_bounds(start, end)
+        # One bounded index range per span scale (see dates.scale_windows), merged in order
+        branches, params = [], []
+        for i, (scale, earliest) in enumerate(scale_windows(first, last)):
+            conditions = ["t.span_scale = ?", "t.start_date <= ?", "t.end_date >= ?"]
+            params += [scale, last, first]
+            if earliest is not None:
+                conditions.append("t.start_date >= ?")
+                params.append(earliest)
+            if owner is not None:
+                conditions.append("d.owner = ?")
+                params.append(owner)
+            branches.append(f'''
+                SELECT * FROM (
+                    SELECT t.dossier_id, d.topic, t.label, t.event, t.start_date, t.end_date, t.precision, t.position
+                    FROM timeline_events t JOIN dossiers d ON d.id = t.dossier_id
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY t.start_date, t.end_date, t.dossier_id, t.position
+                    LIMIT ?
+                ) AS scale_{i}
+            ''')
+            params.append(limit)
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT dossier_id, topic, label, event, start_date, end_date, precision
+            FROM ({' UNION ALL '.join(branches)})
+            ORDER BY start_date, end_date, dossier_id, position
+            LIMIT ?
+        ''', (*params, limit))
         return [dict(row) for row in cursor.fetchall()]
 
-    def save_article(self, dossier_id: str, content: str, instructions: str, lang: str):
+    def save_article(self, dossier_id: str, content: str, instructions: str, lang: str, cache_key: Optional[str] = None):
         cursor = self.conn.cursor()
         cursor.execute('''
-            INSERT INTO articles (dossier_id, content, instructions, language, created_at, modified_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-        ''', (dossier_id, content, instructions, lang))
+            INSERT INTO articles (dossier_id, content, instructions, language, cache_key, preview, length, created_at, modified_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        ''', (dossier_id, content, instructions, lang, cache_key, content[:PREVIEW_CHARS], len(content)))
         self.conn.commit()
 
-    def get_article_history(self, dossier_id: str) -> List[Dict]:
+    def find_cached_article(self, cache_key: str) -> Optional[str]:
+        """Latest article written for this dossier state, instructions and language."""
         cursor = self.conn.cursor()
         cursor.execute('''
-            SELECT id, content, instructions, language, created_at 
+            SELECT content FROM articles
+            WHERE cache_key = ?
+            ORDER BY created_at DESC, id DESC
+            LIMIT 1
+        ''', (cache_key,))
+        row = cursor.fetchone()
+        return row['content'] if row else None
+
+    def get_article_history(self, dossier_id: str, limit: int = 20, before_id: Optional[int] = None) -> List[Dict]:
+        """Newest drafts first, as summaries (preview and length, no content).
+
+        For older drafts pass the last `id` seen as `before_id`; load one
+        draft's text with get_article.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT id, instructions, language, created_at, preview, length
             FROM articles 
-            WHERE dossier_id = ? 
-            ORDER BY created_at DESC
-        ''', (dossier_id,))
-        return [dict(row) for row in cursor.fetchall()]
\ No newline at end of file
+            WHERE dossier_id = ? AND (? IS NULL OR id < ?)
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (dossier_id, before_id, before_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_article(self, article_id: int) -> Optional[Dict]:
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT id, dossier_id, content, instructions, language, created_at
+            FROM articles
+            WHERE id = ?
+        ''', (article_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    # --- RUN CHECKPOINTS ---
+
+    def save_run(self, run_id: str, topic: str, instructions: str, profile: str, dossier_id: Optional[str] = None):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT INTO research_runs (id, dossier_id, topic, instructions, profile, status, created_at, modified_at)
+            VALUES (?, ?, ?, ?, ?, 'running', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        ''', (run_id, dossier_id, topic, instructions, profile))
+        self.conn.commit()
+
+    def set_run_status(self, run_id: str, status: str, error: Optional[str] = None, dossier_id: Optional[str] = None):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            UPDATE research_runs
+            SET status = ?, error = ?, dossier_id = COALESCE(?, dossier_id), modified_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (status, error, dossier_id, run_id))
+        self.conn.commit()
+
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT * FROM research_runs WHERE id = ?', (run_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def list_runs(self, unfinished: bool = False, limit: int = 20) -> List[Dict]:
+        """Most recent runs first; `unfinished` leaves out completed ones."""
+        cursor = self.conn.cursor()
+        where = "WHERE status != 'done'" if unfinished else ""
+        cursor.execute(f'''
+            SELECT id, dossier_id, topic, profile, status, error, created_at, modified_at
+            FROM research_runs {where}
+            ORDER BY modified_at DESC
+            LIMIT ?
+        ''', (limit,))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def save_checkpoint(self, run_id: str, task_name: str, output: str):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT INTO run_checkpoints (run_id, task_name, output, created_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(run_id, task_name) DO UPDATE SET
+                output=excluded.output,
+                created_at=CURRENT_TIMESTAMP
+        ''', (run_id, task_name, output))
+        self.conn.commit()
+
+    def load_checkpoints(self, run_id: str) -> Dict[str, str]:
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT task_name, output FROM run_checkpoints WHERE run_id = ?', (run_id,))
+        return {row['task_name']: row['output'] for row in cursor.fetchall()}
+
+    def close(self):
+        self.conn.close()
+
+    # --- SYNC LOGIC ---
+
+    def sync_dossiers_to_sidebar(self, user_identifier: str):
+        """Pushes the user's own dossiers into their Chainlit sidebar."""
+        try:
+            if not os.path.exists(self.chainlit_db_file): return
+
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT id, topic, created_at FROM dossiers WHERE owner = ?", (user_identifier,))
+            dossiers = cursor.fetchall()
+            if not dossiers: return
+
+            c_conn = sqlite3.connect(self.chainlit_db_file)
+            c_cursor = c_conn.cursor()
+            c_cursor.execute('SELECT "id" FROM threads WHERE "userId" = ?', (user_identifier,))
+            existing_threads = {row[0] for row in c_cursor.fetchall()}
+
+            # Threads are keyed by dossier id; one left by the old global sync
+            # under another user is skipped instead of failing the whole sync.
+            missing = [
+                (
+                    doc_id, created_at if created_at else datetime.datetime.now().isoformat(), topic, user_identifier, user_identifier,
+                    json.dumps({"dossier_id": doc_id, "topic_name": topic}),
+                )
+                for doc_id, topic, created_at in dossiers if doc_id not in existing_threads
+            ]
+            if missing:
+                c_cursor.executemany("""
+                    INSERT INTO threads ("id", "createdAt", "name", "userId", "userIdentifier", "metadata")
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT("id") DO NOTHING
+                """, missing)
+                c_conn.commit()
+            c_conn.close()
+        except Exception as e: print(f"Sync Error: {e}")
@@ -0,0 +1,101 @@
+"""Async, batched writes of Chainlit thread names and metadata.
+
+The UI used to open a blocking sqlite3 connection inside the message
+handler for every rename and metadata change. Updates are now queued,
+merged per thread (a rename and a metadata change become one upsert) and
+written together on the data layer's own async engine, off the message path.
+"""
+import asyncio
+import datetime
+import json
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import text
+
+_UPSERT = """
+    INSERT INTO threads ("id", "createdAt", "name", "metadata")
+    VALUES (:id, :created_at, :name, {metadata})
+    ON CONFLICT ("id") DO UPDATE SET
+        "name" = COALESCE(excluded."name", threads."name"),
+        "metadata" = COALESCE(excluded."metadata", threads."metadata")
+"""
+
+
+class ThreadMetadataWriter:
+    """Coalesces thread updates and flushes them in batches on an AsyncEngine.
+
+    `get_engine` is called lazily (the Chainlit data layer is created after
+    import). Metadata replaces the stored value, as Chainlit itself does.
+    """
+
+    def __init__(self, get_engine: Callable, flush_interval: float = 0.2, max_batch: int = 100):
+        self.get_engine = get_engine
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: Dict[str, dict] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+    def rename(self, thread_id: str, name: str):
+        self._queue(thread_id, name=name)
+
+    def update_metadata(self, thread_id: str, metadata: dict):
+        self._queue(thread_id, metadata=metadata)
+
+    def _queue(self, thread_id: str, **fields):
+        update = self._pending.setdefault(thread_id, {"name": None, "metadata": None})
+        if fields.get("name") is not None:
+            update["name"] = fields["name"]
+        if fields.get("metadata") is not None:
+            update["metadata"] = {**(update["metadata"] or {}), **fields["metadata"]}
+
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            # Let updates from the same handler land in the same batch
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Writes everything queued so far."""
+        while self._pending:
+            batch = {}
+            for thread_id in list(self._pending)[: self.max_batch]:
+                batch[thread_id] = self._pending.pop(thread_id)
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                print(f"Thread metadata write failed for {len(batch)} thread(s): {e}")
+                return
+
+    async def _write(self, batch: Dict[str, dict]):
+        engine = self.get_engine()
+        metadata = "CAST(:metadata AS JSONB)" if engine.dialect.name == "postgresql" else ":metadata"
+        statement = text(_UPSERT.format(metadata=metadata))
+        created_at = datetime.datetime.now().isoformat()
+        rows = [
+            {
+                "id": thread_id,
+                "created_at": created_at,
+                "name": update["name"],
+                "metadata": json.dumps(update["metadata"]) if update["metadata"] is not None else None,
+            }
+            for thread_id, update in batch.items()
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(statement, rows)
+        self.written += len(rows)
+        self.batches += 1
+
+    def stats(self) -> dict:
+        return {"written": self.written, "batches": self.batches, "failed": self.failed, "pending": len(self._pending)}
@@ -0,0 +1,82 @@
+import os
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field
+
+from journalist_crew.fetcher import SHARED_FETCHER
+from journalist_crew.ledger import canonicalize_url
+from journalist_crew.tools.passage_scrape_tool import PassageScrapeTool, select_passages
+
+
+class BatchScrapeInput(BaseModel):
+    website_urls: List[str] = Field(..., description="The URLs to read, e.g. the most promising links of a search result page.")
+    focus: Optional[str] = Field(None, description="Optional: what you are looking for on these pages (names, dates, amounts).")
+
+
+class BatchScrapeTool(PassageScrapeTool):
+    """Reads many pages in one call, fetched concurrently over the shared connection pool.
+
+    Each page is reduced to its top passages like PassageScrapeTool. Pages
+    already read in this run (per the crew's RunLedger) are skipped, and the
+    crawl budget decides which of the rest are worth fetching, best first.
+    """
+    name: str = "Read multiple websites"
+    description: str = (
+        "Reads up to 10 websites at once and returns the passages of each most relevant to the "
+        "current research, with their URLs. Prefer this over reading search results one by one."
+    )
+    args_schema: type[BaseModel] = BatchScrapeInput
+    top_k: int = int(os.getenv("BATCH_SCRAPE_TOP_K", "3"))
+    max_urls: int = 10
+    ledger: Any = None
+
+    def _run(self, website_urls: List[str], focus: Optional[str] = None) -> str:
+        candidates, seen, out = [], set(), []
+        for url in website_urls:
+            key = canonicalize_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            entry = self.ledger.find_url(url, focus) if self.ledger else None
+            if entry is not None:
+                out.append(f"Already read earlier in this run: {url}")
+            else:
+                candidates.append(url)
+
+        if self.budget:
+            candidates.sort(key=self.budget.reputation.score, reverse=True)
+        urls, skipped = candidates[: self.max_urls], len(candidates) - self.max_urls
+
+        # Pages in the shared page cache cost neither a fetch nor crawl budget
+        pages, to_fetch = {}, []
+        for url in urls:
+            page = self.cached_page(url)
+            if page is None:
+                to_fetch.append(url)
+            else:
+                pages[url] = page
+        if self.budget:
+            to_fetch, refused = self.budget.plan(to_fetch)
+            out += [f"Skipped {url}: {reason}." for url, reason in refused]
+
+        for url, fetched in zip(to_fetch, (self.fetcher or SHARED_FETCHER).fetch_many(to_fetch)):
+            if self.budget:
+                self.budget.charge(fetched.bytes)
+            if not fetched.ok:
+                out.append(f"Could not read {url}: {fetched.error}")
+                continue
+            pages[url] = self.remember_page(url, fetched.text)
+
+        query = self.query(focus)
+        for url in urls:
+            if url not in pages:
+                continue
+            title, paragraphs = pages[url]
+            text = select_passages(url, title, paragraphs, query, self.top_k, self.passage_words)
+            if self.ledger:
+                self.ledger.record_url(url, text, focus)
+            out.append(text)
+
+        if skipped > 0:
+            out.append(f"({skipped} more URLs not read; at most {self.max_urls} per call.)")
+        return "\n\n---\n\n".join(out)
@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from crewai.tools import BaseTool
+
+
+class ToolResultCache:
+    """Thread-safe LRU cache of tool results with a time-to-live."""
+
+    def __init__(self, ttl: float = 6 * 3600, max_entries: int = 5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": round(self.hits / total, 3) if total else 0.0}
+
+
+SHARED_TOOL_CACHE = ToolResultCache(ttl=float(os.getenv("TOOL_CACHE_TTL", str(6 * 3600))))
+
+
+class CachedTool(BaseTool):
+    """Serves repeated calls to the wrapped tool from a ToolResultCache shared across crews.
+
+    A wrapped tool can define `cacheable(result)` to keep failures and
+    per-run refusals out of the cache, so they don't stick for every later
+    run until the TTL expires.
+    """
+    name: str = ""
+    description: str = ""
+    inner: Any = None
+    cache: Any = None
+
+    @classmethod
+    def wrap(cls, inner: BaseTool, cache: ToolResultCache) -> "CachedTool":
+        return cls(name=inner.name, description=inner.description, args_schema=inner.args_schema, inner=inner, cache=cache)
+
+    def _run(self, **kwargs: Any) -> Any:
+        # Tools whose output depends on the run's directive are cached per directive
+        key = (self.inner.name, getattr(self.inner, "directive", ""), json.dumps(kwargs, sort_keys=True, default=str))
+        result = self.cache.get(key)
+        if result is None:
+            result = self.inner.run(**kwargs)
+            cacheable = getattr(self.inner, "cacheable", None)
+            if cacheable is None or cacheable(result):
+                self.cache.put(key, result)
+        return result
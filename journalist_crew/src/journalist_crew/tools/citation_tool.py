@@ -1,6 +1,11 @@
+from typing import Any, List
+
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from journalist_crew.formatting import format_cited_fact, format_citation
+from journalist_crew.models import CitedFact
+
 class CitationInput(BaseModel):
     statement: str = Field(..., description="The specific fact, quote, or event being cited.")
     source_url: str = Field(..., description="The direct URL where this information was found.")
@@ -11,10 +16,32 @@ class CitationTool(BaseTool):
     description: str = (
         "Use this tool to format a verified fact with an inline, clickable citation. "
         "Returns a string in the format: 'Fact... ([Source](URL))'. "
-        "You MUST use this for every key date, figure, or quote."
+        "For more than one fact, use the Batch Citation Formatter instead."
     )
     args_schema: type[BaseModel] = CitationInput
 
     def _run(self, statement: str, source_url: str, source_name: str) -> str:
         # Returns: "The budget was 20M ([BalkanInsight](https://...))."
-        return f"{statement} ([{source_name}]({source_url}))"
\ No newline at end of file
+        return format_citation(statement, source_name, source_url)
+
+class BatchCitationInput(BaseModel):
+    facts: List[CitedFact] = Field(..., description="Every fact to cite, each with its date, statement, source_name and source_url.")
+
+class BatchCitationTool(BaseTool):
+    name: str = "Batch Citation Formatter"
+    description: str = (
+        "Formats many verified facts at once, one line per fact with an inline, clickable citation. "
+        "Use this instead of calling the Citation Formatter once per fact."
+    )
+    args_schema: type[BaseModel] = BatchCitationInput
+    ledger: Any = None
+
+    def _run(self, facts: List[Any]) -> str:
+        lines = []
+        for fact in facts:
+            fact = fact if isinstance(fact, CitedFact) else CitedFact.model_validate(fact)
+            line = format_cited_fact(fact)
+            if self.ledger:
+                self.ledger.record_fact(fact.statement, fact.source_url, line)
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,53 @@
+from typing import Any
+
+from crewai.tools import BaseTool
+
+from journalist_crew.ledger import RunLedger
+
+
+class LedgerTool(BaseTool):
+    """Answers repeated searches, page reads and citations within a run from the RunLedger.
+
+    The first repeat gets the stored result; after that the agent is told
+    the ground is already covered so it moves on instead of looping.
+    """
+    name: str = ""
+    description: str = ""
+    inner: Any = None
+    ledger: Any = None
+    kind: str = "search"
+
+    @classmethod
+    def wrap(cls, inner: BaseTool, ledger: RunLedger, kind: str) -> "LedgerTool":
+        return cls(name=inner.name, description=inner.description, args_schema=inner.args_schema, inner=inner, ledger=ledger, kind=kind)
+
+    def _run(self, **kwargs: Any) -> Any:
+        if self.kind == "search":
+            query = str(kwargs.get("search_query", ""))
+            entry = self.ledger.find_query(query)
+            if entry is not None:
+                if entry.hits > 1:
+                    return f'Already covered: "{entry.key}" was searched earlier in this run. Search for something new or read the results you have.'
+                return f'(Results of the earlier search "{entry.key}" in this run)\n{entry.result}'
+            result = self.inner.run(**kwargs)
+            self.ledger.record_query(query, result)
+            return result
+
+        if self.kind == "scrape":
+            url, focus = str(kwargs.get("website_url", "")), kwargs.get("focus")
+            entry = self.ledger.find_url(url, focus)
+            if entry is not None:
+                if entry.hits > 1:
+                    return f"Already covered: {entry.key} was read earlier in this run with this focus."
+                return entry.result
+            result = self.inner.run(**kwargs)
+            self.ledger.record_url(url, result, focus)
+            return result
+
+        statement, url = str(kwargs.get("statement", "")), str(kwargs.get("source_url", ""))
+        entry = self.ledger.find_fact(statement, url)
+        if entry is not None:
+            return entry.result
+        result = self.inner.run(**kwargs)
+        self.ledger.record_fact(statement, url, result)
+        return result
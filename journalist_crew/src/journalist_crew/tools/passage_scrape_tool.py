@@ -0,0 +1,92 @@
+import os
+from typing import Any, Optional
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from journalist_crew.extraction import extract_main_text, split_passages, top_passages
+from journalist_crew.fetcher import SHARED_FETCHER
+from journalist_crew.ledger import canonicalize_url
+
+
+def render_passages(url: str, html: str, query: str, top_k: int, passage_words: int = 120) -> str:
+    """The top_k passages of a page for `query`, headed by its title and URL."""
+    title, paragraphs = extract_main_text(html)
+    return select_passages(url, title, paragraphs, query, top_k, passage_words)
+
+
+def select_passages(url: str, title: str, paragraphs: list, query: str, top_k: int, passage_words: int = 120) -> str:
+    """Like render_passages, for a page whose main text is already extracted."""
+    passages = split_passages(paragraphs, max_words=passage_words)
+    if not passages:
+        return f"No readable text found at {url}."
+
+    chosen = top_passages(query, passages, k=top_k)
+    out = [f"Source: {title or url}\nURL: {url}\n(showing {len(chosen)} of {len(passages)} passages)"]
+    for index, _, text in chosen:
+        out.append(f"[{index + 1}] {text}")
+    return "\n\n".join(out)
+
+
+class PassageScrapeInput(BaseModel):
+    website_url: str = Field(..., description="Mandatory website url to read the file")
+    focus: Optional[str] = Field(None, description="Optional: what you are looking for on this page (names, dates, amounts).")
+
+
+class PassageScrapeTool(BaseTool):
+    """Reads a page and returns only the passages relevant to the research directive.
+
+    Replaces ScrapeWebsiteTool, whose whole-page text (menus, comments and
+    all) was carried in every later turn of the agent's context. `directive`
+    is set by the crew for each run; the agent's own `focus` is added to it.
+
+    With a `page_cache` (a ToolResultCache shared across crews), a page's
+    extracted text is kept by canonical URL and ranked afresh for each
+    run's query, so other topics and batch jobs reuse the fetch.
+    """
+    name: str = "Read website content"
+    description: str = (
+        "Reads a website and returns the passages most relevant to the current research, "
+        "each with the source URL. Pass `focus` to say what you are looking for on the page."
+    )
+    args_schema: type[BaseModel] = PassageScrapeInput
+    directive: str = ""
+    top_k: int = int(os.getenv("SCRAPE_TOP_K", "5"))
+    passage_words: int = 120
+    fetcher: Any = None
+    budget: Any = None
+    page_cache: Any = None
+
+    def query(self, focus: Optional[str] = None) -> str:
+        return " ".join(part for part in (focus, self.directive) if part)
+
+    def cacheable(self, result: str) -> bool:
+        """False for fetch failures and crawl-budget refusals, which only hold for this attempt or run."""
+        return not result.startswith(("Could not read ", "Skipped "))
+
+    def cached_page(self, url: str):
+        """(title, paragraphs) of a page read earlier, or None."""
+        return self.page_cache.get(canonicalize_url(url)) if self.page_cache is not None else None
+
+    def remember_page(self, url: str, html: str):
+        """Extracts a fetched page's main text and keeps it for later reads."""
+        page = extract_main_text(html)
+        if self.page_cache is not None:
+            self.page_cache.put(canonicalize_url(url), page)
+        return page
+
+    def _run(self, website_url: str, focus: Optional[str] = None) -> str:
+        page = self.cached_page(website_url)
+        if page is None:
+            if self.budget:
+                _, refused = self.budget.plan([website_url])
+                if refused:
+                    return f"Skipped {website_url}: {refused[0][1]}."
+            fetched = (self.fetcher or SHARED_FETCHER).fetch(website_url)
+            if self.budget:
+                self.budget.charge(fetched.bytes)
+            if not fetched.ok:
+                return f"Could not read {website_url}: {fetched.error}"
+            page = self.remember_page(website_url, fetched.text)
+        title, paragraphs = page
+        return select_passages(website_url, title, paragraphs, self.query(focus), self.top_k, self.passage_words)
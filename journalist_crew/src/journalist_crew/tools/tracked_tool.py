@@ -0,0 +1,39 @@
+import json
+import time
+from typing import Any
+
+from crewai.tools import BaseTool
+
+from journalist_crew.metrics import TOOL_SECONDS
+from journalist_crew.progress import current_run
+
+
+class TrackedTool(BaseTool):
+    """Reports each call of the wrapped tool to the current run and refuses to start once it is stopped."""
+    name: str = ""
+    description: str = ""
+    inner: Any = None
+
+    @classmethod
+    def wrap(cls, inner: BaseTool) -> "TrackedTool":
+        return cls(name=inner.name, description=inner.description, args_schema=inner.args_schema, inner=inner)
+
+    def _run(self, **kwargs: Any) -> Any:
+        run = current_run()
+        if run is None:
+            with TOOL_SECONDS.labels(tool=self.name, outcome="ok").time():
+                return self.inner.run(**kwargs)
+
+        run.check()
+        call_id = run.next_id()
+        run.emit("tool_started", call_id=call_id, tool=self.name, input=json.dumps(kwargs, ensure_ascii=False, default=str))
+        started = time.perf_counter()
+        try:
+            result = self.inner.run(**kwargs)
+        except Exception as e:
+            TOOL_SECONDS.labels(tool=self.name, outcome="error").observe(time.perf_counter() - started)
+            run.emit("tool_finished", call_id=call_id, tool=self.name, output=f"Failed: {e}", seconds=round(time.perf_counter() - started, 1))
+            raise
+        TOOL_SECONDS.labels(tool=self.name, outcome="ok").observe(time.perf_counter() - started)
+        run.emit("tool_finished", call_id=call_id, tool=self.name, output=str(result), seconds=round(time.perf_counter() - started, 1))
+        return result
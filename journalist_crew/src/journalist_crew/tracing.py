@@ -0,0 +1,240 @@
+"""Tracing setup, driven entirely by environment variables.
+
+Nothing is exported unless an exporter is configured, so replicas without a
+collector don't pay for failed export attempts. When tracing is on:
+
+- Sampling is decided once per trace, at its root. `TRACING_SAMPLE_RATE`
+  applies to every root span, `TRACING_SAMPLE_RATES` overrides it per stage
+  ("research=0.1,writing=0.5"); child spans follow their root.
+- Spans are exported in batches from a background thread, never on the
+  request path. A full queue drops spans instead of blocking a run.
+- Attribute values are capped at `TRACING_MAX_ATTRIBUTE_CHARS`, so a span
+  never carries a whole prompt or scraped page.
+
+Exporters (`TRACING_EXPORTERS`, comma separated):
+    otlp   Phoenix or any OTLP/HTTP collector at TRACING_ENDPOINT
+    file   one JSON span per line in TRACING_FILE, for offline profiling
+
+Setting only TRACING_ENDPOINT implies `otlp`. `bench_tracing` measures the
+overhead against an untraced offline run.
+"""
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import SpanLimits, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, Sampler, TraceIdRatioBased
+
+# Resource attribute Phoenix groups traces by
+PROJECT_ATTRIBUTE = "openinference.project.name"
+
+
+def _rates(text: str) -> Dict[str, float]:
+    rates = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        stage, _, rate = item.partition("=")
+        rates[stage.strip()] = float(rate)
+    return rates
+
+
+class TracingConfig:
+    """Tracing settings; `from_env()` reads the TRACING_* variables."""
+
+    def __init__(
+        self,
+        exporters: Sequence[str] = (),
+        endpoint: str = "http://localhost:6006/v1/traces",
+        project: str = "journalist-crew",
+        sample_rate: float = 1.0,
+        stage_rates: Optional[Dict[str, float]] = None,
+        file: str = "traces/spans.jsonl",
+        batch_size: int = 512,
+        queue_size: int = 2048,
+        export_delay_ms: int = 5000,
+        max_attribute_chars: int = 4096,
+        max_attributes: int = 64,
+        max_events: int = 32,
+    ):
+        self.exporters = [e for e in exporters if e]
+        self.endpoint = endpoint
+        self.project = project
+        self.sample_rate = sample_rate
+        self.stage_rates = stage_rates or {}
+        self.file = file
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.export_delay_ms = export_delay_ms
+        self.max_attribute_chars = max_attribute_chars
+        self.max_attributes = max_attributes
+        self.max_events = max_events
+
+    @classmethod
+    def from_env(cls) -> "TracingConfig":
+        endpoint = os.getenv("TRACING_ENDPOINT")
+        exporters = os.getenv("TRACING_EXPORTERS", "otlp" if endpoint else "")
+        return cls(
+            exporters=[e.strip().lower() for e in exporters.split(",")],
+            endpoint=endpoint or "http://localhost:6006/v1/traces",
+            project=os.getenv("TRACING_PROJECT", "journalist-crew"),
+            sample_rate=float(os.getenv("TRACING_SAMPLE_RATE", "1.0")),
+            stage_rates=_rates(os.getenv("TRACING_SAMPLE_RATES", "")),
+            file=os.getenv("TRACING_FILE", "traces/spans.jsonl"),
+            batch_size=int(os.getenv("TRACING_BATCH_SIZE", "512")),
+            queue_size=int(os.getenv("TRACING_QUEUE_SIZE", "2048")),
+            export_delay_ms=int(os.getenv("TRACING_EXPORT_DELAY_MS", "5000")),
+            max_attribute_chars=int(os.getenv("TRACING_MAX_ATTRIBUTE_CHARS", "4096")),
+            max_attributes=int(os.getenv("TRACING_MAX_ATTRIBUTES", "64")),
+            max_events=int(os.getenv("TRACING_MAX_EVENTS", "32")),
+        )
+
+
+class StageSampler(Sampler):
+    """Head sampling by root span name, e.g. the "research" and "writing" stages."""
+
+    def __init__(self, default_rate: float, stage_rates: Dict[str, float]):
+        self.default = TraceIdRatioBased(default_rate)
+        self.stages = {stage: TraceIdRatioBased(rate) for stage, rate in stage_rates.items()}
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        sampler = self.stages.get(name, self.default)
+        return sampler.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+
+    def get_description(self) -> str:
+        stages = ",".join(f"{name}={s.rate}" for name, s in sorted(self.stages.items()))
+        return f"StageSampler{{default={self.default.rate},{stages}}}"
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends finished spans to a local file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class CountingExporter(SpanExporter):
+    """Wraps an exporter to count exported and failed spans (see stats())."""
+
+    def __init__(self, name: str, inner: SpanExporter):
+        self.name = name
+        self.inner = inner
+        self.exported = 0
+        self.failed = 0
+
+    def export(self, spans) -> SpanExportResult:
+        try:
+            result = self.inner.export(spans)
+        except Exception as e:
+            print(f"Span export to {self.name} failed: {e}")
+            result = SpanExportResult.FAILURE
+        if result == SpanExportResult.SUCCESS:
+            self.exported += len(spans)
+        else:
+            self.failed += len(spans)
+        return result
+
+    def shutdown(self):
+        self.inner.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.inner.force_flush(timeout_millis) if hasattr(self.inner, "force_flush") else True
+
+
+_provider: Optional[TracerProvider] = None
+_exporters = []
+_lock = threading.Lock()
+
+
+def _build_exporter(name: str, config: TracingConfig) -> SpanExporter:
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=config.endpoint)
+    if name == "file":
+        return JsonlSpanExporter(config.file)
+    raise ValueError(f"Unknown tracing exporter '{name}'. Choose from: otlp, file")
+
+
+def configure_tracing(config: Optional[TracingConfig] = None) -> Optional[TracerProvider]:
+    """Installs the tracer provider and CrewAI instrumentation once per process.
+
+    Returns None (and instruments nothing) when no exporter is configured.
+    """
+    global _provider
+    config = config or TracingConfig.from_env()
+    with _lock:
+        if _provider is not None:
+            return _provider
+        if not config.exporters:
+            print("Tracing off (set TRACING_ENDPOINT or TRACING_EXPORTERS to enable).")
+            return None
+
+        provider = TracerProvider(
+            resource=Resource.create({PROJECT_ATTRIBUTE: config.project}),
+            sampler=ParentBased(root=StageSampler(config.sample_rate, config.stage_rates)),
+            span_limits=SpanLimits(
+                max_span_attribute_length=config.max_attribute_chars,
+                max_attributes=config.max_attributes,
+                max_events=config.max_events,
+            ),
+        )
+        for name in config.exporters:
+            exporter = CountingExporter(name, _build_exporter(name, config))
+            provider.add_span_processor(BatchSpanProcessor(
+                exporter,
+                max_queue_size=config.queue_size,
+                max_export_batch_size=config.batch_size,
+                schedule_delay_millis=config.export_delay_ms,
+            ))
+            _exporters.append(exporter)
+        trace.set_tracer_provider(provider)
+
+        from openinference.instrumentation.crewai import CrewAIInstrumentor
+        CrewAIInstrumentor().instrument(tracer_provider=provider)
+
+        atexit.register(provider.shutdown)
+        _provider = provider
+        rates = ", ".join(f"{k}={v}" for k, v in config.stage_rates.items())
+        print(f"🔭 Tracing to {', '.join(config.exporters)} (sample rate {config.sample_rate}{'; ' + rates if rates else ''}).")
+        return provider
+
+
+@contextmanager
+def stage_span(stage: str, **attributes):
+    """Root span for one pipeline stage; the sampling decision for everything under it."""
+    if _provider is None:
+        yield None
+        return
+    attributes = {k: v for k, v in attributes.items() if v is not None}
+    with _provider.get_tracer("journalist_crew").start_as_current_span(stage, attributes=attributes) as span:
+        yield span
+
+
+def flush(timeout_millis: int = 30000) -> bool:
+    return _provider.force_flush(timeout_millis) if _provider is not None else True
+
+
+def stats() -> dict:
+    return {
+        "enabled": _provider is not None,
+        "exporters": {e.name: {"exported": e.exported, "failed": e.failed} for e in _exporters},
+    }
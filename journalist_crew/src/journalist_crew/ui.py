@@ -1,33 +1,33 @@
 import os
 import json
-import sqlite3
+import asyncio
 import datetime
+import hmac
 import uuid
 import chainlit as cl
-from journalist_crew.crew import JournalistCrew
+from journalist_crew.crew import DEFAULT_PROFILE, PROFILES, JournalistCrew, article_cache_key, describe_profile
+from journalist_crew.formatting import format_article, format_dossier_to_markdown
+from journalist_crew.executor import RESEARCH_POOL, WRITING_POOL, Overloaded, run_in_pool
+from journalist_crew.metrics import CONTENT_TYPE_LATEST, callback, render as render_metrics
+from journalist_crew.progress import RunCancelled, RunMonitor
+from journalist_crew.thread_writer import ThreadMetadataWriter
+from chainlit.data import get_data_layer as shared_data_layer
 from chainlit.data.sql_alchemy import SQLAlchemyDataLayer
 from chainlit.input_widget import Select, TextInput
-from phoenix.otel import register
-from openinference.instrumentation.crewai import CrewAIInstrumentor
+from chainlit.server import app as chainlit_app
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+from journalist_crew.tracing import configure_tracing
 
-# import psycopg2 # Uncomment for PostgreSQL
-
-tracer_provider = register(
-    project_name="journalist-crew",
-    endpoint="http://localhost:6006/v1/traces"
-)
-
-CrewAIInstrumentor().instrument(tracer_provider=tracer_provider)
+# Exporters, sampling and limits come from TRACING_* (see tracing.py); off by default
+configure_tracing()
 
 
 @cl.data_layer
 def get_data_layer():
-    # PostgreSQL Connection (Commented out)
-    # db_url = os.getenv("CHAINLIT_DATABASE_URL")
-    # return SQLAlchemyDataLayer(conninfo=db_url)
-    
-    # SQLite Connection (Active)
-    return SQLAlchemyDataLayer(conninfo="sqlite+aiosqlite:///chainlit.db")
+    # Threads live next to the dossiers: with STORAGE_BACKEND=postgres point this
+    # at the same database (postgresql+asyncpg://...), otherwise chainlit.db is used.
+    return SQLAlchemyDataLayer(conninfo=os.getenv("CHAINLIT_DATABASE_URL", "sqlite+aiosqlite:///chainlit.db"))
 
 TRANSLATIONS = {}
 LANG_CODES = ["en-US", "sq-AL"]
@@ -67,36 +67,7 @@ def auth(username, password):
         return cl.User(identifier=username)
     return None
 
-def format_dossier_to_markdown(dossier):
-    md = f"# Research Dossier: {dossier.topic}\n\n"
-    
-    md += "### Executive Summary\n"
-    for point in dossier.executive_summary:
-        md += f"- {point}\n"
-    
-    md += "\n### Narrative\n"
-    md += f"{dossier.comprehensive_narrative}\n"
-    
-    md += "\n### Timeline\n"
-    for event in dossier.timeline:
-        md += f"- **{event.year}**: {event.event}\n"
-
-    md += "\n### Key Figures\n"
-    md += "| Name | Role | Impact |\n|---|---|---|\n"
-    for fig in dossier.key_figures:
-        c_name = str(fig.name).replace("|", "-")
-        c_role = str(fig.role).replace("|", "-")
-        c_impact = str(fig.impact).replace("|", "-")
-        md += f"| {c_name} | {c_role} | {c_impact} |\n"
-    
-    if hasattr(dossier, 'sources') and dossier.sources:
-        md += "\n### Sources\n"
-        for src in dossier.sources:
-            md += f"- [{src.title}]({src.url})\n"
-
-    return md
-
-async def send_write_action():
+async def send_write_action(regenerate=False):
     unique_id = f"action-write_{uuid.uuid4().hex[:8]}"
 
     actions = [
@@ -108,6 +79,14 @@ async def send_write_action():
             id=unique_id
         )
     ]
+    if regenerate:
+        actions.append(cl.Action(
+            name="regenerate_article",
+            value="regenerate",
+            label=t("rewrite_btn"),
+            payload={},
+            id=f"action-regenerate_{uuid.uuid4().hex[:8]}"
+        ))
     
     await cl.Message(
         content="Research ready. Click the button below to write, or type to research more.", 
@@ -119,114 +98,218 @@ async def show_dossier_and_actions(dossier):
     await cl.Message(content=formatted_content).send()
     await send_write_action()
 
-def manual_rename_thread(thread_id, new_name):
-    # PostgreSQL Implementation
-    # try:
-    #     db_url = os.getenv("CHAINLIT_DATABASE_URL")
-    #     conn = psycopg2.connect(db_url)
-    #     c = conn.cursor()
-    #     c.execute('UPDATE threads SET name = %s WHERE id = %s', (new_name, thread_id))
-    #     conn.commit()
-    #     conn.close()
-    # except Exception: pass
-
-    # SQLite Implementation
-    try:
-        conn = sqlite3.connect("chainlit.db")
-        c = conn.cursor()
-        c.execute('UPDATE threads SET name = ? WHERE id = ?', (new_name, thread_id))
-        conn.commit()
-        conn.close()
-    except Exception: pass
-
-def manual_update_metadata(thread_id, metadata_dict):
-    # PostgreSQL Implementation
-    # try:
-    #     db_url = os.getenv("CHAINLIT_DATABASE_URL")
-    #     conn = psycopg2.connect(db_url)
-    #     c = conn.cursor()
-    #     json_meta = json.dumps(metadata_dict)
-    #     c.execute('UPDATE threads SET metadata = %s WHERE id = %s', (json_meta, thread_id))
-    #     if c.rowcount == 0:
-    #         c.execute('INSERT INTO threads ("id", "createdAt", "metadata") VALUES (%s, %s, %s)', (thread_id, datetime.datetime.now(), json_meta))
-    #     conn.commit()
-    #     conn.close()
-    # except Exception: pass
-
-    # SQLite Implementation
+async def send_chat_settings():
+    profiles = list(PROFILES)
+    settings = await cl.ChatSettings([
+        Select(id="Language", label="Article Language", values=["Albanian", "English", "Macedonian"], initial_index=0),
+        Select(id="Tone", label="Writing Tone", values=["Serious", "Neutral"], initial_index=0),
+        TextInput(id="Focus", label="Focus", initial="Corruption"),
+        Select(
+            id="Profile",
+            label="Pipeline Profile",
+            values=profiles,
+            initial_index=profiles.index(DEFAULT_PROFILE),
+            description=" | ".join(describe_profile(name) for name in profiles),
+        ),
+    ]).send()
+    cl.user_session.set("article_settings", settings)
+
+def current_profile():
+    settings = cl.user_session.get("article_settings") or {}
+    return settings.get("Profile") or DEFAULT_PROFILE
+
+def build_write_request(settings):
+    """Turns ChatSettings into the (instructions, language) pair given to run_writer."""
+    if not settings:
+        settings = {
+            "Language": "Albanian",
+            "Tone": "Serious",
+            "Focus": "",
+        }
+    
+    lang_pref = settings.get("Language", "Albanian")
+    tone_pref = settings.get("Tone", "Serious")
+    focus_pref = settings.get("Focus")
+
+    instructions_parts = [
+        f"LANGUAGE: {lang_pref}",
+        f"TONE: {tone_pref}",
+    ]
+    if focus_pref:
+        instructions_parts.append(f"FOCUS: {focus_pref}")
+    instructions = ". ".join(part for part in instructions_parts if part) + "."
+
+    target_lang = "Albanian" if "albanian" in lang_pref.lower() else "English"
+    return instructions, target_lang
+
+# --- SPECULATIVE WRITING ---
+# Most users click "write_article" with the default settings right after
+# research. When enabled, that draft is started in the background as soon
+# as the dossier is shown and served instantly if the click matches.
+SPECULATIVE_WRITE = os.getenv("SPECULATIVE_WRITE", "false").lower() in ("1", "true", "yes")
+
+def start_speculative_write(crew):
+    discard_speculative_write()
+    if not SPECULATIVE_WRITE or not crew.current_dossier:
+        return
+
+    instructions, target_lang = build_write_request(cl.user_session.get("article_settings"))
+    snapshot = crew.current_dossier.model_copy(deep=True)
+    profile = current_profile()
+    key = article_cache_key(snapshot, instructions, target_lang, profile)
+    monitor = RunMonitor()
     try:
-        conn = sqlite3.connect("chainlit.db")
-        c = conn.cursor()
-        json_meta = json.dumps(metadata_dict)
-        c.execute('UPDATE threads SET metadata = ? WHERE id = ?', (json_meta, thread_id))
-        
-        if c.rowcount == 0:
-            c.execute("""
-                INSERT INTO threads ("id", "createdAt", "metadata") 
-                VALUES (?, ?, ?)
-            """, (thread_id, datetime.datetime.now().isoformat(), json_meta))
-            
-        conn.commit()
-        conn.close()
-    except Exception as e: 
-        print(f"Metadata Error (Ignored): {e}")
-
-def sync_dossiers_to_sidebar(user_identifier):
-    # PostgreSQL Implementation
-    # try:
-    #     db_url = os.getenv("DATABASE_URL")
-    #     conn = psycopg2.connect(db_url)
-    #     cursor = conn.cursor()
-    #     cursor.execute("SELECT id, topic, created_at FROM dossiers")
-    #     dossiers = cursor.fetchall()
-    #     cursor.execute('SELECT "id" FROM threads WHERE "userId" = %s', (user_identifier,))
-    #     existing_threads = {row[0] for row in cursor.fetchall()}
-    #     count = 0
-    #     for doc_id, topic, created_at in dossiers:
-    #         if doc_id not in existing_threads:
-    #             cursor.execute("""
-    #                 INSERT INTO threads ("id", "createdAt", "name", "userId", "userIdentifier", "metadata")
-    #                 VALUES (%s, %s, %s, %s, %s, %s)
-    #             """, (doc_id, created_at, topic, user_identifier, user_identifier, json.dumps({"dossier_id": doc_id, "topic_name": topic})))
-    #             count += 1
-    #     if count > 0: conn.commit()
-    #     conn.close()
-    # except Exception: pass
-
-    # SQLite Implementation
+        # A guess never waits in the queue ahead of real requests
+        future = WRITING_POOL.submit(
+            crew.run_writer, instructions, target_lang, dossier=snapshot, save=False, profile=profile, monitor=monitor,
+            only_if_idle=True,
+        )
+    except Overloaded:
+        return
+    task = asyncio.wrap_future(future)
+    cl.user_session.set("speculative_write", {"key": key, "task": task, "monitor": monitor})
+
+def discard_speculative_write():
+    """Drops a pending speculative draft (settings or dossier changed)."""
+    speculative = cl.user_session.get("speculative_write")
+    cl.user_session.set("speculative_write", None)
+    if speculative:
+        # Stops the worker thread at its next LLM call; its result is never read
+        speculative["monitor"].cancel("Speculative draft discarded")
+        speculative["task"].cancel()
+
+async def take_speculative_write(key):
+    """Returns the speculative draft if it was written for `key`, else None."""
+    speculative = cl.user_session.get("speculative_write")
+    cl.user_session.set("speculative_write", None)
+    if not speculative:
+        return None
+    if speculative["key"] != key:
+        speculative["monitor"].cancel("Speculative draft discarded")
+        speculative["task"].cancel()
+        return None
     try:
-        if not os.path.exists("journalist_studio.db"): return
-
-        j_conn = sqlite3.connect("journalist_studio.db")
-        j_cursor = j_conn.cursor()
-        j_cursor.execute("SELECT id, topic, created_at FROM dossiers")
-        dossiers = j_cursor.fetchall()
-        j_conn.close()
-
-        c_conn = sqlite3.connect("chainlit.db")
-        c_cursor = c_conn.cursor()
-        c_cursor.execute('SELECT "id" FROM threads WHERE "userId" = ?', (user_identifier,))
-        existing_threads = {row[0] for row in c_cursor.fetchall()}
-
-        count = 0
-        for doc_id, topic, created_at in dossiers:
-            if doc_id not in existing_threads:
-                safe_created_at = created_at if created_at else datetime.datetime.now().isoformat()
-                c_cursor.execute("""
-                    INSERT INTO threads ("id", "createdAt", "name", "userId", "userIdentifier", "metadata")
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    doc_id, safe_created_at, topic, user_identifier, user_identifier, 
-                    json.dumps({"dossier_id": doc_id, "topic_name": topic})
-                ))
-                count += 1
-        if count > 0: c_conn.commit()
-        c_conn.close()
-    except Exception as e: print(f"Sync Error: {e}")
+        return await speculative["task"]
+    except Exception as e:
+        print(f"Speculative write failed, writing normally: {e}")
+        return None
+
+# --- LIVE PROGRESS & STOPPING ---
+# Each run streams its tasks and tool calls into nested steps under the
+# agent step, and can be stopped from the loader message or the stop button.
+
+def _now():
+    return datetime.datetime.utcnow().isoformat() + "Z"
+
+def _clip(text, limit=600):
+    text = str(text or "")
+    return text if len(text) <= limit else text[:limit] + "…"
+
+class ProgressSteps:
+    """RunMonitor listener: mirrors task and tool events as steps nested under `parent`.
+
+    Called from the run's worker thread; the UI updates are handed back
+    to the event loop with cl.run_sync.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.task_step = None
+        self.tool_steps = {}
+
+    def __call__(self, kind, **data):
+        cl.run_sync(self.show(kind, data))
+
+    async def show(self, kind, data):
+        if kind == "task_started":
+            step = cl.Step(name=data["task"].replace("_task", "").replace("_", " ").title(), type="run", parent_id=self.parent.id)
+            step.input = data["agent"]
+            step.start = _now()
+            await step.send()
+            self.task_step = step
+        elif kind == "task_finished" and self.task_step:
+            self.task_step.output = _clip(data["output"])
+            self.task_step.end = _now()
+            await self.task_step.update()
+            self.task_step = None
+        elif kind == "tool_started":
+            parent = self.task_step or self.parent
+            step = cl.Step(name=data["tool"], type="tool", parent_id=parent.id)
+            step.input = _clip(data["input"], 300)
+            step.start = _now()
+            await step.send()
+            self.tool_steps[data["call_id"]] = step
+        elif kind == "tool_finished":
+            step = self.tool_steps.pop(data["call_id"], None)
+            if step:
+                step.output = f"{_clip(data['output'])}\n\n({data['seconds']}s)"
+                step.end = _now()
+                await step.update()
+
+def stop_action():
+    return cl.Action(name="stop_run", value="stop", label=t("stop_btn"), payload={}, id=f"action-stop_{uuid.uuid4().hex[:8]}")
+
+def new_run(parent):
+    """A RunMonitor for the session's next run, streaming into steps under `parent`."""
+    monitor = RunMonitor(listener=ProgressSteps(parent))
+    cl.user_session.set("active_run", monitor)
+    return monitor
+
+def queue_reporter(loader, working_text):
+    """Shows a queued run's position on its loader message until it starts."""
+    async def report(position):
+        loader.content = t("queued", position=position) if position else working_text
+        await loader.update()
+    return report
+
+async def report_interrupted(loader, text):
+    await loader.remove()
+    await cl.Message(content=text).send()
+
+def stop_active_run():
+    monitor = cl.user_session.get("active_run")
+    if monitor and not monitor.cancelled:
+        monitor.cancel()
+        print("Run stopped by user.")
+
+@cl.action_callback("stop_run")
+async def on_stop_action(action):
+    stop_active_run()
+    await action.remove()
+
+@cl.on_stop
+async def on_stop():
+    stop_active_run()
+
+# Thread renames and metadata go through one async writer on the data
+# layer's engine, so the message handler never waits on the database.
+THREAD_WRITER = ThreadMetadataWriter(lambda: shared_data_layer().engine)
+
+callback(
+    "journalist_thread_writes", "Chainlit thread renames/metadata updates, by result.", "counter", ["result"],
+    lambda: [((k,), v) for k, v in THREAD_WRITER.stats().items() if k in ("written", "failed")],
+)
+callback("journalist_thread_writes_pending", "Thread updates waiting to be flushed.", "gauge", [], lambda: [((), THREAD_WRITER.stats()["pending"])])
+
+
+# Scrapers must send "Authorization: Bearer $METRICS_TOKEN" when it is set
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+async def metrics_endpoint(request):
+    if METRICS_TOKEN:
+        sent = request.headers.get("authorization", "")
+        if not hmac.compare_digest(sent.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+            return PlainTextResponse("Unauthorized\n", status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+# Chainlit ends its routes with a catch-all for the frontend, so this one goes first
+chainlit_app.router.routes.insert(0, Route("/metrics", metrics_endpoint, methods=["GET"]))
 
 @cl.on_chat_resume
 async def on_resume(thread: dict):
-    crew = JournalistCrew()
+    user = cl.user_session.get("user")
+    crew = JournalistCrew(owner=user.identifier if user else None)
     cl.user_session.set("crew", crew)
 
     metadata = thread.get("metadata")
@@ -240,12 +323,7 @@ async def on_resume(thread: dict):
     if dossier_id and crew.load_context(dossier_id):
         await cl.Message(content=t("session_restored")).send()
         
-        settings = await cl.ChatSettings([
-            Select(id="Language", label="Article Language", values=["Albanian", "English", "Macedonian"], initial_index=0),
-            Select(id="Tone", label="Writing Tone", values=["Serious", "Neutral"], initial_index=0),
-            TextInput(id="Focus", label="Focus", initial="Corruption"),
-        ]).send()
-        cl.user_session.set("article_settings", settings)
+        await send_chat_settings()
         
         await show_dossier_and_actions(crew.current_dossier)
     else:
@@ -254,20 +332,16 @@ async def on_resume(thread: dict):
 @cl.on_chat_start
 async def start():
     user = cl.user_session.get("user")
-    if user: sync_dossiers_to_sidebar(user.identifier)
-    crew = JournalistCrew()
+    crew = JournalistCrew(owner=user.identifier if user else None)
+    if user: crew.db.sync_dossiers_to_sidebar(user.identifier)
     cl.user_session.set("crew", crew)
     
-    settings = await cl.ChatSettings([
-        Select(id="Language", label="Article Language", values=["Albanian", "English", "Macedonian"], initial_index=0),
-        Select(id="Tone", label="Writing Tone", values=["Serious", "Neutral"], initial_index=0),
-        TextInput(id="Focus", label="Focus", initial="Corruption"),
-    ]).send()
-    cl.user_session.set("article_settings", settings)
+    await send_chat_settings()
     await cl.Message(content=f"{t('welcome_title')}\n\n{t('welcome_body')}").send()
 
 @cl.on_settings_update
 async def setup_agent(settings):
+    discard_speculative_write()
     cl.user_session.set("article_settings", settings)
     await cl.Message(content=f"Settings Updated.").send()
 
@@ -276,79 +350,125 @@ async def main(message: cl.Message):
     crew = cl.user_session.get("crew")
     user_input = message.content
     
-    loader_msg = cl.Message(content="Agents are working...")
+    loader_msg = cl.Message(content="Agents are working...", actions=[stop_action()])
     await loader_msg.send()
 
     if not crew.current_dossier:
         if cl.context.session.thread_id:
-            manual_rename_thread(cl.context.session.thread_id, user_input)
+            THREAD_WRITER.rename(cl.context.session.thread_id, user_input)
 
+        interrupted = None
         async with cl.Step(name="Research Agent", type="run") as step:
             step.input = user_input
             if crew.load_context(user_input):
                 step.output = "Loaded from Database."
             else:
-                await cl.make_async(crew.run_research)(user_input)
-                step.output = "Research Completed."
+                try:
+                    await run_in_pool(
+                        RESEARCH_POOL, crew.run_research, user_input, profile=current_profile(), monitor=new_run(step),
+                        on_queued=queue_reporter(loader_msg, "Agents are working..."),
+                    )
+                    step.output = "Research Completed."
+                except RunCancelled:
+                    step.output = "Stopped."
+                    interrupted = t("run_stopped")
+                except Overloaded as e:
+                    step.output = str(e)
+                    interrupted = t("overloaded")
+
+        if interrupted:
+            await report_interrupted(loader_msg, interrupted)
+            return
         
         if crew.current_dossier:
             cl.user_session.set("dossier_id", crew.current_dossier.id)
             
             if cl.context.session.thread_id:
-                manual_update_metadata(cl.context.session.thread_id, {
+                THREAD_WRITER.update_metadata(cl.context.session.thread_id, {
                     "dossier_id": crew.current_dossier.id,
                     "topic_name": crew.current_dossier.topic
                 })
         
         await loader_msg.remove()
         await show_dossier_and_actions(crew.current_dossier)
+        start_speculative_write(crew)
         
     else:
+        discard_speculative_write()
         topic = crew.current_dossier.topic
+        interrupted = None
         async with cl.Step(name="Research Agent", type="run") as step:
             step.input = f"Digging deeper: {user_input}"
-            await cl.make_async(crew.run_research)(topic, instructions=user_input)
-            step.output = "Dossier Updated."
+            try:
+                await run_in_pool(
+                    RESEARCH_POOL, crew.run_research, topic, instructions=user_input, profile=current_profile(), monitor=new_run(step),
+                    on_queued=queue_reporter(loader_msg, "Agents are working..."),
+                )
+                step.output = "Dossier Updated."
+            except RunCancelled:
+                step.output = "Stopped. The dossier was not changed."
+                interrupted = t("run_stopped")
+            except Overloaded as e:
+                step.output = str(e)
+                interrupted = t("overloaded")
+
+        if interrupted:
+            await report_interrupted(loader_msg, interrupted)
+            await send_write_action()
+            return
         
         await loader_msg.remove()
         await show_dossier_and_actions(crew.current_dossier)
+        start_speculative_write(crew)
 
-@cl.action_callback("write_article")
-async def on_write(action):
-    settings = cl.user_session.get("article_settings")
-    if not settings:
-        settings = {
-            "Language": "Albanian",
-            "Tone": "Serious",
-            "Focus": "",
-        }
-    
-    lang_pref = settings.get("Language", "Albanian")
-    tone_pref = settings.get("Tone", "Serious")
-    focus_pref = settings.get("Focus")
-
-    instructions_parts = [
-        f"LANGUAGE: {lang_pref}",
-        f"TONE: {tone_pref}",
-    ]
-    if focus_pref:
-        instructions_parts.append(f"FOCUS: {focus_pref}")
-    instructions = ". ".join(part for part in instructions_parts if part) + "."
-
+async def write_article(regenerate=False):
+    instructions, target_lang = build_write_request(cl.user_session.get("article_settings"))
+    profile = current_profile()
     crew = cl.user_session.get("crew")
-    target_lang = "Albanian" if "albanian" in lang_pref.lower() else "English"
 
-    loader = cl.Message(content="Writing Article...")
+    loader = cl.Message(content="Writing Article...", actions=[stop_action()])
     await loader.send()
+    interrupted = None
 
     async with cl.Step(name="Writer Agent", type="run") as step:
         step.input = instructions
-        article = await cl.make_async(crew.run_writer)(instructions, target_lang)
-        step.output = "Draft Generated."
+        key = article_cache_key(crew.current_dossier, instructions, target_lang, profile)
+        article = None if regenerate else await take_speculative_write(key)
+        if article is not None:
+            # A cache hit inside the speculative run is already stored
+            if crew.db.find_cached_article(key) is None:
+                crew.db.save_article(crew.current_dossier.id, article, instructions, target_lang, cache_key=key)
+            step.output = "Draft Generated (pre-written)."
+        else:
+            discard_speculative_write()
+            try:
+                article = await run_in_pool(
+                    WRITING_POOL, crew.run_writer, instructions, target_lang, regenerate=regenerate, profile=profile, monitor=new_run(step),
+                    on_queued=queue_reporter(loader, "Writing Article..."),
+                )
+                step.output = "Draft Generated."
+            except RunCancelled:
+                step.output = "Stopped."
+                interrupted = t("run_stopped")
+            except Overloaded as e:
+                step.output = str(e)
+                interrupted = t("overloaded")
+
+    if article is None:
+        await report_interrupted(loader, interrupted)
+        await send_write_action()
+        return
     
     await loader.remove()
 
-    article_block = "### Writer Draft\n\n" + article.strip()
-    await cl.Message(content=article_block).send()
+    await cl.Message(content=format_article(article)).send()
     
-    await send_write_action()
\ No newline at end of file
+    await send_write_action(regenerate=True)
+
+@cl.action_callback("write_article")
+async def on_write(action):
+    await write_article()
+
+@cl.action_callback("regenerate_article")
+async def on_regenerate(action):
+    await write_article(regenerate=True)
@@ -0,0 +1,43 @@
+from journalist_crew.citations import cited_numbers, compact_text, expand_article, expand_text, remap_text, source_index
+from journalist_crew.models import SourceReference
+
+SOURCES = [
+    SourceReference(title="Meta", url="https://meta.mk/a"),
+    SourceReference(title="Reuters", url="https://reuters.com/b"),
+]
+
+
+def test_compact_replaces_inline_links_with_numbers():
+    registered = []
+
+    def register(url, title):
+        registered.append((url, title))
+        return len(registered)
+
+    text = compact_text("Signed ([Meta](https://meta.mk/a)). Loan [Reuters](https://reuters.com/b).", register)
+    assert text == "Signed [1]. Loan [2]."
+    assert registered == [("https://meta.mk/a", "Meta"), ("https://reuters.com/b", "Reuters")]
+
+
+def test_expand_leaves_unknown_numbers_alone():
+    assert expand_text("Signed [1], loan [3].", SOURCES) == "Signed ([Meta](https://meta.mk/a)), loan [3]."
+
+
+def test_cited_numbers_in_order_of_first_use():
+    assert cited_numbers("[2] then [1] and [2] again") == [2, 1]
+
+
+def test_source_index_uses_canonical_urls_and_first_position():
+    sources = SOURCES + [SourceReference(title="Meta again", url="http://www.meta.mk/a/?utm_source=x")]
+    assert source_index(sources) == {"https://meta.mk/a": 1, "https://reuters.com/b": 2}
+
+
+def test_article_lists_only_cited_sources():
+    article = expand_article("Loan approved [2].", SOURCES)
+    assert article == "Loan approved ([Reuters](https://reuters.com/b)).\n\n## Sources\n2. [Reuters](https://reuters.com/b)\n"
+    assert "## Sources" not in expand_article("No citations.", SOURCES)
+
+
+def test_remap_only_touches_mapped_numbers():
+    assert remap_text("Signed [1], loan [2], in [2008].", {1: 4, 2: 1}) == "Signed [4], loan [1], in [2008]."
+    assert remap_text("See [3].", {1: 2}) == "See [3]."
@@ -0,0 +1,76 @@
+import pytest
+
+from journalist_crew.dates import OPEN_END, DateSpan, parse_date, scale_windows, timeline_rows
+
+
+@pytest.mark.parametrize("label, expected", [
+    # Points
+    ("2008", DateSpan("2008-01-01", "2008-12-31", "year")),
+    ("May 2008", DateSpan("2008-05-01", "2008-05-31", "month")),
+    ("2008-05", DateSpan("2008-05-01", "2008-05-31", "month")),
+    ("05/2008", DateSpan("2008-05-01", "2008-05-31", "month")),
+    ("2008-05-12", DateSpan("2008-05-12", "2008-05-12", "day")),
+    ("12.05.2008", DateSpan("2008-05-12", "2008-05-12", "day")),
+    ("12 May 2008", DateSpan("2008-05-12", "2008-05-12", "day")),
+    ("May 12th, 2008", DateSpan("2008-05-12", "2008-05-12", "day")),
+    ("February 2024", DateSpan("2024-02-01", "2024-02-29", "month")),
+    ("12 maj 2008", DateSpan("2008-05-12", "2008-05-12", "day")),
+    ("early 2008", DateSpan("2008-01-01", "2008-12-31", "year")),
+    ("circa 2008", DateSpan("2008-01-01", "2008-12-31", "year")),
+    ("1990s", DateSpan("1990-01-01", "1999-12-31", "decade")),
+    ("the 90s", DateSpan("1990-01-01", "1999-12-31", "decade")),
+    ("20th century", DateSpan("1900-01-01", "1999-12-31", "century")),
+    # Closed ranges
+    ("2006–2012", DateSpan("2006-01-01", "2012-12-31", "year")),
+    ("2006-2012", DateSpan("2006-01-01", "2012-12-31", "year")),
+    ("May to June 2008", DateSpan("2008-05-01", "2008-06-30", "month")),
+    ("May 2008 - 2010", DateSpan("2008-05-01", "2010-12-31", "year")),
+    ("1980s-1990s", DateSpan("1980-01-01", "1999-12-31", "decade")),
+    ("1999-2000s", DateSpan("1999-01-01", "2009-12-31", "decade")),
+    ("since 2008 until 2010", DateSpan("2008-01-01", "2010-12-31", "year")),
+    # Open-ended
+    ("2011–present", DateSpan("2011-01-01", OPEN_END, "year")),
+    ("2011-present", DateSpan("2011-01-01", OPEN_END, "year")),
+    ("March 2011 – present", DateSpan("2011-03-01", OPEN_END, "month")),
+    ("2015 - ongoing", DateSpan("2015-01-01", OPEN_END, "year")),
+    ("2015 until today", DateSpan("2015-01-01", OPEN_END, "year")),
+    ("Since 2015", DateSpan("2015-01-01", OPEN_END, "year")),
+    ("since the 1990s", DateSpan("1990-01-01", OPEN_END, "decade")),
+    ("që nga viti 2015", DateSpan("2015-01-01", OPEN_END, "year")),
+    # Fallbacks
+    ("2014-2019 (Fiscal Years)", DateSpan("2014-01-01", "2019-12-31", "year")),
+    ("in the 1980s and 1990s", DateSpan("1980-01-01", "1999-12-31", "decade")),
+    ("2010–2008", DateSpan("2010-01-01", "2010-12-31", "year")),
+    # No date
+    ("Unknown", None),
+    ("ongoing", None),
+    ("", None),
+])
+def test_parse_date(label, expected):
+    assert parse_date(label) == expected
+
+
+def test_span_scales():
+    assert parse_date("2008-05-12").scale == 0
+    assert parse_date("2008").scale == 1
+    assert parse_date("1990s").scale == 2
+    assert parse_date("1980s-1990s").scale == 3
+    assert parse_date("2011–present").scale == 4
+    assert parse_date("2011–present").open_ended
+
+
+def test_scale_windows_bound_every_overlapping_span():
+    first, last = "2008-01-01", "2008-12-31"
+    windows = dict(scale_windows(first, last))
+    for label in ["2008-01-01", "2008", "December 2007 - January 2008", "2000s", "1990–2008", "1900–2008", "since 1950"]:
+        span = parse_date(label)
+        assert span.start <= last and span.end >= first
+        assert windows[span.scale] is None or span.start >= windows[span.scale], label
+
+
+def test_timeline_rows_skip_undated_entries():
+    rows = timeline_rows([("May 2008", "Tender"), ("Unknown", "Rumour"), ("2011–present", "Repayments")])
+    assert rows == [
+        (0, "May 2008", "Tender", "2008-05-01", "2008-05-31", "month", 0),
+        (2, "2011–present", "Repayments", "2011-01-01", OPEN_END, "year", 4),
+    ]
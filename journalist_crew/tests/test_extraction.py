@@ -0,0 +1,54 @@
+from journalist_crew.extraction import bm25_scores, extract_main_text, split_passages, top_passages
+
+PAGE = """
+<html><head><title> Corridor 8 tender  | Meta.mk</title><script>var x = "tender";</script></head>
+<body>
+  <nav><a href="/">Home</a> <a href="/news">News</a></nav>
+  <div class="cookie-banner">We use cookies.</div>
+  <article>
+    <h1>Government signs Corridor 8 tender</h1>
+    <p>The ministry signed the railway tender on Monday.</p>
+    <p>The loan is worth EUR 100 million.</p>
+    <div class="share-buttons">Share on Facebook</div>
+  </article>
+  <div id="comments"><p>Great news!</p></div>
+  <footer>Copyright Meta.mk</footer>
+</body></html>
+"""
+
+
+def test_main_content_drops_page_chrome():
+    title, paragraphs = extract_main_text(PAGE)
+    assert title == "Corridor 8 tender | Meta.mk"
+    assert paragraphs == [
+        "Government signs Corridor 8 tender",
+        "The ministry signed the railway tender on Monday.",
+        "The loan is worth EUR 100 million.",
+    ]
+
+
+def test_pages_without_article_markup_keep_all_blocks():
+    _, paragraphs = extract_main_text("<div><p>First.</p><p>Second.</p></div><footer>Footer</footer>")
+    assert paragraphs == ["First.", "Second."]
+
+
+def test_passages_pack_short_paragraphs_and_split_long_ones():
+    assert split_passages(["one two", "three four"], max_words=10) == ["one two three four"]
+
+    long = " ".join(f"Sentence number {i} is here." for i in range(10))
+    passages = split_passages([long], max_words=12)
+    assert all(len(p.split()) <= 12 for p in passages)
+    assert " ".join(passages) == long
+
+
+def test_bm25_prefers_passages_with_query_terms():
+    passages = ["The budget audit was delayed.", "The railway tender was signed.", "Weather was sunny."]
+    scores = bm25_scores("railway tender", passages)
+    assert scores.index(max(scores)) == 1
+    assert scores[2] == 0
+
+
+def test_top_passages_keep_page_order_and_fall_back_to_the_lead():
+    passages = ["Lead paragraph.", "Tender signed.", "Nothing here.", "Tender cancelled later."]
+    assert [i for i, _, _ in top_passages("tender", passages, k=2)] == [1, 3]
+    assert [i for i, _, _ in top_passages("parliament", passages, k=2)] == [0, 1]
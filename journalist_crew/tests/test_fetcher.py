@@ -0,0 +1,52 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from journalist_crew.fetcher import Fetcher, decode_body
+
+CYRILLIC = "Скопје е главен град на Македонија, според владата и министерството за транспорт."
+
+
+def test_http_charset_wins():
+    assert decode_body(CYRILLIC.encode("cp1251"), "text/html; charset=windows-1251", "windows-1251") == CYRILLIC
+
+
+def test_meta_charset_when_header_has_none():
+    body = b'<html><head><meta charset="windows-1251"></head><p>' + CYRILLIC.encode("cp1251")
+    assert CYRILLIC in decode_body(body, "text/html", "ISO-8859-1")
+
+
+def test_detected_encoding_before_utf8():
+    assert decode_body(CYRILLIC.encode("cp1251"), "text/html") == CYRILLIC
+
+
+def test_unknown_charsets_fall_through():
+    body = '<meta http-equiv="Content-Type" content="text/html; charset=bogus"><p>Скопје'.encode()
+    assert decode_body(body, "text/html; charset=bogus", "bogus").endswith("Скопје")
+
+
+class SlowPage(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(0.3)
+        body = b"<p>Story</p>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_waiting_for_the_domain_slot_does_not_count_toward_the_deadline():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowPage)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        fetcher = Fetcher(per_domain=1, deadline=0.5)
+        results = fetcher.fetch_many([f"http://127.0.0.1:{server.server_address[1]}/a"] * 3)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert [r.error for r in results] == [None, None, None]
+    assert all(r.seconds < 0.5 for r in results)
@@ -0,0 +1,51 @@
+from journalist_crew.ledger import RunLedger, canonicalize_url
+
+
+def test_canonicalize_url_drops_tracking_and_variants():
+    assert canonicalize_url("http://www.meta.mk/news/story/?utm_source=x&b=2&a=1&fbclid=y") == "https://meta.mk/news/story?a=1&b=2"
+    assert canonicalize_url("https://m.meta.mk/news/story/amp/") == "https://meta.mk/news/story"
+    assert canonicalize_url("https://meta.mk:8443/a") == "https://meta.mk:8443/a"
+
+
+def test_similar_queries_are_answered_from_the_ledger():
+    ledger = RunLedger()
+    assert ledger.find_query("Corridor 8 railway tender") is None
+    ledger.record_query("Corridor 8 railway tender", "results")
+
+    entry = ledger.find_query("railway tender corridor 8 news")
+    assert entry is not None and entry.result == "results"
+    assert ledger.find_query("Skopje budget audit") is None
+    assert ledger.stats()["deduplicated"]["search"] == 1
+
+
+def test_page_reads_are_keyed_by_url_and_focus():
+    ledger = RunLedger()
+    ledger.record_url("https://meta.mk/a?utm_source=x", "tender passages", focus="Tender  amount")
+
+    entry = ledger.find_url("http://www.meta.mk/a", focus="tender amount")
+    assert entry is not None and entry.result == "tender passages"
+    assert ledger.find_url("https://meta.mk/a", focus="contract signing date") is None
+    assert ledger.find_url("https://meta.mk/a") is None
+
+    ledger.record_url("https://meta.mk/a", "signing passages", focus="contract signing date")
+    assert ledger.find_url("https://meta.mk/a", focus="contract signing date").result == "signing passages"
+    assert ledger.find_url("https://meta.mk/a", focus="tender amount").hits == 2
+
+
+def test_facts_are_keyed_by_normalised_statement_and_url():
+    ledger = RunLedger()
+    ledger.record_fact("The loan was  EUR 100 million.", "https://meta.mk/a", "fact [1]")
+    assert ledger.find_fact("the loan was eur 100 million.", "https://www.meta.mk/a/").result == "fact [1]"
+    assert ledger.facts() == ["fact [1]"]
+
+
+def test_reset_clears_everything():
+    ledger = RunLedger()
+    ledger.record_query("a b c", "r")
+    ledger.record_url("https://meta.mk/a", "r")
+    ledger.reset()
+    assert ledger.stats() == {
+        "queries": 0, "urls": 0, "facts": 0,
+        "calls": {"search": 0, "scrape": 0, "cite": 0},
+        "deduplicated": {"search": 0, "scrape": 0, "cite": 0},
+    }
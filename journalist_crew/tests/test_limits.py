@@ -0,0 +1,26 @@
+import threading
+
+from journalist_crew.limits import RateLimiter
+
+
+def test_counts_every_acquire_across_threads():
+    limiter = RateLimiter(0)
+
+    def worker():
+        for _ in range(5000):
+            limiter.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter.acquired == 40000
+
+
+def test_full_window_times_out_and_records_the_wait():
+    limiter = RateLimiter(2)
+    assert limiter.acquire() and limiter.acquire()
+    assert limiter.acquire(timeout=0.05) is False
+    assert limiter.acquired == 2
+    assert 0.04 <= limiter.waited <= 1
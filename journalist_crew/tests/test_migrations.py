@@ -0,0 +1,98 @@
+import json
+import sqlite3
+
+import pytest
+
+from journalist_crew.harness.synthetic import make_dossier
+from journalist_crew.migrations import MIGRATIONS, Migration, current_version, ensure_schema, latest_version, migrate, pending
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_fresh_database_is_migrated_once():
+    conn = sqlite3.connect(":memory:")
+    assert migrate(conn, "sqlite") == [m.version for m in MIGRATIONS]
+    assert current_version(conn) == latest_version()
+    assert pending(conn) == []
+    assert migrate(conn, "sqlite") == []
+    assert {"owner"} <= _columns(conn, "dossiers")
+    assert {"preview", "length", "cache_key"} <= _columns(conn, "articles")
+    assert "span_scale" in _columns(conn, "timeline_events")
+
+
+def test_upgrade_indexes_existing_dossiers():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn, "sqlite", [m for m in MIGRATIONS if m.version <= 4])
+    dossier = make_dossier("small", seed=1)
+    conn.execute("INSERT INTO dossiers (id, topic, data) VALUES (?, ?, ?)", (dossier.id, dossier.topic, dossier.model_dump_json()))
+    conn.commit()
+
+    assert [m.version for m in pending(conn)] == [m.version for m in MIGRATIONS if m.version > 4]
+    migrate(conn, "sqlite")
+    rows = conn.execute("SELECT label, span_scale FROM timeline_events WHERE dossier_id = ? ORDER BY position", (dossier.id,)).fetchall()
+    assert [label for label, _ in rows] == [event.year for event in dossier.timeline]
+    assert all(scale is not None for _, scale in rows)
+
+
+def test_inline_links_are_rewritten_as_numbered_citations():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn, "sqlite", [m for m in MIGRATIONS if m.version <= 6])
+    legacy = {
+        "id": "legacy", "topic": "Corridor 8", "executive_summary": ["Tender ([Meta](https://meta.mk/a))"],
+        "comprehensive_narrative": "Signed in [2008] ([Meta](https://meta.mk/a)).", "key_figures": [],
+        "timeline": [{"year": "2008", "event": "Tender ([Reuters](https://reuters.com/b))"}],
+        "sources": [{"title": "Meta", "url": "https://meta.mk/a", "credibility_score": 7}],
+    }
+    conn.execute("INSERT INTO dossiers (id, topic, data) VALUES ('legacy', 'Corridor 8', ?)", (json.dumps(legacy),))
+    conn.execute("INSERT INTO timeline_events (dossier_id, position, label, event, start_date, end_date, precision, span_scale) VALUES ('legacy', 0, '2008', ?, '2008-01-01', '2008-12-31', 'year', 1)", (legacy["timeline"][0]["event"],))
+    conn.commit()
+
+    migrate(conn, "sqlite")
+    data = json.loads(conn.execute("SELECT data FROM dossiers WHERE id = 'legacy'").fetchone()[0])
+    assert data["comprehensive_narrative"] == "Signed in [2008] [1]."
+    assert data["executive_summary"] == ["Tender [1]"]
+    assert [s["url"] for s in data["sources"]] == ["https://meta.mk/a", "https://reuters.com/b"]
+    assert conn.execute("SELECT event FROM timeline_events WHERE dossier_id = 'legacy'").fetchone()[0] == "Tender [2]"
+
+
+def test_legacy_articles_get_previews():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn, "sqlite", [m for m in MIGRATIONS if m.version <= 2])
+    conn.execute("INSERT INTO articles (dossier_id, content) VALUES ('d', ?)", ("word " * 100,))
+    conn.commit()
+    migrate(conn, "sqlite")
+    preview, length = conn.execute("SELECT preview, length FROM articles").fetchone()
+    assert length == 500 and preview == ("word " * 100)[:200]
+
+
+def test_failed_migration_is_rolled_back_and_retried():
+    calls = []
+
+    def flaky(cursor):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("interrupted")
+        cursor.execute("CREATE TABLE IF NOT EXISTS extra (id INTEGER)")
+
+    migrations = [Migration(1, "one", sqlite=["CREATE TABLE IF NOT EXISTS one (id INTEGER)"]), Migration(2, "two", sqlite=[flaky])]
+    conn = sqlite3.connect(":memory:")
+    with pytest.raises(RuntimeError):
+        migrate(conn, "sqlite", migrations)
+    assert current_version(conn) == 1
+    assert migrate(conn, "sqlite", migrations) == [2]
+    assert conn.execute("SELECT version, name FROM schema_version ORDER BY version").fetchall() == [(1, "one"), (2, "two")]
+
+
+def test_ensure_schema_checks_each_database_once(tmp_path):
+    path = str(tmp_path / "journal.db")
+    connects = []
+
+    def connect():
+        connects.append(1)
+        return sqlite3.connect(path)
+
+    assert ensure_schema(path, connect, "sqlite", close=True) == [m.version for m in MIGRATIONS]
+    assert ensure_schema(path, connect, "sqlite", close=True) == []
+    assert len(connects) == 1
@@ -0,0 +1,88 @@
+import json
+
+from journalist_crew.repair import coerce_dossier, parse_json, repair_dossier
+
+DOSSIER = {
+    "topic": "Corridor 8",
+    "executive_summary": ["Tender announced [1]"],
+    "comprehensive_narrative": "First paragraph.",
+    "key_figures": [{"name": "Zoran Zaev", "role": "Prime Minister", "impact": "Signed the loan"}],
+    "timeline": [{"year": "2008", "event": "Tender announced"}],
+    "sources": [{"title": "Report", "url": "https://meta.mk/a", "credibility_score": 7}],
+}
+
+
+def _parse(text):
+    fixes = []
+    return parse_json(text, fixes), fixes
+
+
+def test_clean_json_needs_no_fixes():
+    dossier, report = repair_dossier(json.dumps(DOSSIER), "Corridor 8")
+    assert report == {"outcome": "clean", "fixes": []}
+    assert dossier.topic == "Corridor 8"
+
+
+def test_code_fence_and_prose():
+    value, fixes = _parse('Here is the dossier:\n```json\n{"a": 1}\n```\nHope it helps.')
+    assert value == {"a": 1}
+    assert "code_fence" in fixes
+
+
+def test_trailing_commas():
+    value, fixes = _parse('{"a": [1, 2,], "b": {"c": 3,},}')
+    assert value == {"a": [1, 2], "b": {"c": 3}}
+    assert "trailing_comma" in fixes
+
+
+def test_truncated_response_drops_half_written_element():
+    value, fixes = _parse('{"a": [1, 2, 3], "b": ["x", "y", "unfinish')
+    assert value == {"a": [1, 2, 3], "b": ["x", "y"]}
+    assert "truncated" in fixes
+
+
+def test_python_literal():
+    value, fixes = _parse("{'a': True, 'b': None, 'c': ['x']}")
+    assert value == {"a": True, "b": None, "c": ["x"]}
+    assert "python_literal" in fixes
+
+
+def test_raw_newlines_inside_strings():
+    text = '{"comprehensive_narrative": "First paragraph.\n\nSecond paragraph.\tTabbed."}'
+    value, _ = _parse(text)
+    assert value == {"comprehensive_narrative": "First paragraph.\n\nSecond paragraph.\tTabbed."}
+
+
+def test_multi_paragraph_narrative_is_repaired():
+    text = json.dumps(DOSSIER).replace("First paragraph.", "First paragraph.\n\nSecond paragraph.")
+    text = text.replace("\\n", "\n")
+    dossier, report = repair_dossier(text, "Corridor 8")
+    assert report["outcome"] == "repaired"
+    assert dossier.comprehensive_narrative == "First paragraph.\n\nSecond paragraph."
+
+
+def test_coerce_maps_near_misses():
+    fixes = []
+    out = coerce_dossier({"dossier": {"title": "T", "summary": "- one\n- two", "events": ["2008: Tender"]}}, "Topic", fixes)
+    assert out["topic"] == "T"
+    assert out["executive_summary"] == ["one", "two"]
+    assert out["timeline"] == [{"year": "2008", "event": " Tender"}]
+    assert fixes == ["unwrapped", "coerced_types"]
+
+
+def test_fixer_path_records_each_fix_once():
+    broken = dict(DOSSIER, comprehensive_narrative="", executive_summary="one\ntwo")
+
+    def fixer(data, fields, problem):
+        return {"comprehensive_narrative": "Rewritten."}
+
+    dossier, report = repair_dossier(json.dumps(broken), "Corridor 8", fixer=fixer)
+    assert report["outcome"] == "llm_fixup"
+    assert dossier.comprehensive_narrative == "Rewritten."
+    assert len(report["fixes"]) == len(set(report["fixes"]))
+
+
+def test_unparseable_output_fails():
+    dossier, report = repair_dossier("I could not find anything.", "Corridor 8")
+    assert dossier is None
+    assert report["outcome"] == "failed"